@@ -156,7 +156,19 @@ def build_application(cfg: Config) -> Any:
             # Non-fatal: bot can run even if Telegram API is temporarily unavailable.
             print(f"[tgcodex-bot] Warning: failed to set bot commands: {exc}")
 
-    app = Application.builder().token(token).post_init(_post_init).build()
+    async def _post_shutdown(app: Application) -> None:
+        # Commits any deferred telemetry writes.
+        runtime.store.close()
+        # SSH machines keep a shared connection open.
+        for mr in runtime.machines.values():
+            close = getattr(mr.machine, "close", None)
+            if close is not None:
+                try:
+                    await close()
+                except Exception:
+                    pass
+
+    app = Application.builder().token(token).post_init(_post_init).post_shutdown(_post_shutdown).build()
     app.bot_data["runtime"] = runtime
 
     from tgcodex.bot.callbacks import on_callback_query
@@ -28,7 +28,7 @@ from tgcodex.codex.events import (
     TurnCompleted,
 )
 from tgcodex.codex.sessions import list_sessions, read_latest_token_count
-from tgcodex.machines.paths import CdNotAllowed, resolve_cd, resolve_cd_local
+from tgcodex.machines.paths import CdNotAllowed, invalidate_realpath_cache, resolve_cd, resolve_cd_local
 from tgcodex import __version__
 from tgcodex.codex.models_cache import read_models_cache
 from tgcodex.codex.skills import list_skills as codex_list_skills
@@ -125,12 +125,14 @@ async def _probe_machine_reachable(machine: Any) -> bool:
     """
     Best-effort liveness probe used to detect "stuck typing" when an SSH machine is down.
 
-    This intentionally uses a new exec_capture call rather than reusing a RunHandle, since
-    the hung run may be tied to a dead SSH connection.
+    SSH machines share one connection across runs, so `probe()` opens a dedicated one: the
+    hung run may be tied to a dead connection, and timing out must not tear down other runs.
+    Machines without `probe()` fall back to a plain exec_capture round trip.
     """
+    probe = getattr(machine, "probe", None)
     try:
         await asyncio.wait_for(
-            machine.exec_capture(["true"], cwd=None),
+            probe() if probe is not None else machine.exec_capture(["true"], cwd=None),
             timeout=SSH_LIVENESS_PROBE_TIMEOUT_SECONDS,
         )
         return True
@@ -337,6 +339,7 @@ async def on_machine(update: Any, context: Any) -> None:
         default_model=runtime.cfg.codex.model,
     )
     runtime.store.set_machine(chat_id=chat_id, machine_name=name, workdir=workdir)
+    invalidate_realpath_cache(name)
     await context.bot.send_message(chat_id=chat_id, text=f"Machine set to {name}, workdir={workdir}. Session cleared.")
 
 
@@ -399,6 +402,7 @@ async def on_cd(update: Any, context: Any) -> None:
         return
 
     runtime.store.set_workdir(chat_id=chat_id, workdir=new_wd)
+    invalidate_realpath_cache(state.machine_name)
     await context.bot.send_message(chat_id=chat_id, text=f"Workdir set to {new_wd}. Session cleared.")
 
 
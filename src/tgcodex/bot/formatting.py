@@ -1,18 +1,26 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional
 
 from tgcodex.state.models import ActiveRun, ChatState
 from tgcodex.util.text import escape_html
 
 
+@lru_cache(maxsize=2048)
+def _escape_cached(s: str) -> str:
+    # Labels passed here (session ids, model names, states) repeat across messages; bounded so
+    # arbitrary user text can't grow the cache without limit.
+    return escape_html(s)
+
+
 def fmt_code_inline(s: str) -> str:
-    return f"<code>{escape_html(s)}</code>"
+    return f"<code>{_escape_cached(s)}</code>"
 
 
 def fmt_bold(s: str) -> str:
-    return f"<b>{escape_html(s)}</b>"
+    return f"<b>{_escape_cached(s)}</b>"
 
 
 def fmt_status(state: ChatState, run: Optional[ActiveRun]) -> str:
@@ -37,11 +45,12 @@ def fmt_status(state: ChatState, run: Optional[ActiveRun]) -> str:
             pct = (state.last_context_remaining / state.last_context_window) * 100.0
         parts.append(
             "Context remaining: "
-            f"{state.last_context_remaining:,} / {state.last_context_window:,} tokens ({pct:.1f}%)"
+            f"{_fmt_commas(state.last_context_remaining)} / {_fmt_commas(state.last_context_window)} "
+            f"tokens ({pct:.1f}%)"
         )
     elif state.last_context_remaining is not None:
         parts.append(
-            f"Context remaining: {state.last_context_remaining:,} tokens"
+            f"Context remaining: {_fmt_commas(state.last_context_remaining)} tokens"
         )
     else:
         parts.append("Context remaining: Unknown")
@@ -72,15 +81,21 @@ def fmt_status(state: ChatState, run: Optional[ActiveRun]) -> str:
         in_tok = state.last_input_tokens or 0
         out_tok = state.last_output_tokens or 0
         cached = state.last_cached_tokens or 0
-        tok_str = f"in={in_tok:,} out={out_tok:,}"
+        tok_str = f"in={_fmt_commas(in_tok)} out={_fmt_commas(out_tok)}"
         if cached:
-            tok_str += f" cached={cached:,}"
+            tok_str += f" cached={_fmt_commas(cached)}"
         parts.append(f"Last tokens: {tok_str}")
     if run:
         parts.append(f"Run: {run.status} ({run.run_id})")
     return "\n".join(parts)
 
 
+@lru_cache(maxsize=1024)
+def _fmt_commas(n: int) -> str:
+    # Telemetry values rarely change between /status polls, so most calls are cache hits.
+    return format(n, ",")
+
+
 def _fmt_rate_line(
     *,
     label: str,
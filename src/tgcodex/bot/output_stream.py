@@ -4,8 +4,16 @@ import asyncio
 from dataclasses import dataclass
 from typing import Any, Optional
 
+from telegram.error import BadRequest, NetworkError, RetryAfter
+
 from tgcodex.util.time import monotonic
 
+_EDIT_MAX_RETRIES = 3
+_EDIT_BACKOFF_SECONDS = 0.5
+# An intermediate edit waits out a flood-wait only if it is this many flush intervals or
+# shorter; longer waits drop the edit, since the next flush re-sends the full text anyway.
+_RETRY_AFTER_MAX_FLUSH_INTERVALS = 4
+
 
 @dataclass
 class OutputTuning:
@@ -65,7 +73,8 @@ class BufferedTelegramWriter:
             take = self._buffer[:space]
             self._buffer = self._buffer[space:]
             self._current += take
-            await self._send_or_edit(self._current)
+            # A forced flush (end of output) must land, so it honours any flood-wait in full.
+            await self._send_or_edit(self._current, final=force)
 
         self._last_flush = monotonic()
 
@@ -76,17 +85,16 @@ class BufferedTelegramWriter:
     async def close(self) -> None:
         await self.flush(force=True)
 
-    async def _send_or_edit(self, text: str) -> None:
+    async def _send_or_edit(self, text: str, *, final: bool = False) -> None:
         # Send plain text (no HTML/Markdown parse mode) so chat output doesn't show up as code.
         payload = text.replace("```", "")
         if self._msg_id is None:
-            msg = await self._bot.send_message(
-                chat_id=self._chat_id,
-                text=payload,
-                disable_web_page_preview=True,
-            )
-            self._msg_id = msg.message_id
-        else:
+            await self._send_new(payload)
+            return
+
+        attempt = 0
+        backoff = _EDIT_BACKOFF_SECONDS
+        while True:
             try:
                 await self._bot.edit_message_text(
                     chat_id=self._chat_id,
@@ -94,14 +102,79 @@ class BufferedTelegramWriter:
                     text=payload,
                     disable_web_page_preview=True,
                 )
-            except Exception:
-                # Editing can fail if Telegram thinks it is "not modified" or if message is too old.
-                msg = await self._bot.send_message(
-                    chat_id=self._chat_id,
-                    text=payload,
-                    disable_web_page_preview=True,
-                )
-                self._msg_id = msg.message_id
+                return
+            except Exception as exc:
+                kind, retry_after = _classify_edit_error(exc)
+                error = exc
+
+            if kind == "not_modified":
+                return
+            if kind in ("retry_after", "network"):
+                # Never roll over here: on flood-wait a new message makes it worse, and on a
+                # timeout the edit may already have landed. The next flush re-sends the full
+                # text anyway, so giving up after a few tries loses nothing.
+                if attempt >= _EDIT_MAX_RETRIES:
+                    if final:
+                        # No later flush will re-send this text: the end of the answer is lost.
+                        _log(
+                            f"final edit of chat {self._chat_id} message {self._msg_id} gave up "
+                            f"after {attempt} retries ({type(error).__name__}); output may be incomplete"
+                        )
+                    return
+                attempt += 1
+                if kind == "retry_after":
+                    max_wait = self._tuning.flush_interval_ms / 1000.0 * _RETRY_AFTER_MAX_FLUSH_INTERVALS
+                    if not final and retry_after > max_wait:
+                        return
+                    await asyncio.sleep(retry_after)
+                else:
+                    await asyncio.sleep(backoff)
+                    backoff *= 2
+                continue
+
+            # Message is gone/too old to edit (or an unknown error): continue in a new message.
+            await self._send_new(payload)
+            return
+
+    async def _send_new(self, payload: str) -> None:
+        msg = await self._bot.send_message(
+            chat_id=self._chat_id,
+            text=payload,
+            disable_web_page_preview=True,
+        )
+        self._msg_id = msg.message_id
+
+
+def _log(msg: str) -> None:
+    try:
+        print(f"[tgcodex-bot] {msg}", flush=True)
+    except Exception:
+        pass
+
+
+def _classify_edit_error(exc: BaseException) -> tuple[str, float]:
+    """
+    Map an edit_message_text failure onto how the writer should react.
+
+    Returns (kind, retry_after_seconds) where kind is one of "not_modified", "retry_after",
+    "network", "rollover".
+    """
+
+    if isinstance(exc, RetryAfter):
+        delay = exc.retry_after
+        if hasattr(delay, "total_seconds"):
+            delay = delay.total_seconds()
+        return "retry_after", float(delay)
+    # BadRequest subclasses NetworkError, so it must be checked first.
+    if isinstance(exc, BadRequest):
+        msg = str(exc).lower()
+        if "message is not modified" in msg:
+            return "not_modified", 0.0
+        return "rollover", 0.0
+    if isinstance(exc, NetworkError):
+        # Includes TimedOut.
+        return "network", 0.0
+    return "rollover", 0.0
 
 
 async def typing_loop(*, bot: Any, chat_id: int, interval_seconds: float, stop: asyncio.Event) -> None:
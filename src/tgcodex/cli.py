@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import os
 import re
 import sys
 import time
@@ -41,6 +42,7 @@ def validate_config_cmd(
         for e in errors:
             typer.echo(f"ERROR: {e}")
         raise typer.Exit(2)
+    _record_validated(config, cfg, check_binaries=check_binaries)
     typer.echo("OK")
 
 
@@ -98,6 +100,62 @@ def _is_env_var_name(value: str) -> bool:
     return bool(re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", value))
 
 
+def _validated_stamp_file(config: Path) -> Path:
+    return daemon.runtime_dir_for_config(config) / f"{Path(config).name}.validated"
+
+
+def _config_fingerprint(config: Path, *, check_binaries: bool) -> Optional[dict[str, Any]]:
+    try:
+        st = Path(config).expanduser().stat()
+    except Exception:
+        return None
+    return {
+        "path": str(Path(config).expanduser().resolve()),
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "check_binaries": bool(check_binaries),
+    }
+
+
+def _is_recently_validated(config: Path, *, check_binaries: bool) -> bool:
+    """
+    True if this exact config file (same mtime/size) already passed validation.
+
+    A stamp recorded with binary checks also satisfies a request without them. The token env
+    var lives outside the file, so it is re-checked on every hit.
+    """
+
+    fp = _config_fingerprint(config, check_binaries=check_binaries)
+    if fp is None:
+        return False
+    try:
+        stamp = json.loads(_validated_stamp_file(config).read_text(encoding="utf-8"))
+    except Exception:
+        return False
+    if not isinstance(stamp, dict):
+        return False
+    token_env = stamp.get("token_env")
+    if not isinstance(token_env, str) or not os.getenv(token_env):
+        return False
+    if check_binaries and stamp.get("check_binaries") is not True:
+        return False
+    return all(stamp.get(k) == v for k, v in fp.items() if k != "check_binaries")
+
+
+def _record_validated(config: Path, cfg: Any, *, check_binaries: bool) -> None:
+    fp = _config_fingerprint(config, check_binaries=check_binaries)
+    if fp is None:
+        return
+    fp["token_env"] = cfg.telegram.token_env
+    stamp_file = _validated_stamp_file(config)
+    try:
+        stamp_file.parent.mkdir(parents=True, exist_ok=True)
+        stamp_file.write_text(json.dumps(fp) + "\n", encoding="utf-8")
+    except Exception:
+        # Best-effort cache only.
+        pass
+
+
 def _tail_text(path: Path, *, max_lines: int = 40) -> str:
     try:
         lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
@@ -366,13 +424,15 @@ def start_cmd(
     Start the bot in the background (detached), writing PID and logs next to the config.
     """
 
-    if validate:
+    # Skip re-parsing when `validate-config`/a previous `start` already validated this exact file.
+    if validate and not _is_recently_validated(config, check_binaries=check_binaries):
         cfg = load_config(config)
         errors = validate_config(cfg, validate_binaries=check_binaries)
         if errors:
             for e in errors:
                 typer.echo(f"ERROR: {e}")
             raise typer.Exit(2)
+        _record_validated(config, cfg, check_binaries=check_binaries)
 
     pf = pid_file or daemon.pid_file_for_config(config)
     lf = log_file or daemon.log_file_for_config(config)
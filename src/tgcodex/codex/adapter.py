@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-import os
+import functools
 from typing import Optional, Protocol
 
 from tgcodex.codex.cli_runner import CodexRun, start_codex_process
 from tgcodex.machines.base import Machine
+from tgcodex.machines.paths import resolve_workdir
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RunSettings:
     codex_bin: str
     codex_args: tuple[str, ...]
@@ -19,7 +20,7 @@ class RunSettings:
     skip_git_repo_check: bool
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SessionMeta:
     session_id: str
     path: Optional[str]
@@ -60,6 +61,17 @@ class CodexCLIAdapter:
         NOTE: `codex exec resume` (codex-cli 0.98.0) does not accept `--color` after the `resume`
         subcommand; keep the argv layout compatible with both `exec` and `exec resume`.
         """
+        prefix = CodexCLIAdapter._build_argv_prefix(settings, session_id, workdir)
+        return [*prefix, prompt]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _build_argv_prefix(
+        settings: RunSettings,
+        session_id: Optional[str],
+        workdir: str,
+    ) -> tuple[str, ...]:
+        # Everything but the prompt; cached since resumed runs reuse the same settings/workdir.
         argv: list[str] = [settings.codex_bin]
         if settings.sandbox:
             argv += ["-s", settings.sandbox]
@@ -87,9 +99,7 @@ class CodexCLIAdapter:
         if settings.model:
             argv += ["-m", settings.model]
         argv += list(settings.codex_args)
-
-        argv += [prompt]
-        return argv
+        return tuple(argv)
 
     async def start_run(
         self,
@@ -106,10 +116,7 @@ class CodexCLIAdapter:
         # symlink differences can cause a trust override to miss, which in turn can bypass approval
         # prompts. Use the machine's realpath to match Codex's canonicalization as closely as
         # possible.
-        try:
-            workdir = await machine.realpath(workdir)
-        except Exception:
-            workdir = os.path.normpath(workdir)
+        workdir = await resolve_workdir(machine, workdir)
 
         argv = self.build_argv(
             settings=settings,
@@ -2,10 +2,9 @@ from __future__ import annotations
 
 import asyncio
 import json
-import os
 import uuid
 from dataclasses import dataclass
-from typing import Any, AsyncIterator, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 
 from tgcodex.codex.app_server_rpc import JsonRpcConnection, JsonRpcIncoming, RequestId
 from tgcodex.codex.events import (
@@ -22,11 +21,13 @@ from tgcodex.codex.events import (
     TurnCompleted,
     TurnFailed,
     TurnStarted,
+    debug_raw,
 )
 from tgcodex.machines.base import Machine, RunHandle
+from tgcodex.machines.paths import resolve_workdir
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AppServerSettings:
     codex_bin: str
     codex_args: tuple[str, ...]
@@ -44,20 +45,104 @@ def _approval_policy_from_mode(mode: str) -> str:
     return "untrusted"
 
 
+# IMPORTANT: In tgcodex, approvals are enforced via Codex app-server's protocol-level
+# approval requests (which the Telegram bot renders as inline buttons). Do not let the
+# model fall back to "Reply YES" style text confirmations, which are easy to confuse with
+# the real approval gate.
+_DEVELOPER_INSTRUCTIONS = (
+    "Approval UX requirements (Telegram client integration):\n"
+    "- Never ask the user to approve actions by replying YES/NO in chat text.\n"
+    "- Do not treat chat text as an approval signal.\n"
+    "- For any command execution or file change that needs approval, rely on the built-in approval gate:\n"
+    "  the system will pause and the client will show inline Approve/Reject buttons.\n"
+    "- Do not duplicate the approval prompt in natural language.\n"
+)
+
+
 def _developer_instructions_for_mode(mode: str) -> Optional[str]:
-    # IMPORTANT: In tgcodex, approvals are enforced via Codex app-server's protocol-level
-    # approval requests (which the Telegram bot renders as inline buttons). Do not let the
-    # model fall back to "Reply YES" style text confirmations, which are easy to confuse with
-    # the real approval gate.
-    base = (
-        "Approval UX requirements (Telegram client integration):\n"
-        "- Never ask the user to approve actions by replying YES/NO in chat text.\n"
-        "- Do not treat chat text as an approval signal.\n"
-        "- For any command execution or file change that needs approval, rely on the built-in approval gate:\n"
-        "  the system will pause and the client will show inline Approve/Reject buttons.\n"
-        "- Do not duplicate the approval prompt in natural language.\n"
-    )
-    return base
+    # Currently identical for every mode; built once at import.
+    return _DEVELOPER_INSTRUCTIONS
+
+
+# Handshake params never change; shared rather than rebuilt per session (never mutated).
+_INITIALIZE_PARAMS: dict[str, Any] = {"clientInfo": {"name": "tgcodex", "version": "0.0"}}
+
+
+def _thread_params(
+    *, thread_id: Optional[str], workdir: str, settings: AppServerSettings
+) -> dict[str, Any]:
+    # Same key order for thread/start and thread/resume; threadId is only sent when resuming.
+    params: dict[str, Any] = {"threadId": thread_id} if thread_id else {}
+    params["cwd"] = workdir
+    params["approvalPolicy"] = _approval_policy_from_mode(settings.approval_mode)
+    params["sandbox"] = settings.sandbox
+    params["developerInstructions"] = _developer_instructions_for_mode(settings.approval_mode)
+    params["model"] = settings.model
+    return params
+
+
+def _as_int(d: dict[str, Any], key: str) -> Optional[int]:
+    v = d.get(key)
+    return v if isinstance(v, int) else None
+
+
+# Streamed deltas are merged for this long before being queued; Telegram edits can't keep up
+# with per-token cadence anyway.
+_DELTA_FLUSH_SECONDS = 0.05
+
+# Bound on queued events so a lagging Telegram consumer can't make memory grow with the
+# producer's output rate.
+_EVENT_QUEUE_MAXSIZE = 2048
+
+_DELTA_TYPES = (AgentMessageDelta, AgentReasoningDelta, ExecCommandOutputDelta)
+
+
+class _DeltaCoalescer:
+    """
+    Merges consecutive deltas of the same kind into one event.
+
+    Only a single run is buffered at a time; the session takes it out before queueing a delta
+    of another kind or any other event, so event ordering is preserved exactly.
+    """
+
+    def __init__(self, on_timer: Callable[[], None]) -> None:
+        self._on_timer = on_timer
+        self._kind: Optional[type] = None
+        self._parts: list[str] = []
+        self._raw: Optional[dict[str, Any]] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def kind(self) -> Optional[type]:
+        return self._kind
+
+    def add(self, ev: Any) -> None:
+        assert self._kind is None or type(ev) is self._kind
+        self._kind = type(ev)
+        self._parts.append(ev.text)
+        if isinstance(ev, ExecCommandOutputDelta):
+            self._raw = ev.raw
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                _DELTA_FLUSH_SECONDS, self._on_timer
+            )
+
+    def take(self) -> Optional[Any]:
+        """Return the merged pending event (if any) and reset."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        kind = self._kind
+        if kind is None:
+            return None
+        text = "".join(self._parts)
+        raw = self._raw
+        self._kind = None
+        self._parts = []
+        self._raw = None
+        if kind is ExecCommandOutputDelta:
+            return ExecCommandOutputDelta(text=text, raw=raw)
+        return kind(text=text)
 
 
 class AppServerSession:
@@ -71,13 +156,19 @@ class AppServerSession:
     def __init__(self, *, machine: Machine, handle: RunHandle) -> None:
         self.machine = machine
         self.handle = handle
-        self.run_id = str(uuid.uuid4())
+        self.run_id = uuid.uuid4().hex
 
         self.thread_id: Optional[str] = None
         self.turn_id: Optional[str] = None
 
-        self._queue: asyncio.Queue[Optional[Any]] = asyncio.Queue()
+        self._queue: asyncio.Queue[Optional[Any]] = asyncio.Queue(maxsize=_EVENT_QUEUE_MAXSIZE)
         self._closed = False
+        # Set by close()/cancel(): from then on nobody may be reading events, so puts stop
+        # waiting for queue space and drop instead.
+        self._stop_waiting = asyncio.Event()
+        # Keeps the reaper task referenced; the loop itself only holds weak references.
+        self._reaper: Optional[asyncio.Task[None]] = None
+        self._deltas = _DeltaCoalescer(self._flush_deltas_nowait)
 
         async def on_req(req: JsonRpcIncoming) -> None:
             await self._on_server_request(req)
@@ -88,6 +179,24 @@ class AppServerSession:
         async def on_log(line: str) -> None:
             await self.push_event(LogLine(text=line))
 
+        # Notification method -> handler(params, raw_obj); built once instead of an if/elif chain
+        # evaluated for every streamed delta.
+        self._notif_handlers: dict[
+            str, Callable[[dict[str, Any], dict[str, Any]], Awaitable[None]]
+        ] = {
+            "item/agentMessage/delta": self._on_agent_message_delta,
+            "item/reasoning/textDelta": self._on_reasoning_delta,
+            "item/commandExecution/outputDelta": self._on_exec_output_delta,
+            "item/started": self._on_item_started,
+            "item/completed": self._on_item_completed,
+            "thread/started": self._on_thread_started,
+            "turn/started": self._on_turn_started,
+            "turn/completed": self._on_turn_completed,
+            "thread/tokenUsage/updated": self._on_token_usage_updated,
+            "account/rateLimits/updated": self._on_rate_limits_updated,
+            "error": self._on_error,
+        }
+
         self.rpc = JsonRpcConnection(
             handle=handle,
             on_server_request=on_req,
@@ -96,31 +205,95 @@ class AppServerSession:
         )
 
     async def push_event(self, ev: Any) -> None:
+        if isinstance(ev, _DELTA_TYPES):
+            if self._deltas.kind not in (None, type(ev)):
+                await self._put_pending_deltas()
+            self._deltas.add(ev)
+            return
+        # Anything else (approvals, turn/item boundaries, ...) must not overtake buffered text.
+        # While the session is open these are never dropped: a full queue applies back-pressure
+        # to the stdout reader.
+        await self._put_pending_deltas()
         if isinstance(ev, ThreadStarted):
             self.thread_id = ev.thread_id
-        await self._queue.put(ev)
+        await self._put(ev)
+
+    async def _put_pending_deltas(self) -> None:
+        pending = self._deltas.take()
+        if pending is not None:
+            await self._put(pending)
+
+    async def _put(self, ev: Any) -> None:
+        try:
+            self._queue.put_nowait(ev)
+            return
+        except asyncio.QueueFull:
+            if self._stop_waiting.is_set():
+                return
+        put = asyncio.ensure_future(self._queue.put(ev))
+        stop = asyncio.ensure_future(self._stop_waiting.wait())
+        try:
+            await asyncio.wait((put, stop), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop.cancel()
+            if not put.done():
+                put.cancel()
+
+    def _flush_deltas_nowait(self) -> None:
+        # Timer-driven flush; runs outside a coroutine so it can't wait for queue space.
+        pending = self._deltas.take()
+        if pending is None:
+            return
+        try:
+            self._queue.put_nowait(pending)
+        except asyncio.QueueFull:
+            if isinstance(pending, ExecCommandOutputDelta):
+                # Lossy: streamed tool output is only informational (ExecCommandEnd carries the
+                # aggregated output), so drop it rather than grow memory.
+                return
+            # Keep message/reasoning text buffered; it is merged with later deltas and retried.
+            self._deltas.add(pending)
 
     async def close(self) -> None:
         if self._closed:
             return
         self._closed = True
+        self._stop_waiting.set()
         try:
             await self.rpc.close()
         except Exception:
             pass
-        await self._queue.put(None)
+        # Never blocks: if the queue is full, events() ends once it has drained it.
+        await self._put_pending_deltas()
+        try:
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
 
     async def events(self) -> AsyncIterator[Any]:
         while True:
+            if self._closed and self._queue.empty():
+                return
             ev = await self._queue.get()
             if ev is None:
                 return
             yield ev
+            # Drain whatever is already queued without another scheduler round-trip per event.
+            while True:
+                try:
+                    ev = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if ev is None:
+                    return
+                yield ev
 
     async def wait(self) -> int:
         return await self.handle.wait()
 
     async def cancel(self) -> None:
+        # The caller is giving up on this run and may stop reading events.
+        self._stop_waiting.set()
         try:
             await self.handle.terminate()
         except Exception:
@@ -219,162 +392,154 @@ class AppServerSession:
             pass
 
     async def _on_notification(self, notif: JsonRpcIncoming) -> None:
-        method = notif.method or ""
-        params = notif.params or {}
-
-        if method == "thread/started":
-            thread = params.get("thread")
-            if isinstance(thread, dict):
-                tid = thread.get("id")
-                if isinstance(tid, str) and tid:
-                    await self.push_event(ThreadStarted(thread_id=tid))
-            return
-
-        if method == "turn/started":
-            turn = params.get("turn")
-            if isinstance(turn, dict):
-                tid = turn.get("id")
-                if isinstance(tid, str) and tid:
-                    self.turn_id = tid
-            await self.push_event(TurnStarted())
-            return
-
-        if method == "turn/completed":
-            turn = params.get("turn")
-            # If the turn failed, surface an error.
-            if isinstance(turn, dict):
-                status = turn.get("status")
-                if status == "failed":
-                    err = turn.get("error")
-                    msg = None
-                    if isinstance(err, dict):
-                        msg = err.get("message")
-                    await self.push_event(TurnFailed(message=str(msg) if msg else "turn failed"))
-                else:
-                    await self.push_event(TurnCompleted())
+        handler = self._notif_handlers.get(notif.method or "")
+        if handler is not None:
+            await handler(notif.params or {}, notif.obj)
+
+    async def _on_thread_started(self, params: dict[str, Any], obj: dict[str, Any]) -> None:
+        thread = params.get("thread")
+        if isinstance(thread, dict):
+            tid = thread.get("id")
+            if isinstance(tid, str) and tid:
+                await self.push_event(ThreadStarted(thread_id=tid))
+
+    async def _on_turn_started(self, params: dict[str, Any], obj: dict[str, Any]) -> None:
+        turn = params.get("turn")
+        if isinstance(turn, dict):
+            tid = turn.get("id")
+            if isinstance(tid, str) and tid:
+                self.turn_id = tid
+        await self.push_event(TurnStarted())
+
+    async def _on_turn_completed(self, params: dict[str, Any], obj: dict[str, Any]) -> None:
+        turn = params.get("turn")
+        # If the turn failed, surface an error.
+        if isinstance(turn, dict):
+            status = turn.get("status")
+            if status == "failed":
+                err = turn.get("error")
+                msg = None
+                if isinstance(err, dict):
+                    msg = err.get("message")
+                await self.push_event(TurnFailed(message=str(msg) if msg else "turn failed"))
             else:
                 await self.push_event(TurnCompleted())
-            # Close stream after completion.
-            await self.close()
-            return
-
-        if method == "item/agentMessage/delta":
-            delta = params.get("delta")
-            if isinstance(delta, str) and delta:
-                await self.push_event(AgentMessageDelta(text=delta))
-            return
-
-        if method == "item/reasoning/textDelta":
-            delta = params.get("delta")
-            if isinstance(delta, str) and delta:
-                await self.push_event(AgentReasoningDelta(text=delta))
-            return
-
-        if method == "item/commandExecution/outputDelta":
-            delta = params.get("delta")
-            if isinstance(delta, str) and delta:
-                await self.push_event(ExecCommandOutputDelta(text=delta, raw=notif.obj))
-            return
-
-        if method == "item/started":
-            item = params.get("item")
-            if isinstance(item, dict) and item.get("type") == "commandExecution":
-                cmd = item.get("command")
-                if isinstance(cmd, str) and cmd:
-                    await self.push_event(ToolStarted(command=cmd))
+        else:
+            await self.push_event(TurnCompleted())
+        # Close stream after completion.
+        await self.close()
+
+    async def _on_agent_message_delta(self, params: dict[str, Any], obj: dict[str, Any]) -> None:
+        delta = params.get("delta")
+        if type(delta) is str and delta:
+            await self.push_event(AgentMessageDelta(text=delta))
+
+    async def _on_reasoning_delta(self, params: dict[str, Any], obj: dict[str, Any]) -> None:
+        delta = params.get("delta")
+        if type(delta) is str and delta:
+            await self.push_event(AgentReasoningDelta(text=delta))
+
+    async def _on_exec_output_delta(self, params: dict[str, Any], obj: dict[str, Any]) -> None:
+        delta = params.get("delta")
+        if type(delta) is str and delta:
+            await self.push_event(ExecCommandOutputDelta(text=delta, raw=debug_raw(obj)))
+
+    async def _on_item_started(self, params: dict[str, Any], obj: dict[str, Any]) -> None:
+        item = params.get("item")
+        if type(item) is not dict or item.get("type") != "commandExecution":
             return
+        cmd = item.get("command")
+        if type(cmd) is str and cmd:
+            await self.push_event(ToolStarted(command=cmd))
 
-        if method == "item/completed":
-            item = params.get("item")
-            if isinstance(item, dict) and item.get("type") == "commandExecution":
-                exit_code = item.get("exitCode")
-                agg = item.get("aggregatedOutput")
-                await self.push_event(
-                    ExecCommandEnd(
-                        exit_code=int(exit_code) if isinstance(exit_code, int) else None,
-                        aggregated_output=agg if isinstance(agg, str) else None,
-                        raw=notif.obj,
-                    )
-                )
+    async def _on_item_completed(self, params: dict[str, Any], obj: dict[str, Any]) -> None:
+        item = params.get("item")
+        if type(item) is not dict or item.get("type") != "commandExecution":
             return
+        exit_code = item.get("exitCode")
+        agg = item.get("aggregatedOutput")
+        await self.push_event(
+            ExecCommandEnd(
+                exit_code=int(exit_code) if isinstance(exit_code, int) else None,
+                aggregated_output=agg if type(agg) is str else None,
+                raw=debug_raw(obj),
+            )
+        )
 
-        if method == "thread/tokenUsage/updated":
-            usage = params.get("tokenUsage")
-            # Best-effort mapping into the existing TokenCount shape so /status continues to work.
-            if isinstance(usage, dict):
-                total = usage.get("total")
-                mcw = usage.get("modelContextWindow")
-                model_context_window = int(mcw) if isinstance(mcw, int) else None
-                total_tokens = None
-                it = ot = cit = rot = None
-                if isinstance(total, dict):
-                    total_tokens = total.get("totalTokens") if isinstance(total.get("totalTokens"), int) else None
-                    it = total.get("inputTokens") if isinstance(total.get("inputTokens"), int) else None
-                    ot = total.get("outputTokens") if isinstance(total.get("outputTokens"), int) else None
-                    cit = total.get("cachedInputTokens") if isinstance(total.get("cachedInputTokens"), int) else None
-                    rot = total.get("reasoningOutputTokens") if isinstance(total.get("reasoningOutputTokens"), int) else None
-                await self.push_event(
-                    TokenCount(
-                        model_context_window=model_context_window,
-                        total_tokens=total_tokens,
-                        input_tokens=it,
-                        output_tokens=ot,
-                        cached_input_tokens=cit,
-                        reasoning_output_tokens=rot,
-                        primary_used_percent=None,
-                        primary_window_minutes=None,
-                        primary_resets_at=None,
-                        secondary_used_percent=None,
-                        secondary_window_minutes=None,
-                        secondary_resets_at=None,
-                        raw=notif.obj,
-                    )
-                )
+    async def _on_token_usage_updated(self, params: dict[str, Any], obj: dict[str, Any]) -> None:
+        usage = params.get("tokenUsage")
+        # Best-effort mapping into the existing TokenCount shape so /status continues to work.
+        if not isinstance(usage, dict):
             return
+        total = usage.get("total")
+        model_context_window = _as_int(usage, "modelContextWindow")
+        total_tokens = None
+        it = ot = cit = rot = None
+        if isinstance(total, dict):
+            total_tokens = _as_int(total, "totalTokens")
+            it = _as_int(total, "inputTokens")
+            ot = _as_int(total, "outputTokens")
+            cit = _as_int(total, "cachedInputTokens")
+            rot = _as_int(total, "reasoningOutputTokens")
+        await self.push_event(
+            TokenCount(
+                model_context_window=model_context_window,
+                total_tokens=total_tokens,
+                input_tokens=it,
+                output_tokens=ot,
+                cached_input_tokens=cit,
+                reasoning_output_tokens=rot,
+                primary_used_percent=None,
+                primary_window_minutes=None,
+                primary_resets_at=None,
+                secondary_used_percent=None,
+                secondary_window_minutes=None,
+                secondary_resets_at=None,
+                raw=debug_raw(obj),
+            )
+        )
 
-        if method == "account/rateLimits/updated":
-            rl = params.get("rateLimits")
-            p = None
-            s = None
-            if isinstance(rl, dict):
-                p = rl.get("primary")
-                s = rl.get("secondary")
-            def _unpack(win: Any) -> tuple[Optional[float], Optional[int], Optional[int]]:
-                if not isinstance(win, dict):
-                    return (None, None, None)
-                used = win.get("usedPercent")
-                mins = win.get("windowDurationMins")
-                resets = win.get("resetsAt")
-                up = float(used) if isinstance(used, (int, float)) and not isinstance(used, bool) else None
-                return (up, int(mins) if isinstance(mins, int) else None, int(resets) if isinstance(resets, int) else None)
-            p_used, p_mins, p_resets = _unpack(p)
-            s_used, s_mins, s_resets = _unpack(s)
-            await self.push_event(
-                TokenCount(
-                    model_context_window=None,
-                    total_tokens=None,
-                    input_tokens=None,
-                    output_tokens=None,
-                    cached_input_tokens=None,
-                    reasoning_output_tokens=None,
-                    primary_used_percent=p_used,
-                    primary_window_minutes=p_mins,
-                    primary_resets_at=p_resets,
-                    secondary_used_percent=s_used,
-                    secondary_window_minutes=s_mins,
-                    secondary_resets_at=s_resets,
-                    raw=notif.obj,
-                )
+    async def _on_rate_limits_updated(self, params: dict[str, Any], obj: dict[str, Any]) -> None:
+        rl = params.get("rateLimits")
+        p = None
+        s = None
+        if isinstance(rl, dict):
+            p = rl.get("primary")
+            s = rl.get("secondary")
+
+        def _unpack(win: Any) -> tuple[Optional[float], Optional[int], Optional[int]]:
+            if not isinstance(win, dict):
+                return (None, None, None)
+            used = win.get("usedPercent")
+            up = float(used) if isinstance(used, (int, float)) and not isinstance(used, bool) else None
+            return (up, _as_int(win, "windowDurationMins"), _as_int(win, "resetsAt"))
+
+        p_used, p_mins, p_resets = _unpack(p)
+        s_used, s_mins, s_resets = _unpack(s)
+        await self.push_event(
+            TokenCount(
+                model_context_window=None,
+                total_tokens=None,
+                input_tokens=None,
+                output_tokens=None,
+                cached_input_tokens=None,
+                reasoning_output_tokens=None,
+                primary_used_percent=p_used,
+                primary_window_minutes=p_mins,
+                primary_resets_at=p_resets,
+                secondary_used_percent=s_used,
+                secondary_window_minutes=s_mins,
+                secondary_resets_at=s_resets,
+                raw=debug_raw(obj),
             )
-            return
+        )
 
-        if method == "error":
-            err = params.get("error")
-            msg = None
-            if isinstance(err, dict):
-                msg = err.get("message")
-            await self.push_event(ErrorEvent(message=str(msg) if msg else "error", raw=params))
-            return
+    async def _on_error(self, params: dict[str, Any], obj: dict[str, Any]) -> None:
+        err = params.get("error")
+        msg = None
+        if isinstance(err, dict):
+            msg = err.get("message")
+        await self.push_event(ErrorEvent(message=str(msg) if msg else "error", raw=debug_raw(params)))
 
 
 class AppServerBackend:
@@ -387,10 +552,7 @@ class AppServerBackend:
         settings: AppServerSettings,
     ) -> AppServerSession:
         # Normalize/resolve the workdir before passing it to Codex.
-        try:
-            workdir = await machine.realpath(workdir)
-        except Exception:
-            workdir = os.path.normpath(workdir)
+        workdir = await resolve_workdir(machine, workdir)
 
         argv = [settings.codex_bin, "app-server", *settings.codex_args]
 
@@ -425,40 +587,15 @@ class AppServerBackend:
             finally:
                 await session.close()
 
-        asyncio.create_task(reap())
+        session._reaper = asyncio.create_task(reap(), name=f"codex-app-server-reap-{session.run_id}")
 
         # Handshake.
-        await session.rpc.request(
-            method="initialize",
-            params={"clientInfo": {"name": "tgcodex", "version": "0.0"}},
-        )
+        await session.rpc.request(method="initialize", params=_INITIALIZE_PARAMS)
 
-        approval_policy = _approval_policy_from_mode(settings.approval_mode)
-        developer_instructions = _developer_instructions_for_mode(settings.approval_mode)
-
-        if thread_id:
-            res = await session.rpc.request(
-                method="thread/resume",
-                params={
-                    "threadId": thread_id,
-                    "cwd": workdir,
-                    "approvalPolicy": approval_policy,
-                    "sandbox": settings.sandbox,
-                    "developerInstructions": developer_instructions,
-                    "model": settings.model,
-                },
-            )
-        else:
-            res = await session.rpc.request(
-                method="thread/start",
-                params={
-                    "cwd": workdir,
-                    "approvalPolicy": approval_policy,
-                    "sandbox": settings.sandbox,
-                    "developerInstructions": developer_instructions,
-                    "model": settings.model,
-                },
-            )
+        res = await session.rpc.request(
+            method="thread/resume" if thread_id else "thread/start",
+            params=_thread_params(thread_id=thread_id, workdir=workdir, settings=settings),
+        )
 
         # Thread id is needed for turn/start; also emit ThreadStarted for existing bot logic.
         tid: Optional[str] = None
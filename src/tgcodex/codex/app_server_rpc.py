@@ -2,16 +2,51 @@ from __future__ import annotations
 
 import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any, Awaitable, Callable, Optional
 
 from tgcodex.machines.base import RunHandle
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
 
 JsonObject = dict[str, Any]
 RequestId = str | int
 
 
+def _dumps_line(obj: JsonObject) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _decode_log(line: bytes) -> str:
+    return line.decode("utf-8", "replace")
+
+
+def _loads(line: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+# Lines above this size (typically big command output deltas) are parsed off the event loop
+# so other chats aren't stalled; one worker shared by all sessions keeps threads bounded.
+_OFFLOAD_PARSE_BYTES = 32_768
+_parse_executor: Optional[ThreadPoolExecutor] = None
+
+
+async def _loads_offloaded(line: bytes) -> Any:
+    global _parse_executor
+    if _parse_executor is None:
+        _parse_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tgcodex-json")
+    return await asyncio.get_running_loop().run_in_executor(_parse_executor, _loads, line)
+
+
 class JsonRpcError(RuntimeError):
     def __init__(self, *, error: Any) -> None:
         super().__init__(str(error))
@@ -23,26 +58,49 @@ class JsonLineBuffer:
     Incremental newline-delimited JSON buffer.
 
     Codex app-server communicates over stdio using one JSON object per line.
+    Lines are returned as raw bytes; the JSON parser handles UTF-8 itself, so only the
+    (low-volume) log path needs to decode.
     """
 
     def __init__(self) -> None:
         self._buf = bytearray()
+        # Read cursor into _buf: consumed bytes are only dropped in bulk (see _COMPACT_AT) so
+        # a burst of many lines doesn't memmove the tail once per line.
+        self._head = 0
+
+    _COMPACT_AT = 65536
 
-    def feed(self, chunk: bytes) -> list[str]:
+    def feed(self, chunk: bytes) -> list[bytes]:
+        if not self._buf and chunk.endswith(b"\n"):
+            # Fast path: a burst of complete lines with nothing carried over splits in one C call.
+            return [s for s in (ln.strip() for ln in chunk.split(b"\n")) if s]
         self._buf += chunk
-        out: list[str] = []
-        while True:
-            idx = self._buf.find(b"\n")
-            if idx < 0:
-                return out
-            line = self._buf[:idx].decode("utf-8", "replace")
-            del self._buf[: idx + 1]
-            line = line.strip()
-            if line:
-                out.append(line)
-
-
-@dataclass(frozen=True)
+        out: list[bytes] = []
+        buf = self._buf
+        head = self._head
+        # Slicing a memoryview copies each line once (straight into bytes); slicing the
+        # bytearray would build an intermediate bytearray first. The view must be released
+        # before the buffer is resized below.
+        with memoryview(buf) as view:
+            while True:
+                idx = buf.find(b"\n", head)
+                if idx < 0:
+                    break
+                line = bytes(view[head:idx]).strip()
+                head = idx + 1
+                if line:
+                    out.append(line)
+        if head == len(buf):
+            buf.clear()
+            head = 0
+        elif head > self._COMPACT_AT and head * 2 > len(buf):
+            del buf[:head]
+            head = 0
+        self._head = head
+        return out
+
+
+@dataclass(frozen=True, slots=True)
 class JsonRpcIncoming:
     obj: JsonObject
 
@@ -98,7 +156,13 @@ class JsonRpcConnection:
         self._on_log = on_log
 
         self._next_id = 1
-        self._pending: dict[RequestId, asyncio.Future[Any]] = {}
+        # Outgoing lines queued within one loop iteration are sent with a single write_stdin.
+        self._write_buf = bytearray()
+        self._write_flush: Optional[asyncio.Future[None]] = None
+        # Serializes write_stdin calls; a flush waiting here keeps collecting new lines.
+        self._write_lock = asyncio.Lock()
+        # We only ever issue integer ids (see request()); server-initiated requests may use str.
+        self._pending: dict[int, asyncio.Future[Any]] = {}
         self._closed = False
 
         self._stdout = JsonLineBuffer()
@@ -115,11 +179,25 @@ class JsonRpcConnection:
     async def write_obj(self, obj: JsonObject) -> None:
         if self._closed:
             raise JsonRpcError(error="connection closed")
-        data = (json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8")
-        await self._handle.write_stdin(data)
+        self._write_buf += _dumps_line(obj)
+        fut = self._write_flush
+        if fut is None:
+            fut = self._write_flush = asyncio.ensure_future(self._flush_writes())
+        # Shielded so one cancelled caller doesn't cancel the shared flush; every caller still
+        # sees write errors.
+        await asyncio.shield(fut)
+
+    async def _flush_writes(self) -> None:
+        # Let other coroutines ready in this loop iteration append their messages first.
+        await asyncio.sleep(0)
+        async with self._write_lock:
+            data = bytes(self._write_buf)
+            self._write_buf.clear()
+            self._write_flush = None
+            await self._handle.write_stdin(data)
 
     async def request(self, *, method: str, params: JsonObject) -> Any:
-        rid: RequestId = self._next_id
+        rid = self._next_id
         self._next_id += 1
         loop = asyncio.get_running_loop()
         fut: asyncio.Future[Any] = loop.create_future()
@@ -132,11 +210,20 @@ class JsonRpcConnection:
 
     async def feed_stdout(self, chunk: bytes) -> None:
         for line in self._stdout.feed(chunk):
+            # Lines are already stripped; anything not starting like JSON is a log line, so skip
+            # the (exception-raising) parse attempt.
+            if line[:1] not in (b"{", b"["):
+                if self._on_log is not None:
+                    await self._on_log(_decode_log(line))
+                continue
             try:
-                obj = json.loads(line)
+                if len(line) > _OFFLOAD_PARSE_BYTES:
+                    obj = await _loads_offloaded(line)
+                else:
+                    obj = _loads(line)
             except Exception:
                 if self._on_log is not None:
-                    await self._on_log(line)
+                    await self._on_log(_decode_log(line))
                 continue
             if not isinstance(obj, dict):
                 continue
@@ -145,30 +232,39 @@ class JsonRpcConnection:
     async def feed_stderr(self, chunk: bytes) -> None:
         for line in self._stderr.feed(chunk):
             if self._on_log is not None:
-                await self._on_log(line)
+                await self._on_log(_decode_log(line))
 
     async def _handle_incoming(self, incoming: JsonRpcIncoming) -> None:
-        if incoming.is_response:
-            rid = incoming.id
-            assert rid is not None
-            fut = self._pending.pop(rid, None)
-            if fut is None or fut.done():
+        # Same classification as the JsonRpcIncoming properties, with a single lookup per field.
+        obj = incoming.obj
+        rid = obj.get("id")
+        if not isinstance(rid, (str, int)):
+            rid = None
+        method = obj.get("method")
+        if not isinstance(method, str):
+            method = None
+
+        if method is None:
+            if rid is not None:
+                if type(rid) is not int:
+                    return
+                fut = self._pending.pop(rid, None)
+                if fut is None or fut.done():
+                    return
+                err = obj.get("error")
+                if err is not None:
+                    fut.set_exception(JsonRpcError(error=err))
+                    return
+                fut.set_result(obj.get("result"))
                 return
-            if "error" in incoming.obj and incoming.obj["error"] is not None:
-                fut.set_exception(JsonRpcError(error=incoming.obj.get("error")))
-                return
-            fut.set_result(incoming.obj.get("result"))
-            return
-
-        if incoming.is_request:
+        elif rid is not None:
             await self._on_server_request(incoming)
             return
-
-        if incoming.is_notification:
+        else:
             await self._on_notification(incoming)
             return
 
         # Unknown / log-like object.
         if self._on_log is not None:
-            await self._on_log(json.dumps(incoming.obj))
+            await self._on_log(json.dumps(obj))
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterable, Literal
 
 from tgcodex.util.shlex_tokens import prefix_string, split_command
@@ -8,13 +9,15 @@ from tgcodex.util.shlex_tokens import prefix_string, split_command
 ApprovalDecision = Literal["approved", "denied"]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PrefixMatch:
     prefix: str
     matched: bool
 
 
+@lru_cache(maxsize=1024)
 def command_prefix(command: str, *, prefix_tokens: int) -> str:
+    # Memoized: sessions repeat the same commands and shlex tokenizing is slow pure Python.
     tokens = split_command(command)
     return prefix_string(tokens, prefix_tokens)
 
@@ -23,7 +26,9 @@ def is_trusted_prefix(
     command: str, *, trusted_prefixes: Iterable[str], prefix_tokens: int
 ) -> PrefixMatch:
     prefix = command_prefix(command, prefix_tokens=prefix_tokens)
-    matched = prefix in set(trusted_prefixes)
+    # Callers holding a set/frozenset get an O(1) lookup; anything else is scanned once
+    # instead of being copied into a throwaway set per command.
+    matched = prefix in trusted_prefixes
     return PrefixMatch(prefix=prefix, matched=matched)
 
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import json
 import uuid
 from typing import AsyncIterator, Optional
@@ -15,34 +16,66 @@ from tgcodex.codex.events import (
 )
 from tgcodex.machines.base import Machine, RunHandle
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+_json_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
 
 class CodexRun:
     def __init__(self, *, machine: Machine, handle: RunHandle) -> None:
         self.machine = machine
         self.handle = handle
-        self.run_id = str(uuid.uuid4())
+        self.run_id = uuid.uuid4().hex
         self.thread_id: Optional[str] = None
 
-        self._queue: asyncio.Queue[Optional[CodexEvent]] = asyncio.Queue()
+        # Single producer (stdout callback) and single consumer (events()), both on the loop,
+        # so a deque plus a wake-up flag is enough; no queue locks or per-item futures.
+        self._events: collections.deque[CodexEvent] = collections.deque()
+        self._wake = asyncio.Event()
         self._closed = False
+        # Keeps the reaper task referenced; the loop itself only holds weak references.
+        self._reaper: Optional[asyncio.Task[None]] = None
 
     async def push_event(self, ev: CodexEvent) -> None:
+        self.push_event_nowait(ev)
+
+    def push_event_nowait(self, ev: CodexEvent) -> None:
+        # The buffer is unbounded, so producers never need to yield to the loop.
+        if self._closed:
+            return
         if isinstance(ev, ThreadStarted):
             self.thread_id = ev.thread_id
-        await self._queue.put(ev)
+        self._events.append(ev)
+        self._wake.set()
+
+    def push_events_nowait(self, evs: list[CodexEvent]) -> None:
+        """Queues several events with a single consumer wake-up."""
+        if self._closed or not evs:
+            return
+        for ev in evs:
+            if isinstance(ev, ThreadStarted):
+                self.thread_id = ev.thread_id
+        self._events.extend(evs)
+        self._wake.set()
 
     async def close(self) -> None:
         if self._closed:
             return
         self._closed = True
-        await self._queue.put(None)
+        self._wake.set()
 
     async def events(self) -> AsyncIterator[CodexEvent]:
+        events = self._events
         while True:
-            ev = await self._queue.get()
-            if ev is None:
+            while events:
+                yield events.popleft()
+            if self._closed:
                 return
-            yield ev
+            self._wake.clear()
+            await self._wake.wait()
 
     async def wait(self) -> int:
         return await self.handle.wait()
@@ -72,7 +105,7 @@ class CodexRun:
         # `decision` string (e.g. "approved"/"denied", plus other variants in newer Codex builds).
         if call_id:
             payload = {
-                "id": str(uuid.uuid4()),
+                "id": uuid.uuid4().hex,
                 "op": {
                     "type": "exec_approval",
                     "decision": decision,
@@ -81,10 +114,39 @@ class CodexRun:
             }
         else:
             payload = {"type": "exec_approval", "decision": decision}
-        data = (json.dumps(payload) + "\n").encode("utf-8")
+        if orjson is not None:
+            data = orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE)
+        else:
+            data = (_json_encode(payload) + "\n").encode("utf-8")
         await self.handle.write_stdin(data)
 
 
+_WHITESPACE = frozenset(b" \t\r\n\x0b\x0c")
+
+
+def _take_lines(pending: list[bytes], chunk: bytes) -> list[bytes]:
+    """
+    Appends `chunk` to the partial-line fragments in `pending` and returns the completed lines
+    (without the trailing newline).
+
+    Fragments are only joined once a newline arrives, so a burst of small chunks isn't copied
+    again on every call.
+    """
+    if b"\n" not in chunk:
+        if chunk:
+            pending.append(chunk)
+        return []
+    if pending:
+        pending.append(chunk)
+        chunk = b"".join(pending)
+        pending.clear()
+    lines = chunk.split(b"\n")
+    tail = lines.pop()
+    if tail:
+        pending.append(tail)
+    return lines
+
+
 async def start_codex_process(
     *,
     machine: Machine,
@@ -94,45 +156,38 @@ async def start_codex_process(
     pty: bool,
 ) -> CodexRun:
     run: Optional[CodexRun] = None
-    stdout_buf = bytearray()
-    stderr_buf = bytearray()
+    stdout_pending: list[bytes] = []
+    stderr_pending: list[bytes] = []
 
     async def on_stdout(chunk: bytes) -> None:
-        nonlocal stdout_buf, run
-        stdout_buf += chunk
-        while True:
-            idx = stdout_buf.find(b"\n")
-            if idx < 0:
-                return
-            line = stdout_buf[:idx].decode("utf-8", "replace")
-            del stdout_buf[: idx + 1]
-            line = line.strip()
+        evs: list[CodexEvent] = []
+        for line in _take_lines(stdout_pending, chunk):
             if not line:
                 continue
+            # Only copy when there's surrounding whitespace (usually just a CRLF "\r").
+            if line[0] in _WHITESPACE or line[-1] in _WHITESPACE:
+                line = line.strip()
+                if not line:
+                    continue
             obj, non_json = parse_json_line(line)
             if non_json is not None:
-                if run is not None:
-                    await run.push_event(LogLine(text=non_json))
+                evs.append(LogLine(text=non_json))
                 continue
             assert obj is not None
-            for ev in parse_event_obj(obj):
-                if run is not None:
-                    await run.push_event(ev)
+            evs.extend(parse_event_obj(obj))
+        if run is not None:
+            run.push_events_nowait(evs)
 
     async def on_stderr(chunk: bytes) -> None:
-        nonlocal stderr_buf, run
-        stderr_buf += chunk
-        while True:
-            idx = stderr_buf.find(b"\n")
-            if idx < 0:
-                return
-            line = stderr_buf[:idx].decode("utf-8", "replace")
-            del stderr_buf[: idx + 1]
-            line = line.rstrip("\r")
-            if not line.strip():
+        evs: list[CodexEvent] = []
+        for line in _take_lines(stderr_pending, chunk):
+            if line.endswith(b"\r"):
+                line = line[:-1]
+            if not line or line.isspace():
                 continue
-            if run is not None:
-                await run.push_event(LogLine(text=line))
+            evs.append(LogLine(text=line.decode("utf-8", "replace")))
+        if run is not None:
+            run.push_events_nowait(evs)
 
     handle = await machine.run(
         argv=argv,
@@ -149,12 +204,12 @@ async def start_codex_process(
         try:
             rc = await run.wait()
             if rc != 0:
-                await run.push_event(ErrorEvent(message=f"codex exited with {rc}"))
+                run.push_event_nowait(ErrorEvent(message=f"codex exited with {rc}"))
         except Exception as exc:
             # Avoid "Task exception was never retrieved" and surface failures to the chat.
-            await run.push_event(ErrorEvent(message=f"codex runner error: {exc}"))
+            run.push_event_nowait(ErrorEvent(message=f"codex runner error: {exc}"))
         finally:
             await run.close()
 
-    asyncio.create_task(reap())
+    run._reaper = asyncio.create_task(reap(), name=f"codex-reap-{run.run_id}")
     return run
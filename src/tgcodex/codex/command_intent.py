@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import re
 import shlex
 
 
-_WRITE_COMMANDS = {
+_WRITE_COMMANDS = frozenset({
     "rm",
     "rmdir",
     "mkdir",
@@ -16,9 +17,9 @@ _WRITE_COMMANDS = {
     "tee",
     "truncate",
     "dd",
-}
+})
 
-_GIT_WRITE_SUBCOMMANDS = {
+_GIT_WRITE_SUBCOMMANDS = frozenset({
     "add",
     "am",
     "apply",
@@ -37,7 +38,38 @@ _GIT_WRITE_SUBCOMMANDS = {
     "rm",
     "stash",
     "switch",
-}
+})
+
+
+# Matches any whitespace-delimited word that the token scan below could act on, or a ">".
+# Only meaningful for unquoted input, where shlex tokens are exactly the whitespace-split words.
+_WRITE_HINT_RE = re.compile(
+    r"(?:^|\s)(?:"
+    + "|".join(re.escape(w) for w in sorted(_WRITE_COMMANDS | {"git", "sed"}))
+    + r")(?=\s|$)|>"
+)
+
+_SHELL_WRAPPERS = ("bash -lc ", "/bin/bash -lc ", "sh -lc ", "/bin/sh -lc ")
+
+
+def _unwrap_shell_lc(s: str) -> str | None:
+    """
+    Returns the inner command of `bash -lc '<inner>'` (and friends) without tokenizing, or None
+    when the quoting isn't simple enough to take literally.
+    """
+    if not s.startswith(_SHELL_WRAPPERS):
+        return None
+    rest = s[s.index("-lc ") + 4 :].lstrip()
+    if len(rest) < 2:
+        return None
+    q = rest[0]
+    if q not in ("'", '"') or rest[-1] != q:
+        return None
+    inner = rest[1:-1]
+    # Single quotes are always literal; double quotes are literal unless they contain escapes.
+    if q in inner or (q == '"' and "\\" in inner):
+        return None
+    return inner
 
 
 def needs_write_approval(command: str) -> bool:
@@ -51,11 +83,22 @@ def needs_write_approval(command: str) -> bool:
     if not s:
         return False
 
-    try:
-        tokens = shlex.split(s, posix=True)
-    except Exception:
-        # If we can't parse, fail closed.
-        return True
+    inner = _unwrap_shell_lc(s)
+    if inner is not None and inner.strip():
+        return needs_write_approval(inner)
+
+    if "'" not in s and '"' not in s and "\\" not in s:
+        # Nothing to unquote: one regex pass rules out most read-only commands, and the tokens
+        # are just the whitespace-separated words.
+        if _WRITE_HINT_RE.search(s) is None:
+            return False
+        tokens = s.split()
+    else:
+        try:
+            tokens = shlex.split(s, posix=True)
+        except Exception:
+            # If we can't parse, fail closed.
+            return True
 
     if not tokens:
         return False
@@ -72,27 +115,31 @@ def needs_write_approval(command: str) -> bool:
         # Recurse on the inner command string.
         return needs_write_approval(tokens[2])
 
-    for i, tok in enumerate(tokens):
-        # Shell redirections can write even if the command itself is "read-only".
-        if ">" in tok and tok != "2>&1":
-            return True
-        if tok in (">", ">>"):
-            return True
-
+    for tok in tokens:
         # Common write-ish primitives.
         if tok in _WRITE_COMMANDS:
             return True
+        # Shell redirections can write even if the command itself is "read-only".
+        if ">" in tok and tok != "2>&1":
+            return True
 
-        # In-place edits.
-        if tok == "sed":
-            for t in tokens[i + 1 :]:
-                if t == "-i" or t.startswith("-i"):
-                    return True
+    # In-place edits (any -i flag after the first sed).
+    if "sed" in tokens:
+        i = tokens.index("sed")
+        for t in tokens[i + 1 :]:
+            if t.startswith("-i"):
+                return True
 
-        # Git: treat many subcommands as mutating.
-        if tok == "git" and i + 1 < len(tokens):
-            sub = tokens[i + 1]
-            if sub in _GIT_WRITE_SUBCOMMANDS:
+    # Git: treat many subcommands as mutating.
+    if "git" in tokens:
+        last = len(tokens) - 1
+        i = -1
+        while True:
+            try:
+                i = tokens.index("git", i + 1)
+            except ValueError:
+                break
+            if i < last and tokens[i + 1] in _GIT_WRITE_SUBCOMMANDS:
                 return True
 
     return False
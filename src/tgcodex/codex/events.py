@@ -1,49 +1,66 @@
 from __future__ import annotations
 
 import json
+import os
 import shlex
+import string
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
 
-@dataclass(frozen=True)
+
+# Raw protocol dicts are only needed by approval requests (to answer the right request). Other
+# events can carry large payloads (aggregated output, full telemetry), so they only keep their
+# raw dict when debugging with TGCODEX_KEEP_RAW_EVENTS=1.
+KEEP_RAW_EVENTS = os.getenv("TGCODEX_KEEP_RAW_EVENTS") == "1"
+
+
+def debug_raw(obj: dict[str, Any]) -> Optional[dict[str, Any]]:
+    return obj if KEEP_RAW_EVENTS else None
+
+
+@dataclass(frozen=True, slots=True)
 class ThreadStarted:
     thread_id: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TurnStarted:
     pass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TurnCompleted:
     input_tokens: Optional[int] = None
     output_tokens: Optional[int] = None
     cached_input_tokens: Optional[int] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TurnFailed:
     message: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AgentMessageDelta:
     text: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AgentMessage:
     text: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AgentReasoningDelta:
     text: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TokenCount:
     """
     Best-effort representation of Codex CLI token/rate-limit telemetry.
@@ -67,10 +84,10 @@ class TokenCount:
     secondary_window_minutes: Optional[int]
     secondary_resets_at: Optional[int]
 
-    raw: dict[str, Any]
+    raw: Optional[dict[str, Any]] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExecApprovalRequest:
     command: str
     cwd: Optional[str] = None
@@ -81,31 +98,31 @@ class ExecApprovalRequest:
     raw: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExecCommandOutputDelta:
     text: str
-    raw: dict[str, Any]
+    raw: Optional[dict[str, Any]] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExecCommandEnd:
     exit_code: Optional[int]
     aggregated_output: Optional[str]
-    raw: dict[str, Any]
+    raw: Optional[dict[str, Any]] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ToolStarted:
     """Emitted when a command_execution item.started event is received."""
     command: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LogLine:
     text: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ErrorEvent:
     message: str
     raw: Optional[dict[str, Any]] = None
@@ -147,276 +164,334 @@ def parse_event_obj(obj: dict[str, Any]) -> list[CodexEvent]:
             outer_id = oid
         obj = msg
 
+    # A hashed dict lookup; interning `t` first would just add a second lookup per event.
     t = obj.get("type")
+    handler = _HANDLERS.get(t) if type(t) is str else None
+    if handler is None:
+        return []
+    return handler(obj, raw_outer, outer_id)
+
 
-    # ── Legacy wrapper formats (older Codex versions) ─────────────────────────
-    if isinstance(t, str) and t in ("event_msg", "response_item") and isinstance(obj.get("payload"), dict):
-        return parse_event_obj(obj["payload"])
+# ── Per-type handlers ─────────────────────────────────────────────────────────
+# Each takes (obj, raw_outer, outer_id); parse_event_obj dispatches on obj["type"].
 
-    # ── Session metadata (Codex exec) ─────────────────────────────────────────
-    if t == "session_meta" and isinstance(obj.get("payload"), dict):
-        sid = obj["payload"].get("id")
+_Handler = Callable[[dict[str, Any], dict[str, Any], Optional[str]], list[CodexEvent]]
+
+
+def _h_wrapper(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    # Legacy event_msg/response_item wrappers (older Codex versions).
+    payload = obj.get("payload")
+    if isinstance(payload, dict):
+        return parse_event_obj(payload)
+    return []
+
+
+def _h_session_meta(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    payload = obj.get("payload")
+    if isinstance(payload, dict):
+        sid = payload.get("id")
         if isinstance(sid, str) and sid:
             return [ThreadStarted(thread_id=sid)]
+    return []
 
-    # ── v0.98+ item.completed / item.started formats ──────────────────────────
-    if t in ("item.completed", "item_completed"):
-        item = obj.get("item")
-        if isinstance(item, dict):
-            return _parse_item(item, raw_outer=raw_outer, outer_id=outer_id)
-        return []
 
-    if t in ("item.started", "item_started"):
-        item = obj.get("item")
-        if isinstance(item, dict):
-            # Approval requests can arrive on item.started (Codex pauses until a decision is sent).
-            parsed = _parse_item(item, raw_outer=raw_outer, outer_id=outer_id)
-            if parsed:
-                return parsed
-            if item.get("type") == "command_execution":
-                cmd = item.get("command") or ""
-                if isinstance(cmd, list):
-                    cmd = " ".join(cmd)
-                if cmd:
-                    return [ToolStarted(command=str(cmd))]
-        return []
+def _h_item_completed(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    item = obj.get("item")
+    if isinstance(item, dict):
+        return _parse_item(item, raw_outer=raw_outer, outer_id=outer_id)
+    return []
 
-    # ── Structured event types ─────────────────────────────────────────────────
-    if t == "thread.started":
-        thread_id = obj.get("thread_id")
-        if isinstance(thread_id, str):
-            return [ThreadStarted(thread_id=thread_id)]
-
-    if t == "turn.started":
-        return [TurnStarted()]
-
-    if t == "turn.completed":
-        usage = obj.get("usage") or {}
-        return [TurnCompleted(
-            input_tokens=usage.get("input_tokens") if isinstance(usage.get("input_tokens"), int) else None,
-            output_tokens=usage.get("output_tokens") if isinstance(usage.get("output_tokens"), int) else None,
-            cached_input_tokens=usage.get("cached_input_tokens") if isinstance(usage.get("cached_input_tokens"), int) else None,
-        )]
 
-    if t == "turn.failed":
-        msg = None
-        if isinstance(obj.get("error"), dict):
-            msg = obj["error"].get("message")
-        if not isinstance(msg, str):
-            msg = obj.get("message")
-        return [TurnFailed(message=str(msg) if msg is not None else "turn failed")]
-
-    if t in ("error", "stream_error"):
-        msg = obj.get("message") or obj.get("error_description") or obj.get("error")
-        return [ErrorEvent(message=str(msg), raw=obj)]
-
-    # ── Legacy payload types (inside event_msg/response_item) ─────────────────
-    if t in ("agent_message_delta", "agent_message_content_delta"):
-        delta = obj.get("delta") or obj.get("text") or obj.get("message")
-        if isinstance(delta, str) and delta:
-            return [AgentMessageDelta(text=delta)]
-
-    if t == "agent_message":
-        msg = obj.get("message") or obj.get("text")
-        if isinstance(msg, str) and msg:
-            return [AgentMessage(text=msg)]
-
-    if t in ("agent_reasoning_delta", "reasoning_content_delta", "reasoning_raw_content_delta"):
-        delta = obj.get("delta") or obj.get("text") or obj.get("content")
-        if isinstance(delta, str) and delta:
-            return [AgentReasoningDelta(text=delta)]
-
-    if t == "token_count":
-        info = obj.get("info")
-        model_context_window: Optional[int] = None
-        total_tokens: Optional[int] = None
-        input_tokens: Optional[int] = None
-        output_tokens: Optional[int] = None
-        cached_input_tokens: Optional[int] = None
-        reasoning_output_tokens: Optional[int] = None
-        if isinstance(info, dict):
-            mcw = info.get("model_context_window")
-            if isinstance(mcw, int):
-                model_context_window = mcw
-            # `total_token_usage` is cumulative usage across the run; it's *not* the same as
-            # "how much context is currently occupied". For context telemetry we want the last
-            # request/turn usage when available.
-            usage = info.get("last_token_usage") or info.get("total_token_usage")
-            if isinstance(usage, dict):
-                tt = usage.get("total_tokens")
-                if isinstance(tt, int):
-                    total_tokens = tt
-                it = usage.get("input_tokens")
-                if isinstance(it, int):
-                    input_tokens = it
-                ot = usage.get("output_tokens")
-                if isinstance(ot, int):
-                    output_tokens = ot
-                cit = usage.get("cached_input_tokens")
-                if isinstance(cit, int):
-                    cached_input_tokens = cit
-                rot = usage.get("reasoning_output_tokens")
-                if isinstance(rot, int):
-                    reasoning_output_tokens = rot
-
-        rl = obj.get("rate_limits")
-        p_used = p_window = p_resets = None
-        s_used = s_window = s_resets = None
-        if isinstance(rl, dict):
-            primary = rl.get("primary")
-            if isinstance(primary, dict):
-                used = primary.get("used_percent")
-                if isinstance(used, (int, float)) and not isinstance(used, bool):
-                    p_used = float(used)
-                win = primary.get("window_minutes")
-                if isinstance(win, int):
-                    p_window = win
-                ra = primary.get("resets_at")
-                if isinstance(ra, int):
-                    p_resets = ra
-
-            secondary = rl.get("secondary")
-            if isinstance(secondary, dict):
-                used = secondary.get("used_percent")
-                if isinstance(used, (int, float)) and not isinstance(used, bool):
-                    s_used = float(used)
-                win = secondary.get("window_minutes")
-                if isinstance(win, int):
-                    s_window = win
-                ra = secondary.get("resets_at")
-                if isinstance(ra, int):
-                    s_resets = ra
-
-        return [TokenCount(
-            model_context_window=model_context_window,
-            total_tokens=total_tokens,
-            input_tokens=input_tokens,
-            output_tokens=output_tokens,
-            cached_input_tokens=cached_input_tokens,
-            reasoning_output_tokens=reasoning_output_tokens,
-            primary_used_percent=p_used,
-            primary_window_minutes=p_window,
-            primary_resets_at=p_resets,
-            secondary_used_percent=s_used,
-            secondary_window_minutes=s_window,
-            secondary_resets_at=s_resets,
-            raw=obj,
-        )]
+def _h_item_started(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    item = obj.get("item")
+    if isinstance(item, dict):
+        # Approval requests can arrive on item.started (Codex pauses until a decision is sent).
+        parsed = _parse_item(item, raw_outer=raw_outer, outer_id=outer_id)
+        if parsed:
+            return parsed
+        if item.get("type") == "command_execution":
+            cmd = item.get("command") or ""
+            if isinstance(cmd, list):
+                cmd = " ".join(cmd)
+            if cmd:
+                return [ToolStarted(command=str(cmd))]
+    return []
 
-    # OpenAI tool-call format: surface exec_command requests and outputs as tool events.
-    if t == "function_call":
-        name = obj.get("name")
-        args_raw = obj.get("arguments")
-        if name == "exec_command" and isinstance(args_raw, (str, dict)):
-            args = None
-            if isinstance(args_raw, str):
-                try:
-                    args = json.loads(args_raw)
-                except Exception:
-                    args = None
-            elif isinstance(args_raw, dict):
-                args = args_raw
-            if isinstance(args, dict):
-                cmd = args.get("cmd")
-                if isinstance(cmd, list):
-                    argv = [str(c) for c in cmd]
-                    try:
-                        cmd = shlex.join(argv)
-                    except Exception:
-                        cmd = " ".join(argv)
-                if isinstance(cmd, str) and cmd:
-                    call_id = obj.get("call_id")
-                    sandbox_perm = args.get("sandbox_permissions")
-                    if isinstance(sandbox_perm, str) and sandbox_perm.startswith("require"):
-                        cwd = args.get("cwd")
-                        reason = args.get("justification")
-                        return [ExecApprovalRequest(
-                            command=cmd,
-                            cwd=cwd if isinstance(cwd, str) else None,
-                            reason=reason if isinstance(reason, str) else None,
-                            call_id=call_id if isinstance(call_id, str) else None,
-                            outer_id=outer_id,
-                            raw=raw_outer,
-                        )]
-                    return [ToolStarted(command=cmd)]
-
-    if t == "function_call_output":
-        out = obj.get("output")
-        if isinstance(out, str):
-            return [ExecCommandEnd(exit_code=None, aggregated_output=out, raw=obj)]
-
-    if t == "exec_approval_request":
-        cmd = obj.get("command")
-        # command can be a list or a string
-        if isinstance(cmd, list):
-            argv = [str(c) for c in cmd]
+
+def _h_thread_started(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    thread_id = obj.get("thread_id")
+    if isinstance(thread_id, str):
+        return [ThreadStarted(thread_id=thread_id)]
+    return []
+
+
+def _h_turn_started(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    return [TurnStarted()]
+
+
+def _h_turn_completed(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    usage = obj.get("usage") or {}
+    ug = usage.get
+    return [TurnCompleted(
+        input_tokens=_opt_int(ug("input_tokens")),
+        output_tokens=_opt_int(ug("output_tokens")),
+        cached_input_tokens=_opt_int(ug("cached_input_tokens")),
+    )]
+
+
+def _h_turn_failed(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    msg = None
+    if isinstance(obj.get("error"), dict):
+        msg = obj["error"].get("message")
+    if not isinstance(msg, str):
+        msg = obj.get("message")
+    return [TurnFailed(message=str(msg) if msg is not None else "turn failed")]
+
+
+def _h_error(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    msg = obj.get("message") or obj.get("error_description") or obj.get("error")
+    return [ErrorEvent(message=str(msg), raw=debug_raw(obj))]
+
+
+def _h_agent_message_delta(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    delta = obj.get("delta") or obj.get("text") or obj.get("message")
+    if isinstance(delta, str) and delta:
+        return [AgentMessageDelta(text=delta)]
+    return []
+
+
+def _h_agent_message(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    msg = obj.get("message") or obj.get("text")
+    if isinstance(msg, str) and msg:
+        return [AgentMessage(text=msg)]
+    return []
+
+
+def _h_reasoning_delta(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    delta = obj.get("delta") or obj.get("text") or obj.get("content")
+    if isinstance(delta, str) and delta:
+        return [AgentReasoningDelta(text=delta)]
+    return []
+
+
+def _opt_int(v: Any) -> Optional[int]:
+    return v if isinstance(v, int) else None
+
+
+def _opt_percent(v: Any) -> Optional[float]:
+    # bool is an int subclass; an exact type check excludes it.
+    return float(v) if type(v) in (int, float) else None
+
+
+def _h_token_count(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    model_context_window: Optional[int] = None
+    total_tokens: Optional[int] = None
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    cached_input_tokens: Optional[int] = None
+    reasoning_output_tokens: Optional[int] = None
+    info = obj.get("info")
+    if isinstance(info, dict):
+        ig = info.get
+        model_context_window = _opt_int(ig("model_context_window"))
+        # `total_token_usage` is cumulative usage across the run; it's *not* the same as
+        # "how much context is currently occupied". For context telemetry we want the last
+        # request/turn usage when available.
+        usage = ig("last_token_usage") or ig("total_token_usage")
+        if isinstance(usage, dict):
+            ug = usage.get
+            total_tokens = _opt_int(ug("total_tokens"))
+            input_tokens = _opt_int(ug("input_tokens"))
+            output_tokens = _opt_int(ug("output_tokens"))
+            cached_input_tokens = _opt_int(ug("cached_input_tokens"))
+            reasoning_output_tokens = _opt_int(ug("reasoning_output_tokens"))
+
+    p_used = p_window = p_resets = None
+    s_used = s_window = s_resets = None
+    rl = obj.get("rate_limits")
+    if isinstance(rl, dict):
+        primary = rl.get("primary")
+        if isinstance(primary, dict):
+            pg = primary.get
+            p_used = _opt_percent(pg("used_percent"))
+            p_window = _opt_int(pg("window_minutes"))
+            p_resets = _opt_int(pg("resets_at"))
+
+        secondary = rl.get("secondary")
+        if isinstance(secondary, dict):
+            sg = secondary.get
+            s_used = _opt_percent(sg("used_percent"))
+            s_window = _opt_int(sg("window_minutes"))
+            s_resets = _opt_int(sg("resets_at"))
+
+    return [TokenCount(
+        model_context_window=model_context_window,
+        total_tokens=total_tokens,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cached_input_tokens=cached_input_tokens,
+        reasoning_output_tokens=reasoning_output_tokens,
+        primary_used_percent=p_used,
+        primary_window_minutes=p_window,
+        primary_resets_at=p_resets,
+        secondary_used_percent=s_used,
+        secondary_window_minutes=s_window,
+        secondary_resets_at=s_resets,
+        raw=debug_raw(obj),
+    )]
+
+
+# OpenAI tool-call format: surface exec_command requests and outputs as tool events.
+def _h_function_call(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    name = obj.get("name")
+    args_raw = obj.get("arguments")
+    if name == "exec_command" and isinstance(args_raw, (str, dict)):
+        args = None
+        if isinstance(args_raw, str):
             try:
-                cmd = shlex.join(argv)
+                args = json.loads(args_raw)
             except Exception:
-                cmd = " ".join(argv)
-        if not isinstance(cmd, str):
-            cmd = _first_str(obj, ("codex_command", "cmd"))
-        cwd = _first_str(obj, ("cwd", "codex_cwd", "working_directory"))
-        reason = _first_str(obj, ("reason", "codex_reason"))
-        call_id = obj.get("call_id")
-        cmd_argv = obj.get("command") if isinstance(obj.get("command"), list) else None
-        if cmd:
-            return [ExecApprovalRequest(
-                command=cmd,
-                cwd=cwd,
-                reason=reason,
-                call_id=call_id if isinstance(call_id, str) else None,
-                command_argv=[str(c) for c in cmd_argv] if isinstance(cmd_argv, list) else None,
-                outer_id=outer_id,
-                raw=raw_outer,
-            )]
+                args = None
+        elif isinstance(args_raw, dict):
+            args = args_raw
+        if isinstance(args, dict):
+            cmd = args.get("cmd")
+            if isinstance(cmd, list):
+                argv = [str(c) for c in cmd]
+                cmd = _join_argv(argv)
+            if isinstance(cmd, str) and cmd:
+                call_id = obj.get("call_id")
+                sandbox_perm = args.get("sandbox_permissions")
+                if isinstance(sandbox_perm, str) and sandbox_perm.startswith("require"):
+                    cwd = args.get("cwd")
+                    reason = args.get("justification")
+                    return [ExecApprovalRequest(
+                        command=cmd,
+                        cwd=cwd if isinstance(cwd, str) else None,
+                        reason=reason if isinstance(reason, str) else None,
+                        call_id=call_id if isinstance(call_id, str) else None,
+                        outer_id=outer_id,
+                        raw=raw_outer,
+                    )]
+                return [ToolStarted(command=cmd)]
+    return []
+
 
-    if t == "exec_command_output_delta":
-        text = _first_str(obj, ("chunk", "text", "output", "delta", "aggregated_output"))
-        if text:
-            return [ExecCommandOutputDelta(text=text, raw=obj)]
+def _h_function_call_output(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    out = obj.get("output")
+    if isinstance(out, str):
+        return [ExecCommandEnd(exit_code=None, aggregated_output=out, raw=debug_raw(obj))]
+    return []
 
-    if t == "exec_command_end":
-        exit_code = obj.get("exit_code")
-        if isinstance(exit_code, bool):
-            exit_code = None
-        if not isinstance(exit_code, int):
-            exit_code = None
-        aggregated_output = _first_str(obj, ("aggregated_output", "formatted_output", "output"))
-        return [ExecCommandEnd(exit_code=exit_code, aggregated_output=aggregated_output, raw=obj)]
 
-    # Legacy response_item message format (role=assistant)
-    if t == "message" and obj.get("role") == "assistant":
-        content = obj.get("content") or []
-        if isinstance(content, list):
-            texts = [
-                part.get("text", "")
-                for part in content
-                if isinstance(part, dict) and part.get("type") == "output_text"
-            ]
-            combined = "".join(texts)
-            if combined:
-                return [AgentMessage(text=combined)]
+def _h_exec_approval_request(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    cmd = obj.get("command")
+    cmd_argv: Optional[list[str]] = None
+    # command can be a list or a string
+    if isinstance(cmd, list):
+        argv = cmd_argv = [str(c) for c in cmd]
+        cmd = _join_argv(argv)
+    if not isinstance(cmd, str):
+        cmd = _first_str(obj, ("codex_command", "cmd"))
+    cwd = _first_str(obj, ("cwd", "codex_cwd", "working_directory"))
+    reason = _first_str(obj, ("reason", "codex_reason"))
+    call_id = obj.get("call_id")
+    if cmd:
+        return [ExecApprovalRequest(
+            command=cmd,
+            cwd=cwd,
+            reason=reason,
+            call_id=call_id if isinstance(call_id, str) else None,
+            command_argv=cmd_argv,
+            outer_id=outer_id,
+            raw=raw_outer,
+        )]
+    return []
+
+
+def _h_exec_output_delta(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    text = _first_str(obj, ("chunk", "text", "output", "delta", "aggregated_output"))
+    if text:
+        return [ExecCommandOutputDelta(text=text, raw=debug_raw(obj))]
+    return []
+
+
+def _h_exec_command_end(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    exit_code = obj.get("exit_code")
+    if type(exit_code) is not int:
+        exit_code = None
+    aggregated_output = _first_str(obj, ("aggregated_output", "formatted_output", "output"))
+    return [ExecCommandEnd(exit_code=exit_code, aggregated_output=aggregated_output, raw=debug_raw(obj))]
 
+
+def _h_message(obj: dict[str, Any], raw_outer: dict[str, Any], outer_id: Optional[str]) -> list[CodexEvent]:
+    # Legacy response_item message format (role=assistant)
+    if obj.get("role") != "assistant":
+        return []
+    content = obj.get("content") or []
+    if isinstance(content, list):
+        texts = [
+            part.get("text", "")
+            for part in content
+            if isinstance(part, dict) and part.get("type") == "output_text"
+        ]
+        combined = "".join(texts)
+        if combined:
+            return [AgentMessage(text=combined)]
     return []
 
 
+_HANDLERS: dict[str, _Handler] = {
+    "event_msg": _h_wrapper,
+    "response_item": _h_wrapper,
+    "session_meta": _h_session_meta,
+    # v0.98+ item.completed / item.started formats
+    "item.completed": _h_item_completed,
+    "item_completed": _h_item_completed,
+    "item.started": _h_item_started,
+    "item_started": _h_item_started,
+    # Structured event types
+    "thread.started": _h_thread_started,
+    "turn.started": _h_turn_started,
+    "turn.completed": _h_turn_completed,
+    "turn.failed": _h_turn_failed,
+    "error": _h_error,
+    "stream_error": _h_error,
+    # Legacy payload types (inside event_msg/response_item)
+    "agent_message_delta": _h_agent_message_delta,
+    "agent_message_content_delta": _h_agent_message_delta,
+    "agent_message": _h_agent_message,
+    "agent_reasoning_delta": _h_reasoning_delta,
+    "reasoning_content_delta": _h_reasoning_delta,
+    "reasoning_raw_content_delta": _h_reasoning_delta,
+    "token_count": _h_token_count,
+    "function_call": _h_function_call,
+    "function_call_output": _h_function_call_output,
+    "exec_approval_request": _h_exec_approval_request,
+    "exec_command_output_delta": _h_exec_output_delta,
+    "exec_command_end": _h_exec_command_end,
+    "message": _h_message,
+}
+
+
 def _parse_item(
     item: dict[str, Any], *, raw_outer: dict[str, Any], outer_id: Optional[str]
 ) -> list[CodexEvent]:
     """Parse a single item object from item.completed or similar."""
-    item_type = item.get("type")
+    g = item.get
+    item_type = g("type")
 
     if item_type == "agent_message":
-        text = item.get("text") or item.get("message") or ""
+        text = g("text") or g("message") or ""
         if isinstance(text, str) and text:
             return [AgentMessage(text=text)]
+        return []
 
     if item_type == "reasoning":
         # Reasoning text comes as .text or nested in .summary list
-        text = item.get("text") or ""
+        text = g("text") or ""
         if not text:
-            summary = item.get("summary") or []
+            summary = g("summary") or []
             if isinstance(summary, list):
                 text = " ".join(
                     s.get("text", "") for s in summary
@@ -424,45 +499,37 @@ def _parse_item(
                 )
         if isinstance(text, str) and text:
             return [AgentReasoningDelta(text=text)]
+        return []
 
     if item_type == "command_execution":
-        status = item.get("status")
-        if status == "completed":
-            cmd = item.get("command") or ""
-            if isinstance(cmd, list):
-                cmd = " ".join(cmd)
-            exit_code = item.get("exit_code")
-            if isinstance(exit_code, bool):
-                exit_code = None
-            if not isinstance(exit_code, int):
-                exit_code = None
-            out = item.get("aggregated_output")
+        if g("status") == "completed":
+            exit_code = g("exit_code")
+            out = g("aggregated_output")
             return [ExecCommandEnd(
-                exit_code=exit_code,
+                exit_code=exit_code if type(exit_code) is int else None,
                 aggregated_output=out if isinstance(out, str) else None,
-                raw=raw_outer,
+                raw=debug_raw(raw_outer),
             )]
+        return []
 
     if item_type == "exec_approval_request":
-        cmd = item.get("command")
+        cmd = g("command")
+        argv: Optional[list[str]] = None
         if isinstance(cmd, list):
             argv = [str(c) for c in cmd]
-            try:
-                cmd = shlex.join(argv)
-            except Exception:
-                cmd = " ".join(argv)
+            cmd = _join_argv(argv)
         if not isinstance(cmd, str):
             cmd = ""
-        cwd = item.get("cwd")
-        reason = item.get("reason")
-        call_id = item.get("call_id")
         if cmd:
+            cwd = g("cwd")
+            reason = g("reason")
+            call_id = g("call_id")
             return [ExecApprovalRequest(
                 command=cmd,
                 cwd=cwd if isinstance(cwd, str) else None,
                 reason=reason if isinstance(reason, str) else None,
                 call_id=call_id if isinstance(call_id, str) else None,
-                command_argv=[str(c) for c in item.get("command")] if isinstance(item.get("command"), list) else None,
+                command_argv=argv,
                 outer_id=outer_id,
                 raw=raw_outer,
             )]
@@ -470,16 +537,39 @@ def _parse_item(
     return []
 
 
-def parse_json_line(line: str) -> tuple[Optional[dict[str, Any]], Optional[str]]:
-    try:
-        obj = json.loads(line)
-    except Exception:
-        return None, line
+_JSON_STARTS = frozenset((b"{", b"[", "{", "["))
+
+
+def parse_json_line(line: str | bytes) -> tuple[Optional[dict[str, Any]], Optional[str]]:
+    # Both parsers take bytes directly; only the non-JSON fallback needs a decoded str.
+    # Log noise can't start like JSON, so it skips the (exception-raising) parse attempt.
+    if line[:1] not in _JSON_STARTS and line.lstrip()[:1] not in _JSON_STARTS:
+        obj = None
+    else:
+        try:
+            obj = orjson.loads(line) if orjson is not None else json.loads(line)
+        except Exception:
+            obj = None
     if not isinstance(obj, dict):
+        if isinstance(line, bytes):
+            return None, line.decode("utf-8", "replace")
         return None, line
     return obj, None
 
 
+# Characters shlex.quote leaves unquoted; argv made only of these joins to the same string.
+_SAFE_ARG_CHARS = frozenset(string.ascii_letters + string.digits + "_@%+=:,./-")
+
+
+def _join_argv(argv: list[str]) -> str:
+    if all(a and _SAFE_ARG_CHARS.issuperset(a) for a in argv):
+        return " ".join(argv)
+    try:
+        return shlex.join(argv)
+    except Exception:
+        return " ".join(argv)
+
+
 def _first_str(obj: dict[str, Any], keys: tuple[str, ...]) -> Optional[str]:
     for k in keys:
         v = obj.get(k)
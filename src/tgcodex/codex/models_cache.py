@@ -6,14 +6,19 @@ from typing import Optional
 
 from tgcodex.machines.base import Machine
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class ReasoningLevel:
     effort: str
     description: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ModelEntry:
     slug: str
     display_name: Optional[str]
@@ -21,7 +26,7 @@ class ModelEntry:
     supported_reasoning_levels: tuple[ReasoningLevel, ...]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ModelsCache:
     fetched_at: Optional[int]
     etag: Optional[str]
@@ -32,7 +37,7 @@ class ModelsCache:
 async def read_models_cache(machine: Machine) -> ModelsCache:
     path = await machine.realpath("~/.codex/models_cache.json")
     raw = await machine.read_text(path)
-    obj = json.loads(raw)
+    obj = orjson.loads(raw) if orjson is not None else json.loads(raw)
     if not isinstance(obj, dict):
         raise ValueError("models_cache.json is not an object")
 
@@ -42,10 +47,11 @@ async def read_models_cache(machine: Machine) -> ModelsCache:
         for m in models_raw:
             if not isinstance(m, dict):
                 continue
-            slug = m.get("slug")
+            g = m.get
+            slug = g("slug")
             if not isinstance(slug, str) or not slug:
                 continue
-            levels_raw = m.get("supported_reasoning_levels") or []
+            levels_raw = g("supported_reasoning_levels") or []
             levels: list[ReasoningLevel] = []
             if isinstance(levels_raw, list):
                 for lv in levels_raw:
@@ -61,23 +67,23 @@ async def read_models_cache(machine: Machine) -> ModelsCache:
                             description=desc if isinstance(desc, str) else None,
                         )
                     )
+            display_name = g("display_name")
+            default_level = g("default_reasoning_level")
             models.append(
                 ModelEntry(
                     slug=slug,
-                    display_name=m.get("display_name")
-                    if isinstance(m.get("display_name"), str)
-                    else None,
-                    default_reasoning_level=m.get("default_reasoning_level")
-                    if isinstance(m.get("default_reasoning_level"), str)
-                    else None,
+                    display_name=display_name if isinstance(display_name, str) else None,
+                    default_reasoning_level=default_level if isinstance(default_level, str) else None,
                     supported_reasoning_levels=tuple(levels),
                 )
             )
 
+    fetched_at = obj.get("fetched_at")
+    etag = obj.get("etag")
+    client_version = obj.get("client_version")
     return ModelsCache(
-        fetched_at=obj.get("fetched_at") if isinstance(obj.get("fetched_at"), int) else None,
-        etag=obj.get("etag") if isinstance(obj.get("etag"), str) else None,
-        client_version=obj.get("client_version") if isinstance(obj.get("client_version"), str) else None,
+        fetched_at=fetched_at if isinstance(fetched_at, int) else None,
+        etag=etag if isinstance(etag, str) else None,
+        client_version=client_version if isinstance(client_version, str) else None,
         models=tuple(models),
     )
-
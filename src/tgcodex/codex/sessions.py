@@ -1,27 +1,30 @@
 from __future__ import annotations
 
 import os
+import re
 from pathlib import Path
 from typing import Optional
 
 from tgcodex.codex.adapter import SessionMeta
 from tgcodex.codex.events import TokenCount, parse_event_obj, parse_json_line
 from tgcodex.machines.base import Machine
+from tgcodex.machines.paths import cached_realpath
+
+
+# How much of a session file to read from the end when `tail` isn't available.
+_TAIL_READ_BYTES = 512 * 1024
+
+# Paths per remote `stat` call; keeps the command line well under ARG_MAX.
+_STAT_BATCH = 500
+
+
+# Session files are named like rollout-<timestamp>-<uuid>.jsonl.
+_SESSION_ID_RE = re.compile(r"([0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12})\.jsonl\Z")
 
 
 def _session_id_from_filename(path: str) -> Optional[str]:
-    stem = Path(path).name
-    if not stem.endswith(".jsonl"):
-        return None
-    stem = stem[: -len(".jsonl")]
-    parts = stem.split("-")
-    if len(parts) < 5:
-        return None
-    candidate = "-".join(parts[-5:])
-    # Cheap sanity check: expect 5 groups.
-    if candidate.count("-") != 4:
-        return None
-    return candidate
+    m = _SESSION_ID_RE.search(path, path.rfind("/") + 1)
+    return m.group(1) if m else None
 
 
 def extract_latest_token_count(jsonl_text: str) -> Optional[TokenCount]:
@@ -31,22 +34,34 @@ def extract_latest_token_count(jsonl_text: str) -> Optional[TokenCount]:
     This is used as a fallback for `/status` when the bot didn't persist token/rate-limit info
     during streaming (e.g. after a restart or older versions).
     """
-    latest: Optional[TokenCount] = None
-    for line in jsonl_text.splitlines():
+    # Only the newest event matters, so walk lines from the end (one slice at a time, no line
+    # list) and stop at the first hit. Lines that can't hold a token_count aren't parsed.
+    end = len(jsonl_text)
+    while end > 0:
+        start = jsonl_text.rfind("\n", 0, end) + 1
+        line = jsonl_text[start:end]
+        end = start - 1
+        if "token_count" not in line:
+            continue
         obj, _non_json = parse_json_line(line)
         if obj is None:
             continue
-        for ev in parse_event_obj(obj):
+        for ev in reversed(parse_event_obj(obj)):
             if isinstance(ev, TokenCount):
-                latest = ev
-    return latest
+                return ev
+    return None
 
 
 async def find_session_path(machine: Machine, *, session_id: str) -> Optional[str]:
-    sessions_dir = await machine.realpath("~/.codex/sessions")
+    sessions_dir = await cached_realpath(machine, "~/.codex/sessions")
     # Codex session files typically end with the session id.
-    pattern = os.path.join(sessions_dir, "**", f"*{session_id}.jsonl")
-    paths = await machine.list_glob(pattern)
+    name = f"*{session_id}.jsonl"
+    try:
+        found = await machine.find_files(sessions_dir, name)
+        return found[0][0] if found else None
+    except Exception:
+        pass
+    paths = await machine.list_glob(os.path.join(sessions_dir, "**", name))
     return paths[0] if paths else None
 
 
@@ -63,6 +78,13 @@ async def read_latest_token_count(machine: Machine, *, session_id: str) -> Optio
                 return ev
     except Exception:
         pass
+    # No usable `tail`: read only the end of the file before falling back to all of it.
+    try:
+        ev = extract_latest_token_count(await machine.read_tail(path, _TAIL_READ_BYTES))
+        if ev is not None:
+            return ev
+    except Exception:
+        pass
     try:
         text = await machine.read_text(path)
     except Exception:
@@ -70,28 +92,52 @@ async def read_latest_token_count(machine: Machine, *, session_id: str) -> Optio
     return extract_latest_token_count(text)
 
 
+async def _remote_mtimes(machine: Machine, paths: list[str]) -> dict[str, int]:
+    """mtimes for many remote files with one `stat` per batch instead of one per file."""
+    out: dict[str, int] = {}
+    for i in range(0, len(paths), _STAT_BATCH):
+        try:
+            res = await machine.exec_capture(
+                ["stat", "-c", "%Y\t%n", *paths[i : i + _STAT_BATCH]], cwd=None
+            )
+        except Exception:
+            continue
+        # stat exits non-zero if any single file vanished; the other lines are still valid.
+        for line in res.stdout.splitlines():
+            mtime, sep, path = line.partition("\t")
+            if sep and mtime.isdigit():
+                out[path] = int(mtime)
+    return out
+
+
 async def list_sessions(machine: Machine, *, limit: int = 50) -> list[SessionMeta]:
-    sessions_dir = await machine.realpath("~/.codex/sessions")
-    paths = await machine.list_glob(os.path.join(sessions_dir, "**", "*.jsonl"))
+    sessions_dir = await cached_realpath(machine, "~/.codex/sessions")
     out: list[SessionMeta] = []
-    for p in paths:
-        sid = _session_id_from_filename(p)
-        if not sid:
-            continue
-        updated_at: Optional[int] = None
-        if getattr(machine, "type", None) == "local":
-            try:
-                updated_at = int(Path(p).stat().st_mtime)
-            except Exception:
-                updated_at = None
-        else:
-            try:
-                res = await machine.exec_capture(["stat", "-c", "%Y", p], cwd=None)
-                if res.exit_code == 0:
-                    updated_at = int(res.stdout.strip() or "0") or None
-            except Exception:
-                updated_at = None
-        out.append(SessionMeta(session_id=sid, path=p, updated_at=updated_at))
+    try:
+        # Paths and mtimes in one round-trip.
+        found = await machine.find_files(sessions_dir, "*.jsonl")
+    except Exception:
+        found = None
+    if found is not None:
+        for p, mtime in found:
+            sid = _session_id_from_filename(p)
+            if sid:
+                out.append(SessionMeta(session_id=sid, path=p, updated_at=mtime or None))
+    else:
+        paths = await machine.list_glob(os.path.join(sessions_dir, "**", "*.jsonl"))
+        candidates = [(p, sid) for p in paths if (sid := _session_id_from_filename(p))]
+        is_local = getattr(machine, "type", None) == "local"
+        remote_mtimes = {} if is_local else await _remote_mtimes(machine, [p for p, _ in candidates])
+        for p, sid in candidates:
+            updated_at: Optional[int] = None
+            if is_local:
+                try:
+                    updated_at = int(Path(p).stat().st_mtime)
+                except Exception:
+                    updated_at = None
+            else:
+                updated_at = remote_mtimes.get(p) or None
+            out.append(SessionMeta(session_id=sid, path=p, updated_at=updated_at))
 
     out.sort(key=lambda x: x.updated_at or 0, reverse=True)
     return out[:limit]
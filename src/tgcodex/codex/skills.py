@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import re
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
 from tgcodex.machines.base import Machine
+from tgcodex.machines.paths import cached_realpath
 
 
 @dataclass(frozen=True)
@@ -15,6 +18,21 @@ class SkillMeta:
     description: Optional[str]
 
 
+_SKILL_HEAD_BYTES = 4096
+# Concurrent SKILL.md reads per listing; bounded so SSH machines aren't flooded with channels.
+_SKILL_READ_CONCURRENCY = 16
+_NOT_READ = object()
+
+# A "---" first line, then everything up to the next "---" line (the frontmatter block).
+_FRONTMATTER_RE = re.compile(
+    r"[ \t]*---[ \t]*\r?\n(.*?)^[ \t]*---[ \t]*\r?$", re.DOTALL | re.MULTILINE
+)
+
+# (machine name, SKILL.md path) -> (mtime, description). Skill files rarely change, so repeat
+# listings only re-read files whose mtime moved.
+_SKILL_CACHE: dict[tuple[str, str], tuple[int, Optional[str]]] = {}
+
+
 async def list_skills(machine: Machine, *, limit: int = 200) -> list[SkillMeta]:
     roots = ["~/.codex/skills", "~/.codex/superpowers/skills"]
     # If the bot is configured with a non-default CODEX_HOME, skills may live outside ~/.codex.
@@ -27,31 +45,75 @@ async def list_skills(machine: Machine, *, limit: int = 200) -> list[SkillMeta]:
                 os.path.join(codex_home, "superpowers", "skills"),
             ] + roots
 
-    paths: list[str] = []
+    paths: list[tuple[str, Optional[int]]] = []
     for r in roots:
         try:
-            base = await machine.realpath(r)
-            paths.extend(await machine.list_glob(os.path.join(base, "**", "SKILL.md")))
+            base = await cached_realpath(machine, r)
         except Exception:
             continue
+        try:
+            paths.extend(await machine.find_files(base, "SKILL.md"))
+        except Exception:
+            try:
+                paths.extend((p, None) for p in await machine.list_glob(os.path.join(base, "**", "SKILL.md")))
+            except Exception:
+                continue
 
+    machine_name = getattr(machine, "name", "")
     # De-dupe by full path (glob patterns can overlap on some systems).
-    seen_paths: set[str] = set()
-    out_by_name: dict[str, SkillMeta] = {}
-    for p in paths:
-        if p in seen_paths:
+    unique: dict[str, Optional[int]] = {}
+    for p, mtime in paths:
+        unique.setdefault(p, mtime)
+
+    # Read the first candidate for each skill name concurrently; over SSH every read is a
+    # round-trip, so doing them one by one dominates the listing time.
+    to_read: list[str] = []
+    names: set[str] = set()
+    for p, mtime in unique.items():
+        name = Path(p).parent.name
+        if name in names:
             continue
-        seen_paths.add(p)
+        names.add(name)
+        if len(names) > limit:
+            break
+        cached = _SKILL_CACHE.get((machine_name, p)) if mtime is not None else None
+        if cached is None or cached[0] != mtime:
+            to_read.append(p)
+    sem = asyncio.Semaphore(_SKILL_READ_CONCURRENCY)
 
-        try:
-            txt = await machine.read_text(p)
-        except Exception:
-            continue
+    async def _read(path: str) -> Optional[str]:
+        async with sem:
+            return await _read_skill_description(machine, path)
+
+    results = await asyncio.gather(*(_read(p) for p in to_read), return_exceptions=True)
+    prefetched = dict(zip(to_read, results))
 
+    out_by_name: dict[str, SkillMeta] = {}
+    for p, mtime in unique.items():
         name = Path(p).parent.name
-        desc = _skill_description(txt)
         # Prefer the first match if duplicates exist; it tends to be the "real" skill.
-        out_by_name.setdefault(name, SkillMeta(name=name, path=p, description=desc))
+        if name in out_by_name:
+            continue
+        key = (machine_name, p)
+        cached = _SKILL_CACHE.get(key) if mtime is not None else None
+        if cached is not None and cached[0] == mtime:
+            desc = cached[1]
+        else:
+            res = prefetched.get(p, _NOT_READ)
+            if res is _NOT_READ:
+                # Not prefetched: the same-named path picked earlier failed to read, so fall
+                # back to this one.
+                try:
+                    res = await _read_skill_description(machine, p)
+                except Exception:
+                    continue
+            elif isinstance(res, BaseException):
+                continue
+            desc = res
+            if mtime is not None:
+                _SKILL_CACHE[key] = (mtime, desc)
+
+        out_by_name[name] = SkillMeta(name=name, path=p, description=desc)
 
         if len(out_by_name) >= limit:
             break
@@ -61,6 +123,25 @@ async def list_skills(machine: Machine, *, limit: int = 200) -> list[SkillMeta]:
     return out
 
 
+async def _read_skill_description(machine: Machine, path: str) -> Optional[str]:
+    # The description lives in the frontmatter or first paragraph, so the head of the file is
+    # normally enough; read everything only when the head doesn't settle it.
+    try:
+        head = await machine.read_head(path, _SKILL_HEAD_BYTES)
+    except Exception:
+        return _skill_description(await machine.read_text(path))
+    if len(head.encode("utf-8")) < _SKILL_HEAD_BYTES:
+        return _skill_description(head)
+    # Truncated: drop the partial last line so nothing is cut mid-sentence.
+    head = head[: head.rfind("\n") + 1]
+    unclosed_fm = head.split("\n", 1)[0].strip() == "---" and _frontmatter(head) is None
+    if not unclosed_fm:
+        desc = _skill_description(head)
+        if desc is not None:
+            return desc
+    return _skill_description(await machine.read_text(path))
+
+
 def _skill_description(md: str) -> Optional[str]:
     # Best-effort: try YAML frontmatter first.
     fm = _frontmatter(md)
@@ -75,36 +156,27 @@ def _frontmatter(md: str) -> Optional[dict[str, str]]:
 
     We avoid adding a YAML dependency; most skills only need `description: ...`.
     """
-    lines = md.splitlines()
-    if not lines:
-        return None
-    if lines[0].strip() != "---":
+    m = _FRONTMATTER_RE.match(md)
+    if m is None:
         return None
     out: dict[str, str] = {}
-    # Scan until closing '---'
-    for line in lines[1:]:
-        if line.strip() == "---":
-            return out
-        if ":" not in line:
+    # Only the frontmatter block is split into lines, not the whole document.
+    for line in m.group(1).splitlines():
+        k, sep, v = line.partition(":")
+        if not sep:
             continue
-        k, v = line.split(":", 1)
         k = k.strip()
         v = v.strip().strip('"').strip("'")
         if k and v:
             out[k] = v
-    return None
+    return out
 
 
 def _first_paragraph(md: str) -> Optional[str]:
     # Skip YAML frontmatter if present.
-    lines = md.splitlines()
-    i = 0
-    if lines and lines[0].strip() == "---":
-        for j in range(1, len(lines)):
-            if lines[j].strip() == "---":
-                i = j + 1
-                break
-    for line in lines[i:]:
+    m = _FRONTMATTER_RE.match(md)
+    body = md[m.end() :] if m is not None else md
+    for line in body.splitlines():
         line = line.strip()
         if not line:
             continue
@@ -3,7 +3,7 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Literal, Mapping, Optional
+from typing import Any, Callable, Literal, Mapping, Optional
 
 from tgcodex.constants import DEFAULT_DB_PATH
 
@@ -80,6 +80,24 @@ def _as_bool(value: Any, *, where: str) -> bool:
     raise ConfigError(f"Expected bool at {where}, got {type(value).__name__}")
 
 
+def _as_str_tuple(value: Any, *, where: str) -> tuple[str, ...]:
+    return tuple(_as_str(x, where=f"{where}[]") for x in _as_list(value, where=where))
+
+
+def _as_int_tuple(value: Any, *, where: str) -> tuple[int, ...]:
+    return tuple(_as_int(x, where=f"{where}[]") for x in _as_list(value, where=where))
+
+
+# (key, converter, default) rows; a default of None makes the converter reject a missing key
+# unless it accepts None itself.
+_Schema = tuple[tuple[str, Callable[..., Any], Any], ...]
+
+
+def _from_schema(d: Mapping[str, Any], schema: _Schema, *, prefix: str) -> dict[str, Any]:
+    get = d.get
+    return {key: conv(get(key, default), where=prefix + key) for key, conv, default in schema}
+
+
 @dataclass(frozen=True)
 class TelegramConfig:
     token_env: str
@@ -87,10 +105,13 @@ class TelegramConfig:
 
     @staticmethod
     def from_dict(d: Mapping[str, Any]) -> "TelegramConfig":
-        token_env = _as_str(d.get("token_env"), where="telegram.token_env")
-        user_ids_raw = _as_list(d.get("allowed_user_ids"), where="telegram.allowed_user_ids")
-        allowed_user_ids = tuple(_as_int(x, where="telegram.allowed_user_ids[]") for x in user_ids_raw)
-        return TelegramConfig(token_env=token_env, allowed_user_ids=allowed_user_ids)
+        return TelegramConfig(**_from_schema(d, _TELEGRAM_SCHEMA, prefix="telegram."))
+
+
+_TELEGRAM_SCHEMA: _Schema = (
+    ("token_env", _as_str, None),
+    ("allowed_user_ids", _as_int_tuple, None),
+)
 
 
 @dataclass(frozen=True)
@@ -99,8 +120,10 @@ class StateConfig:
 
     @staticmethod
     def from_dict(d: Mapping[str, Any]) -> "StateConfig":
-        db_path = _as_str(d.get("db_path", DEFAULT_DB_PATH), where="state.db_path")
-        return StateConfig(db_path=db_path)
+        return StateConfig(**_from_schema(d, _STATE_SCHEMA, prefix="state."))
+
+
+_STATE_SCHEMA: _Schema = (("db_path", _as_str, DEFAULT_DB_PATH),)
 
 
 @dataclass(frozen=True)
@@ -114,33 +137,22 @@ class CodexConfig:
 
     @staticmethod
     def from_dict(d: Mapping[str, Any]) -> "CodexConfig":
-        bin_ = _as_str(d.get("bin", "codex"), where="codex.bin")
-        args_raw = _as_list(d.get("args"), where="codex.args")
-        args = tuple(_as_str(x, where="codex.args[]") for x in args_raw)
-        model = _as_opt_str(d.get("model"), where="codex.model")
-        sandbox = d.get("sandbox")
-        if sandbox is None:
-            sandbox_mode: Optional[SandboxMode] = None
-        else:
-            sandbox_mode = _as_str(sandbox, where="codex.sandbox")  # type: ignore[assignment]
-        approval_policy = _as_str(
-            d.get("approval_policy", "on-request"), where="codex.approval_policy"
-        )
-        if approval_policy not in ("untrusted", "on-request", "on-failure", "never"):
+        fields = _from_schema(d, _CODEX_SCHEMA, prefix="codex.")
+        if fields["approval_policy"] not in ("untrusted", "on-request", "on-failure", "never"):
             raise ConfigError(
                 "codex.approval_policy must be one of: untrusted|on-request|on-failure|never"
             )
-        skip_git_repo_check = _as_bool(
-            d.get("skip_git_repo_check", False), where="codex.skip_git_repo_check"
-        )
-        return CodexConfig(
-            bin=bin_,
-            args=args,
-            model=model,
-            sandbox=sandbox_mode,
-            approval_policy=approval_policy,  # type: ignore[arg-type]
-            skip_git_repo_check=skip_git_repo_check,
-        )
+        return CodexConfig(**fields)
+
+
+_CODEX_SCHEMA: _Schema = (
+    ("bin", _as_str, "codex"),
+    ("args", _as_str_tuple, None),
+    ("model", _as_opt_str, None),
+    ("sandbox", _as_opt_str, None),
+    ("approval_policy", _as_str, "on-request"),
+    ("skip_git_repo_check", _as_bool, False),
+)
 
 
 @dataclass(frozen=True)
@@ -157,34 +169,20 @@ class OutputConfig:
 
     @staticmethod
     def from_dict(d: Mapping[str, Any]) -> "OutputConfig":
-        return OutputConfig(
-            flush_interval_ms=_as_int(
-                d.get("flush_interval_ms", 250), where="output.flush_interval_ms"
-            ),
-            min_flush_chars=_as_int(
-                d.get("min_flush_chars", 120), where="output.min_flush_chars"
-            ),
-            max_flush_delay_seconds=_as_float(
-                d.get("max_flush_delay_seconds", 2.0),
-                where="output.max_flush_delay_seconds",
-            ),
-            max_chars=_as_int(d.get("max_chars", 3500), where="output.max_chars"),
-            truncate=_as_bool(d.get("truncate", True), where="output.truncate"),
-            typing_interval_seconds=_as_float(
-                d.get("typing_interval_seconds", 4.0),
-                where="output.typing_interval_seconds",
-            ),
-            show_codex_logs=_as_bool(
-                d.get("show_codex_logs", False), where="output.show_codex_logs"
-            ),
-            show_tool_output=_as_bool(
-                d.get("show_tool_output", False), where="output.show_tool_output"
-            ),
-            max_tool_output_chars=_as_int(
-                d.get("max_tool_output_chars", 1200),
-                where="output.max_tool_output_chars",
-            ),
-        )
+        return OutputConfig(**_from_schema(d, _OUTPUT_SCHEMA, prefix="output."))
+
+
+_OUTPUT_SCHEMA: _Schema = (
+    ("flush_interval_ms", _as_int, 250),
+    ("min_flush_chars", _as_int, 120),
+    ("max_flush_delay_seconds", _as_float, 2.0),
+    ("max_chars", _as_int, 3500),
+    ("truncate", _as_bool, True),
+    ("typing_interval_seconds", _as_float, 4.0),
+    ("show_codex_logs", _as_bool, False),
+    ("show_tool_output", _as_bool, False),
+    ("max_tool_output_chars", _as_int, 1200),
+)
 
 
 @dataclass(frozen=True)
@@ -193,8 +191,10 @@ class ApprovalsConfig:
 
     @staticmethod
     def from_dict(d: Mapping[str, Any]) -> "ApprovalsConfig":
-        prefix_tokens = _as_int(d.get("prefix_tokens", 2), where="approvals.prefix_tokens")
-        return ApprovalsConfig(prefix_tokens=prefix_tokens)
+        return ApprovalsConfig(**_from_schema(d, _APPROVALS_SCHEMA, prefix="approvals."))
+
+
+_APPROVALS_SCHEMA: _Schema = (("prefix_tokens", _as_int, 2),)
 
 
 @dataclass(frozen=True)
@@ -205,6 +205,13 @@ class LocalMachineDef:
     codex_bin: Optional[str] = None
 
 
+_LOCAL_MACHINE_SCHEMA: _Schema = (
+    ("default_workdir", _as_str, None),
+    ("allowed_roots", _as_str_tuple, None),
+    ("codex_bin", _as_opt_str, None),
+)
+
+
 @dataclass(frozen=True)
 class SSHAuthDef:
     use_agent: bool
@@ -212,10 +219,13 @@ class SSHAuthDef:
 
     @staticmethod
     def from_dict(d: Mapping[str, Any]) -> "SSHAuthDef":
-        return SSHAuthDef(
-            use_agent=_as_bool(d.get("use_agent", True), where="machines.*.auth.use_agent"),
-            key_path=_as_opt_str(d.get("key_path"), where="machines.*.auth.key_path"),
-        )
+        return SSHAuthDef(**_from_schema(d, _SSH_AUTH_SCHEMA, prefix="machines.*.auth."))
+
+
+_SSH_AUTH_SCHEMA: _Schema = (
+    ("use_agent", _as_bool, True),
+    ("key_path", _as_opt_str, None),
+)
 
 
 @dataclass(frozen=True)
@@ -232,6 +242,17 @@ class SSHMachineDef:
     codex_bin: Optional[str] = None
 
 
+_SSH_MACHINE_SCHEMA: _Schema = (
+    ("host", _as_str, None),
+    ("user", _as_str, None),
+    ("port", _as_int, 22),
+    ("default_workdir", _as_str, None),
+    ("allowed_roots", _as_str_tuple, None),
+    ("known_hosts", _as_str, "~/.ssh/known_hosts"),
+    ("connect_timeout_seconds", _as_float, 10.0),
+    ("codex_bin", _as_opt_str, None),
+)
+
 MachineDef = LocalMachineDef | SSHMachineDef
 
 
@@ -249,43 +270,16 @@ class MachinesConfig:
             if not isinstance(name, str):
                 raise ConfigError("machines.defs keys must be strings")
             md = _as_dict(md_raw, where=f"machines.defs.{name}")
-            mtype = _as_str(md.get("type"), where=f"machines.defs.{name}.type")
+            prefix = f"machines.defs.{name}."
+            mtype = _as_str(md.get("type"), where=prefix + "type")
             if mtype == "local":
                 defs[name] = LocalMachineDef(
-                    type="local",
-                    default_workdir=_as_str(
-                        md.get("default_workdir"), where=f"machines.defs.{name}.default_workdir"
-                    ),
-                    allowed_roots=tuple(
-                        _as_str(x, where=f"machines.defs.{name}.allowed_roots[]")
-                        for x in _as_list(md.get("allowed_roots"), where=f"machines.defs.{name}.allowed_roots")
-                    ),
-                    codex_bin=_as_opt_str(md.get("codex_bin"), where=f"machines.defs.{name}.codex_bin"),
+                    type="local", **_from_schema(md, _LOCAL_MACHINE_SCHEMA, prefix=prefix)
                 )
             elif mtype == "ssh":
-                auth = SSHAuthDef.from_dict(
-                    _as_dict(md.get("auth"), where=f"machines.defs.{name}.auth")
-                )
-                defs[name] = SSHMachineDef(
-                    type="ssh",
-                    host=_as_str(md.get("host"), where=f"machines.defs.{name}.host"),
-                    user=_as_str(md.get("user"), where=f"machines.defs.{name}.user"),
-                    port=_as_int(md.get("port", 22), where=f"machines.defs.{name}.port"),
-                    default_workdir=_as_str(
-                        md.get("default_workdir"), where=f"machines.defs.{name}.default_workdir"
-                    ),
-                    allowed_roots=tuple(
-                        _as_str(x, where=f"machines.defs.{name}.allowed_roots[]")
-                        for x in _as_list(md.get("allowed_roots"), where=f"machines.defs.{name}.allowed_roots")
-                    ),
-                    auth=auth,
-                    known_hosts=_as_str(md.get("known_hosts", "~/.ssh/known_hosts"), where=f"machines.defs.{name}.known_hosts"),
-                    connect_timeout_seconds=_as_float(
-                        md.get("connect_timeout_seconds", 10.0),
-                        where=f"machines.defs.{name}.connect_timeout_seconds",
-                    ),
-                    codex_bin=_as_opt_str(md.get("codex_bin"), where=f"machines.defs.{name}.codex_bin"),
-                )
+                fields = _from_schema(md, _SSH_MACHINE_SCHEMA, prefix=prefix)
+                fields["auth"] = SSHAuthDef.from_dict(_as_dict(md.get("auth"), where=prefix + "auth"))
+                defs[name] = SSHMachineDef(type="ssh", **fields)
             else:
                 raise ConfigError(
                     f"machines.defs.{name}.type must be one of: local|ssh"
@@ -303,9 +297,32 @@ class Config:
     machines: MachinesConfig
 
 
+# (path, mtime_ns, size) -> parsed Config; the file rarely changes between loads.
+_CONFIG_CACHE: dict[tuple[str, int, int], Config] = {}
+
+
 def load_config(path: Path) -> Config:
+    try:
+        st = path.stat()
+    except OSError:
+        key = None
+    else:
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        cached = _CONFIG_CACHE.get(key)
+        if cached is not None:
+            return cached
+    cfg = _load_config_uncached(path)
+    if key is not None:
+        _CONFIG_CACHE.clear()  # only the latest version of a file is worth keeping
+        _CONFIG_CACHE[key] = cfg
+    return cfg
+
+
+def _load_config_uncached(path: Path) -> Config:
     yaml = _require_yaml()
-    raw = yaml.safe_load(path.read_text(encoding="utf-8"))
+    # libyaml's C loader is much faster when PyYAML was built with it; it decodes bytes itself.
+    loader = getattr(yaml, "CSafeLoader", None) or yaml.SafeLoader
+    raw = yaml.load(path.read_bytes(), Loader=loader)
     if raw is None:
         raise ConfigError("Config file is empty")
     if not isinstance(raw, dict):
@@ -368,19 +385,21 @@ def validate_config(cfg: Config, *, validate_binaries: bool) -> list[str]:
                     f"machines.defs.{name}.default_workdir cannot be resolved: {exc}"
                 )
                 continue
-            root_reals = []
+            default_str = str(default_real)
+            root_strs: list[str] = []
             for r in md.allowed_roots:
                 try:
-                    root_reals.append(Path(r).expanduser().resolve())
+                    root_strs.append(str(Path(r).expanduser().resolve()))
                 except Exception as exc:
                     errors.append(
                         f"machines.defs.{name}.allowed_roots entry cannot be resolved: {r!r} ({exc})"
                     )
-            if root_reals:
-                ok = any(
-                    str(default_real) == str(rr) or str(default_real).startswith(str(rr) + os.sep)
-                    for rr in root_reals
-                )
+            if root_strs:
+                if default_str in root_strs:
+                    ok = True
+                else:
+                    # Separator appended once per root; rstrip keeps "/" from becoming "//".
+                    ok = default_str.startswith(tuple(rs.rstrip(os.sep) + os.sep for rs in root_strs))
                 if not ok:
                     errors.append(
                         f"machines.defs.{name}.default_workdir must be within allowed_roots"
@@ -9,6 +9,11 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Mapping, Optional, Sequence
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
 RUNTIME_DIRNAME = ".tgcodex-bot"
 
 
@@ -38,19 +43,38 @@ def log_file_for_config(config_path: Path) -> Path:
     return runtime_dir_for_config(config_path) / f"{Path(config_path).name}.log"
 
 
+def _read_small_file(path: str | Path) -> Optional[bytes]:
+    # Raw fd reads: pid and /proc files are tiny and usually fit in one read, so
+    # this skips the buffered-file and text-decoding machinery.
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except Exception:
+        return None
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    except Exception:
+        return None
+    finally:
+        os.close(fd)
+    return b"".join(chunks)
+
+
 def _read_proc_cmdline(pid: int) -> Optional[tuple[str, ...]]:
     """
     Best-effort process argv from /proc/<pid>/cmdline (Linux).
     """
 
-    try:
-        raw = Path(f"/proc/{pid}/cmdline").read_bytes()
-    except Exception:
-        return None
+    raw = _read_small_file(f"/proc/{pid}/cmdline")
     if not raw:
         return None
-    parts = [p.decode("utf-8", errors="replace") for p in raw.split(b"\x00") if p]
-    return tuple(parts) if parts else None
+    # argv entries are NUL-terminated; empty pieces only come from that trailing NUL.
+    parts = tuple(p.decode("utf-8", errors="replace") for p in raw.split(b"\x00") if p)
+    return parts or None
 
 
 def _read_proc_start_time(pid: int) -> Optional[str]:
@@ -58,11 +82,11 @@ def _read_proc_start_time(pid: int) -> Optional[str]:
     Best-effort process start-time tick from /proc/<pid>/stat (Linux).
     """
 
-    try:
-        raw = Path(f"/proc/{pid}/stat").read_text(encoding="utf-8")
-    except Exception:
+    data = _read_small_file(f"/proc/{pid}/stat")
+    if data is None:
         return None
     try:
+        raw = data.decode("utf-8", errors="replace")
         # stat format starts with: "<pid> (<comm>) <state> ... <starttime> ..."
         _, rest = raw.rsplit(") ", 1)
         fields = rest.split()
@@ -80,11 +104,8 @@ def _looks_like_tgcodex_process(cmdline: tuple[str, ...]) -> bool:
 
 
 def read_pid_record(pid_file: Path) -> Optional[PidRecord]:
-    try:
-        raw = pid_file.read_text(encoding="utf-8").strip()
-    except FileNotFoundError:
-        return None
-    except Exception:
+    raw = _read_small_file(pid_file)
+    if raw is None:
         return None
 
     # Backward compatible with old "<pid>\n" format.
@@ -99,7 +120,7 @@ def read_pid_record(pid_file: Path) -> Optional[PidRecord]:
 
     # New JSON format.
     try:
-        obj = json.loads(raw)
+        obj = orjson.loads(raw) if orjson is not None else json.loads(raw)
     except Exception:
         return None
     if not isinstance(obj, dict):
@@ -172,10 +193,10 @@ def _is_expected_process(record: PidRecord) -> bool:
     if record.start_time is not None:
         current_start = _read_proc_start_time(record.pid)
         if current_start is not None:
-            inspected = True
             if current_start != record.start_time:
                 return False
-            strong_match = True
+            # (pid, start time) is unique within a boot; no need to read cmdline too.
+            return True
 
     if record.argv:
         current_cmd = _read_proc_cmdline(record.pid)
@@ -201,6 +222,20 @@ def _is_expected_process(record: PidRecord) -> bool:
     return strong_match
 
 
+def _wait_for_exit(pid: int, *, deadline: float, max_delay: float) -> bool:
+    # Exponential backoff: a prompt exit is noticed within milliseconds, while a
+    # slow shutdown still costs only one probe per `max_delay`.
+    delay = 0.001
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        if not is_pid_running(pid):
+            return True
+        delay = min(delay * 2, max_delay)
+
+
 def pid_file_matches_running_process(pid_file: Path) -> bool:
     record = read_pid_record(pid_file)
     if record is None:
@@ -297,14 +332,12 @@ def stop(pid_file: Path, *, timeout_seconds: float = 10.0) -> bool:
         return True
 
     deadline = time.monotonic() + max(0.0, float(timeout_seconds))
-    while time.monotonic() < deadline:
-        time.sleep(0.1)
-        if not is_pid_running(pid):
-            try:
-                pid_file.unlink()
-            except Exception:
-                pass
-            return True
+    if _wait_for_exit(pid, deadline=deadline, max_delay=0.1):
+        try:
+            pid_file.unlink()
+        except Exception:
+            pass
+        return True
 
     # Graceful SIGTERM timed out; force kill as a last resort.
     sigkill = getattr(signal, "SIGKILL", None)
@@ -323,14 +356,11 @@ def stop(pid_file: Path, *, timeout_seconds: float = 10.0) -> bool:
             pass
         return True
 
-    kill_deadline = time.monotonic() + 2.0
-    while time.monotonic() < kill_deadline:
-        time.sleep(0.05)
-        if not is_pid_running(pid):
-            try:
-                pid_file.unlink()
-            except Exception:
-                pass
-            return True
+    if _wait_for_exit(pid, deadline=time.monotonic() + 2.0, max_delay=0.05):
+        try:
+            pid_file.unlink()
+        except Exception:
+            pass
+        return True
 
     return False
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import os
 from dataclasses import dataclass
 from typing import (
     AsyncIterator,
@@ -11,6 +13,81 @@ from typing import (
 )
 
 
+
+def _pump_chunk_size() -> int:
+    try:
+        n = int(os.getenv("TGCODEX_PUMP_CHUNK", ""))
+    except ValueError:
+        return 65536
+    return n if n > 0 else 65536
+
+
+# Max bytes per stdout/stderr read in Machine.run. Large reads mean far fewer event-loop
+# wakeups on chatty `--json` output; override with TGCODEX_PUMP_CHUNK to favour latency.
+PUMP_CHUNK_SIZE = _pump_chunk_size()
+_PUMP_QUEUE_MAXSIZE = 32
+
+
+async def pump_stream(
+    read: Callable[[int], Awaitable[bytes]],
+    cb: Callable[[bytes], Awaitable[None]],
+) -> None:
+    """
+    Copy a subprocess stream into `cb` until EOF.
+
+    Reads go into a bounded queue drained by a single consumer, which joins whatever has
+    piled up into one callback call. A slow callback batches the output; it doesn't get
+    one call per read. The full queue applies backpressure to the reader.
+    """
+
+    q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=_PUMP_QUEUE_MAXSIZE)
+    producer = asyncio.current_task()
+
+    async def consume() -> None:
+        try:
+            while True:
+                chunk = await q.get()
+                if not chunk:
+                    return
+                parts = [chunk]
+                eof = False
+                while not q.empty():
+                    more = q.get_nowait()
+                    if not more:
+                        eof = True
+                        break
+                    parts.append(more)
+                await cb(parts[0] if len(parts) == 1 else b"".join(parts))
+                if eof:
+                    return
+        except BaseException:
+            # Don't leave the reader blocked on a queue nobody drains.
+            if producer is not None:
+                producer.cancel()
+            raise
+
+    consumer = asyncio.create_task(consume())
+    try:
+        # StreamReader.read() returns at once while bytes are buffered, and put() only
+        # suspends on a full queue, so one wakeup drains everything already received.
+        while True:
+            chunk = await read(PUMP_CHUNK_SIZE)
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8", "replace")
+            await q.put(chunk)  # b"" doubles as the EOF marker
+            if not chunk:
+                break
+    except asyncio.CancelledError:
+        if consumer.done() and not consumer.cancelled() and consumer.exception() is not None:
+            raise consumer.exception()  # type: ignore[misc]
+        consumer.cancel()
+        raise
+    except BaseException:
+        consumer.cancel()
+        raise
+    await consumer
+
+
 @dataclass(frozen=True)
 class ExecResult:
     exit_code: int
@@ -43,15 +120,32 @@ class Machine(Protocol):
         stdout_cb: Callable[[bytes], Awaitable[None]],
         stderr_cb: Callable[[bytes], Awaitable[None]],
         stdin_provider: Optional[AsyncIterator[bytes]],
-    ) -> RunHandle: ...
+    ) -> RunHandle:
+        """Start `argv`; `env` holds variables added on top of the machine's own environment."""
+        ...
 
     async def exec_capture(self, argv: list[str], cwd: Optional[str]) -> ExecResult: ...
 
     async def read_text(self, path: str) -> str: ...
 
+    async def read_head(self, path: str, nbytes: int) -> str:
+        """First `nbytes` of a text file (may end mid-line)."""
+        ...
+
+    async def read_tail(self, path: str, nbytes: int) -> str:
+        """Last `nbytes` of a text file, starting at a line boundary unless it's the whole file."""
+        ...
+
     async def write_text(self, path: str, content: str, overwrite: bool) -> None: ...
 
     async def list_glob(self, pattern: str) -> list[str]: ...
 
+    async def find_files(self, root: str, name_pattern: str) -> list[tuple[str, Optional[int]]]:
+        """
+        Sorted (path, mtime) for files under `root` whose basename matches `name_pattern`
+        (fnmatch syntax), in a single round-trip. Raises if the machine can't do it that way.
+        """
+        ...
+
     async def realpath(self, path: str) -> str: ...
 
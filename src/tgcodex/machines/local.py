@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import asyncio
+import fnmatch
 import glob
 import os
+import re
 import signal
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import AsyncIterator, Awaitable, Callable, Optional
 
-from tgcodex.machines.base import ExecResult, RunHandle
+from tgcodex.machines.base import PUMP_CHUNK_SIZE, ExecResult, RunHandle, pump_stream
 
 
 @dataclass
@@ -17,15 +19,20 @@ class _LocalRunHandle:
     stdout_task: asyncio.Task[None]
     stderr_task: asyncio.Task[None]
     stdin_task: Optional[asyncio.Task[None]]
+    # Decided once per handle: the group leader's pid when group signals are possible (the
+    # process was started in its own session on POSIX), else None.
+    _group_pid: Optional[int] = field(init=False, default=None)
 
-    def _kill_group(self, sig: int) -> None:
+    def __post_init__(self) -> None:
+        pid = getattr(self.proc, "pid", None)
+        if os.name == "posix" and isinstance(pid, int) and pid > 0:
+            self._group_pid = pid
+
+    def _kill_group(self, pid: int, sig: int) -> None:
         """
         Best-effort: terminate/kill the entire process group so tool children don't
         keep running after the Codex CLI parent is stopped.
         """
-        pid = getattr(self.proc, "pid", None)
-        if not isinstance(pid, int) or pid <= 0:
-            return
         try:
             os.killpg(pid, sig)
         except ProcessLookupError:
@@ -38,9 +45,17 @@ class _LocalRunHandle:
                 pass
 
     async def wait(self) -> int:
-        rc = await self.proc.wait()
-        await self.stdout_task
-        await self.stderr_task
+        # Exit and both output pumps are awaited together; a pump error is raised afterwards.
+        proc_wait = asyncio.ensure_future(self.proc.wait())
+        try:
+            await asyncio.wait((proc_wait, self.stdout_task, self.stderr_task))
+        finally:
+            # If wait() itself is cancelled, don't leave the proc.wait() task behind.
+            if not proc_wait.done():
+                proc_wait.cancel()
+        rc = proc_wait.result()
+        self.stdout_task.result()
+        self.stderr_task.result()
         if self.stdin_task is not None:
             self.stdin_task.cancel()
             try:
@@ -53,16 +68,16 @@ class _LocalRunHandle:
         if self.proc.returncode is not None:
             return
         # Prefer process-group termination so spawned commands don't keep running.
-        if os.name == "posix":
-            self._kill_group(signal.SIGTERM)
+        if self._group_pid is not None:
+            self._kill_group(self._group_pid, signal.SIGTERM)
         else:
             self.proc.terminate()
 
     async def kill(self) -> None:
         if self.proc.returncode is not None:
             return
-        if os.name == "posix":
-            self._kill_group(signal.SIGKILL)
+        if self._group_pid is not None:
+            self._kill_group(self._group_pid, signal.SIGKILL)
         else:
             self.proc.kill()
 
@@ -103,24 +118,22 @@ class LocalMachine:
         proc = await asyncio.create_subprocess_exec(
             *argv,
             cwd=cwd,
-            env=env,
+            # `env` is an overlay, as on SSH machines. Without one the child simply inherits our
+            # environment at exec time, with no Python-side copy of os.environ.
+            env={**os.environ, **env} if env else None,
             stdin=asyncio.subprocess.PIPE,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             # Ensure the Codex CLI is a process-group leader so we can terminate the
             # entire group (including any spawned tool commands) on cancel.
             start_new_session=(os.name == "posix"),
+            # The pipe readers buffer up to 2 * limit before pausing; keep that at least one
+            # read's worth so a single wakeup can hand over a full chunk.
+            limit=max(PUMP_CHUNK_SIZE, 2**16),
         )
 
-        async def pump(stream: asyncio.StreamReader, cb: Callable[[bytes], Awaitable[None]]) -> None:
-            while True:
-                chunk = await stream.read(4096)
-                if not chunk:
-                    return
-                await cb(chunk)
-
-        stdout_task = asyncio.create_task(pump(proc.stdout, stdout_cb))  # type: ignore[arg-type]
-        stderr_task = asyncio.create_task(pump(proc.stderr, stderr_cb))  # type: ignore[arg-type]
+        stdout_task = asyncio.create_task(pump_stream(proc.stdout.read, stdout_cb))  # type: ignore[union-attr]
+        stderr_task = asyncio.create_task(pump_stream(proc.stderr.read, stderr_cb))  # type: ignore[union-attr]
 
         stdin_task: Optional[asyncio.Task[None]] = None
         if stdin_provider is not None:
@@ -154,18 +167,121 @@ class LocalMachine:
             stderr=(err_b or b"").decode("utf-8", "replace"),
         )
 
+    # Unbounded file and tree I/O runs in a worker thread so a big file or directory tree
+    # doesn't stall streaming runs and Telegram polling on the event loop. The bounded
+    # head/tail reads stay inline.
+
     async def read_text(self, path: str) -> str:
-        return Path(path).read_text(encoding="utf-8")
+        return await asyncio.to_thread(Path(path).read_text, encoding="utf-8")
+
+    async def read_head(self, path: str, nbytes: int) -> str:
+        with open(path, "rb") as f:
+            return f.read(nbytes).decode("utf-8", "replace")
+
+    async def read_tail(self, path: str, nbytes: int) -> str:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            offset = max(0, size - nbytes)
+            data = os.pread(fd, size - offset, offset)
+        finally:
+            os.close(fd)
+        if offset > 0:
+            # Drop the partial first line.
+            data = data[data.find(b"\n") + 1 :]
+        return data.decode("utf-8", "replace")
 
     async def write_text(self, path: str, content: str, overwrite: bool) -> None:
-        p = Path(path)
-        if p.exists() and not overwrite:
-            raise FileExistsError(path)
-        p.parent.mkdir(parents=True, exist_ok=True)
-        p.write_text(content, encoding="utf-8")
+        await asyncio.to_thread(_write_text, path, content, overwrite)
 
     async def list_glob(self, pattern: str) -> list[str]:
-        return sorted(glob.glob(pattern, recursive=True))
+        return await asyncio.to_thread(_list_glob, pattern)
+
+    async def find_files(self, root: str, name_pattern: str) -> list[tuple[str, Optional[int]]]:
+        return await asyncio.to_thread(_find_files, root, name_pattern)
 
     async def realpath(self, path: str) -> str:
         return str(Path(path).expanduser().resolve())
+
+
+def _write_text(path: str, content: str, overwrite: bool) -> None:
+    p = Path(path)
+    if p.exists() and not overwrite:
+        raise FileExistsError(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(content, encoding="utf-8")
+
+
+_GLOB_MAGIC = re.compile(r"[*?[]")
+_RECURSIVE_SEP = f"{os.sep}**{os.sep}"
+
+
+def _list_glob(pattern: str) -> list[str]:
+    # The patterns we issue look like "<dir>/**/<name>". glob handles those with a listdir
+    # plus a stat per entry; a scandir walk gets the same answer from the directory entries.
+    head, sep, tail = pattern.partition(_RECURSIVE_SEP)
+    if sep and head and not _GLOB_MAGIC.search(head) and os.sep not in tail and tail != "**":
+        return _glob_tree(head, tail)
+    return sorted(glob.glob(pattern, recursive=True))
+
+
+def _glob_tree(root: str, name_pattern: str) -> list[str]:
+    """glob.glob(f"{root}/**/{name_pattern}", recursive=True), sorted, via os.scandir."""
+
+    match = re.compile(fnmatch.translate(name_pattern)).match
+    # Like glob: "**" never descends into hidden directories, and wildcards only match
+    # hidden names when the pattern itself starts with ".".
+    show_hidden = name_pattern.startswith(".")
+    out: list[str] = []
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                if name.startswith("."):
+                    if show_hidden and match(name) is not None:
+                        out.append(entry.path)
+                    continue
+                if match(name) is not None:
+                    out.append(entry.path)
+                try:
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                except OSError:
+                    pass
+    out.sort()
+    return out
+
+
+def _find_files(root: str, name_pattern: str) -> list[tuple[str, Optional[int]]]:
+    # Stack-based scandir walk: file/dir checks come from the readdir d_type and
+    # DirEntry carries the joined path, so only matching files cost a stat.
+    match = re.compile(fnmatch.translate(name_pattern)).match
+    out: list[tuple[str, Optional[int]]] = []
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                        continue
+                except OSError:
+                    continue
+                if match(entry.name) is None:
+                    continue
+                try:
+                    mtime: Optional[int] = int(entry.stat().st_mtime)
+                except OSError:
+                    mtime = None
+                out.append((entry.path, mtime))
+    out.sort()
+    return out
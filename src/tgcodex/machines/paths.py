@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import stat
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Callable, Iterable
+from typing import Any, Callable, Iterable, Optional
 
 
 class CdNotAllowed(ValueError):
@@ -16,11 +20,11 @@ class CdNotAllowed(ValueError):
 
 
 def _is_within(child: str, root: str) -> bool:
-    # commonpath is boundary-aware (unlike startswith).
-    try:
-        return os.path.commonpath([child, root]) == root
-    except Exception:
-        return False
+    # Both sides are already resolved (canonical), so a prefix test is enough as long as it
+    # stops at a path boundary: "/srv/app" must not contain "/srv/application".
+    if child == root:
+        return True
+    return child.startswith(root if root.endswith(os.sep) else root + os.sep)
 
 
 def _normalize_join(current_workdir: str, new_path: str, *, expand_user: bool) -> str:
@@ -63,13 +67,117 @@ async def resolve_cd(
 ) -> str:
     # For remote machines where resolving must be delegated.
     candidate = _normalize_join(current_workdir, new_path, expand_user=False)
-    resolved = str(await _maybe_await(realpath(candidate)))
-    roots = [str(await _maybe_await(realpath(r))) for r in allowed_roots]
+    # Resolve the target and every root concurrently: over SSH each one is a round trip.
+    resolved_any, *roots_any = await asyncio.gather(
+        _maybe_await(realpath(candidate)), *(_maybe_await(realpath(r)) for r in allowed_roots)
+    )
+    resolved = str(resolved_any)
+    roots = [str(r) for r in roots_any]
     if not any(_is_within(resolved, rr) for rr in roots):
         raise CdNotAllowed(real=resolved, allowed_roots=roots)
     return resolved
 
 
+def _is_canonical_local(path: str) -> bool:
+    """
+    True if `path` is already what realpath() would return: absolute, normalized, existing,
+    and free of symlinks in every component (a symlinked parent such as macOS /tmp still
+    needs the full resolve, since Codex keys project trust by the canonical path).
+    """
+
+    if not os.path.isabs(path) or os.path.normpath(path) != path or path.startswith("//"):
+        return False
+    cur = path
+    while True:
+        try:
+            st = os.lstat(cur)
+        except OSError:
+            return False
+        if stat.S_ISLNK(st.st_mode):
+            return False
+        parent = os.path.dirname(cur)
+        if parent == cur:
+            return True
+        cur = parent
+
+
+# (machine name, requested path) -> (canonical path, expiry). Workdirs are reused across /new
+# and /resume, and for SSH machines every realpath() is a remote round trip. Bounded (LRU) and
+# expiring, since symlinks can be retargeted and directories created or moved underneath us.
+_REALPATH_CACHE: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+_REALPATH_CACHE_MAXSIZE = 256
+_REALPATH_CACHE_TTL_SECONDS = 300.0
+
+
+def _cache_get(key: tuple[str, str]) -> Optional[str]:
+    entry = _REALPATH_CACHE.get(key)
+    if entry is None:
+        return None
+    if entry[1] <= time.monotonic():
+        del _REALPATH_CACHE[key]
+        return None
+    _REALPATH_CACHE.move_to_end(key)
+    return entry[0]
+
+
+def _cache_put(key: tuple[str, str], resolved: str) -> None:
+    _REALPATH_CACHE[key] = (resolved, time.monotonic() + _REALPATH_CACHE_TTL_SECONDS)
+    _REALPATH_CACHE.move_to_end(key)
+    while len(_REALPATH_CACHE) > _REALPATH_CACHE_MAXSIZE:
+        _REALPATH_CACHE.popitem(last=False)
+
+
+def invalidate_realpath_cache(machine_name: Optional[str] = None) -> None:
+    """
+    Forget cached resolutions for one machine (or all), e.g. after /cd or /machine.
+    """
+
+    if machine_name is None:
+        _REALPATH_CACHE.clear()
+        return
+    for key in [k for k in _REALPATH_CACHE if k[0] == machine_name]:
+        del _REALPATH_CACHE[key]
+
+
+async def resolve_workdir(machine: Any, workdir: str) -> str:
+    """
+    Canonicalize a run/session workdir via the machine's realpath, with a process-wide cache.
+
+    Falls back to a lexical normpath if the machine can't resolve it (not cached, so a
+    transient SSH failure doesn't stick).
+    """
+
+    key = (machine.name, workdir)
+    resolved = _cache_get(key)
+    if resolved is not None:
+        return resolved
+    if getattr(machine, "type", None) == "local" and _is_canonical_local(workdir):
+        _cache_put(key, workdir)
+        return workdir
+    try:
+        return await cached_realpath(machine, workdir)
+    except Exception:
+        return os.path.normpath(workdir)
+
+
+async def cached_realpath(machine: Any, path: str) -> str:
+    """
+    machine.realpath(path), remembered for a while (see `_REALPATH_CACHE`).
+
+    For fixed locations like ~/.codex/sessions that are resolved on every listing. Errors
+    propagate and are not cached; neither are local paths that don't exist yet, whose
+    realpath is only lexical.
+    """
+
+    key = (machine.name, path)
+    resolved = _cache_get(key)
+    if resolved is None:
+        resolved = await machine.realpath(path)
+        if getattr(machine, "type", None) != "local" or os.path.exists(resolved):
+            _cache_put(key, resolved)
+    return resolved
+
+
 async def _maybe_await(value):  # type: ignore[no-untyped-def]
     if hasattr(value, "__await__"):
         return await value
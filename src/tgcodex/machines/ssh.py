@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import os
+import re
 from dataclasses import dataclass
 from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 
-from tgcodex.machines.base import ExecResult, RunHandle
+from tgcodex.machines.base import ExecResult, RunHandle, pump_stream
+
+
+_KEEPALIVE_INTERVAL_SECONDS = 15.0
 
 
 def _require_asyncssh():  # pragma: no cover
@@ -18,12 +23,31 @@ def _require_asyncssh():  # pragma: no cover
     return asyncssh
 
 
+def _close_quietly(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
 @dataclass
 class _SSHRunHandle:
-    conn: Any  # asyncssh.SSHClientConnection
-    process: Any  # asyncssh.SSHClientProcess
+    process: Any  # asyncssh.SSHClientProcess, on the machine's shared connection
     stdout_task: asyncio.Task[None]
     stderr_task: asyncio.Task[None]
+    # Releases this run's hold on the connection (see SSHMachine._release_conn).
+    release_conn: Optional[Callable[[], None]] = None
+
+    async def _close_channel(self) -> None:
+        # Only this run's channel: the connection is shared with other runs and file ops.
+        try:
+            self.process.close()
+            await self.process.wait_closed()
+        except Exception:
+            pass
+        release, self.release_conn = self.release_conn, None
+        if release is not None:
+            release()
 
     async def wait(self) -> int:
         try:
@@ -32,33 +56,21 @@ class _SSHRunHandle:
             await self.stderr_task
             return int(self.process.exit_status or 0)
         finally:
-            try:
-                self.conn.close()
-                await self.conn.wait_closed()
-            except Exception:
-                pass
+            await self._close_channel()
 
     async def terminate(self) -> None:
         try:
             self.process.terminate()
         except Exception:
             pass
-        try:
-            self.conn.close()
-            await self.conn.wait_closed()
-        except Exception:
-            pass
+        await self._close_channel()
 
     async def kill(self) -> None:
         try:
             self.process.kill()
         except Exception:
             pass
-        try:
-            self.conn.close()
-            await self.conn.wait_closed()
-        except Exception:
-            pass
+        await self._close_channel()
 
     async def write_stdin(self, data: bytes) -> None:
         try:
@@ -96,6 +108,150 @@ class SSHMachine:
         self._use_agent = use_agent
         self._key_path = key_path
         self._connect_timeout_seconds = float(connect_timeout_seconds)
+        # Long-lived connection shared by runs, commands and SFTP (see _get_conn).
+        self._conn: Any = None
+        self._conn_lock = asyncio.Lock()
+        # Operations and runs currently using each connection, and connections no longer handed
+        # out that are closed once their last user is done (see _retire_conn).
+        self._conn_users: dict[Any, int] = {}
+        self._retired_conns: set[Any] = set()
+        # SFTP session kept open on that connection; `_sftp_conn` records which one.
+        self._sftp: Any = None
+        self._sftp_conn: Any = None
+        self._sftp_lock = asyncio.Lock()
+        self._home: Optional[str] = None
+
+    async def _get_conn(self):  # type: ignore[no-untyped-def]
+        """
+        Return the machine's shared connection, (re)connecting if needed.
+
+        Every operation opens a channel on this connection instead of paying a full TCP + SSH
+        handshake per call; asyncssh multiplexes channels.
+        """
+        async with self._conn_lock:
+            conn = self._conn
+            if conn is None or conn.is_closed():
+                conn = self._conn = await self._connect()
+            return conn
+
+    def _acquire_conn(self, conn: Any) -> None:
+        self._conn_users[conn] = self._conn_users.get(conn, 0) + 1
+
+    def _release_conn(self, conn: Any) -> None:
+        users = self._conn_users.get(conn, 0) - 1
+        if users > 0:
+            self._conn_users[conn] = users
+            return
+        self._conn_users.pop(conn, None)
+        if conn in self._retired_conns:
+            self._retired_conns.discard(conn)
+            _close_quietly(conn)
+
+    def _forget_conn(self, conn: Any) -> None:
+        # Stop handing out `conn`; the next call reconnects.
+        if self._conn is conn:
+            self._conn = None
+        if self._sftp_conn is conn:
+            self._forget_sftp(self._sftp)
+
+    def _retire_conn(self, conn: Any) -> None:
+        # Stop handing out `conn`, but let runs and channels already on it finish: it is closed
+        # (with its SFTP client) when the last user releases it.
+        self._forget_conn(conn)
+        if self._conn_users.get(conn):
+            self._retired_conns.add(conn)
+        else:
+            _close_quietly(conn)
+
+    def _discard_conn(self, conn: Any) -> None:
+        # Called after `conn` proved unusable.
+        self._forget_conn(conn)
+        self._retired_conns.discard(conn)
+        _close_quietly(conn)
+
+    @contextlib.asynccontextmanager
+    async def _use_conn(self) -> AsyncIterator[Any]:
+        conn = await self._get_conn()
+        self._acquire_conn(conn)
+        try:
+            yield conn
+        except asyncio.CancelledError:
+            # A cancelled or timed-out call may point at a half-open link, but the connection is
+            # shared: later calls get a fresh one, and this one is closed once in-flight work on
+            # it is done (keepalive closes it sooner if it really is dead).
+            self._retire_conn(conn)
+            raise
+        except (ConnectionError, EOFError):
+            self._discard_conn(conn)
+            raise
+        except BaseException:
+            # Ordinary failures (missing file, channel refused) leave the connection usable.
+            if conn.is_closed():
+                self._discard_conn(conn)
+            raise
+        finally:
+            self._release_conn(conn)
+
+    async def close(self) -> None:
+        """
+        Close the shared connection and any retired ones (bot shutdown).
+        """
+        conns = set(self._retired_conns)
+        if self._conn is not None:
+            conns.add(self._conn)
+            self._forget_conn(self._conn)
+        self._retired_conns.clear()
+        self._conn_users.clear()
+        for conn in conns:
+            _close_quietly(conn)
+
+    async def _get_sftp(self, conn: Any):  # type: ignore[no-untyped-def]
+        """
+        Return the SFTP client bound to `conn`, starting one on first use.
+
+        Opening the subsystem channel is a round trip, so it happens once per connection
+        rather than once per file operation.
+        """
+        async with self._sftp_lock:
+            if self._sftp is None or self._sftp_conn is not conn:
+                self._sftp = await conn.start_sftp_client()
+                self._sftp_conn = conn
+            return self._sftp
+
+    def _forget_sftp(self, sftp: Any) -> None:
+        # Only drops the reference; other operations may still be using the client.
+        if sftp is not None and self._sftp is sftp:
+            self._sftp = None
+            self._sftp_conn = None
+
+    @contextlib.asynccontextmanager
+    async def _use_sftp(self) -> AsyncIterator[Any]:
+        async with self._use_conn() as conn:
+            sftp = await self._get_sftp(conn)
+            try:
+                yield sftp
+            except (asyncio.CancelledError, ConnectionError, EOFError):
+                self._forget_sftp(sftp)
+                raise
+            except BaseException as exc:
+                # The subsystem can go away while the connection stays up; start a fresh one.
+                asyncssh = _require_asyncssh()
+                if isinstance(exc, asyncssh.SFTPConnectionLost):
+                    self._forget_sftp(sftp)
+                raise
+
+    async def probe(self) -> None:
+        """
+        Run `true` over a dedicated connection, raising if the host can't be reached.
+
+        Deliberately bypasses the shared connection: a hung run may be stuck on exactly that
+        (half-open) link, and a probe that times out must not disturb other work on it.
+        """
+        conn = await self._connect()
+        try:
+            await conn.run("true", check=False)
+        finally:
+            conn.close()
 
     async def _connect(self):
         asyncssh = _require_asyncssh()
@@ -112,6 +268,9 @@ class SSHMachine:
             known_hosts=os.path.expanduser(self._known_hosts),
             client_keys=[os.path.expanduser(self._key_path)] if self._key_path else None,
             agent_forwarding=False,
+            # Notice dead peers, so a cached connection doesn't hang on a half-open socket.
+            keepalive_interval=_KEEPALIVE_INTERVAL_SECONDS,
+            keepalive_count_max=3,
             **kwargs,
         )
         # Protect the bot UX from "blackhole" SSH connects where the TCP handshake never completes.
@@ -148,59 +307,88 @@ class SSHMachine:
             exports = " ".join(f"{k}={_shell_quote(v)}" for k, v in env.items())
             cmd = f"env {exports} {cmd}"
 
-        conn = await self._connect()
-        # Connection lifetime is tied to the process; asyncssh keeps it alive.
         # Match LocalMachine behavior: stream bytes (not decoded strings) so downstream
         # consumers can treat stdout/stderr as raw bytes.
-        proc = await conn.create_process(cmd, term_type="xterm" if pty else None, encoding=None)
-
-        async def pump(stream, cb):  # type: ignore[no-untyped-def]
-            while True:
-                chunk = await stream.read(4096)
-                if not chunk:
-                    return
-                if isinstance(chunk, str):
-                    chunk = chunk.encode("utf-8", "replace")
-                await cb(chunk)
+        async with self._use_conn() as conn:
+            proc = await conn.create_process(cmd, term_type="xterm" if pty else None, encoding=None)
+            # The run keeps using the connection until its channel is closed.
+            self._acquire_conn(conn)
 
-        stdout_task = asyncio.create_task(pump(proc.stdout, stdout_cb))
-        stderr_task = asyncio.create_task(pump(proc.stderr, stderr_cb))
-        return _SSHRunHandle(conn=conn, process=proc, stdout_task=stdout_task, stderr_task=stderr_task)
+        stdout_task = asyncio.create_task(pump_stream(proc.stdout.read, stdout_cb))
+        stderr_task = asyncio.create_task(pump_stream(proc.stderr.read, stderr_cb))
+        return _SSHRunHandle(
+            process=proc,
+            stdout_task=stdout_task,
+            stderr_task=stderr_task,
+            release_conn=lambda: self._release_conn(conn),
+        )
 
     async def exec_capture(self, argv: list[str], cwd: Optional[str]) -> ExecResult:
         cmd = " ".join(_shell_quote(a) for a in argv)
         if cwd:
             cmd = f"cd {_shell_quote(cwd)} && {cmd}"
-        async with await self._connect() as conn:
+        async with self._use_conn() as conn:
             res = await conn.run(cmd, check=False)
-            return ExecResult(exit_code=int(res.exit_status or 0), stdout=res.stdout or "", stderr=res.stderr or "")
+        return ExecResult(exit_code=int(res.exit_status or 0), stdout=res.stdout or "", stderr=res.stderr or "")
 
     async def read_text(self, path: str) -> str:
-        async with await self._connect() as conn:
-            async with conn.start_sftp_client() as sftp:
-                async with sftp.open(path, "r") as f:
-                    data = await f.read()
-                    return data
+        async with self._use_sftp() as sftp:
+            async with sftp.open(path, "rb") as f:
+                data = await f.read()
+        # asyncssh reassembles its pipelined block reads into a single buffer; decode it once.
+        return data.decode("utf-8")
+
+    async def read_head(self, path: str, nbytes: int) -> str:
+        async with self._use_sftp() as sftp:
+            async with sftp.open(path, "rb") as f:
+                data = await f.read(nbytes)
+        return data.decode("utf-8", "replace")
+
+    async def read_tail(self, path: str, nbytes: int) -> str:
+        async with self._use_sftp() as sftp:
+            size = (await sftp.stat(path)).size or 0
+            offset = max(0, size - nbytes)
+            async with sftp.open(path, "rb") as f:
+                data = await f.read(size - offset, offset)
+        if offset > 0:
+            # Drop the partial first line.
+            data = data[data.find(b"\n") + 1 :]
+        return data.decode("utf-8", "replace")
 
     async def write_text(self, path: str, content: str, overwrite: bool) -> None:
-        async with await self._connect() as conn:
-            async with conn.start_sftp_client() as sftp:
-                if not overwrite:
-                    try:
-                        await sftp.stat(path)
-                    except FileNotFoundError:
-                        pass
-                    else:
-                        raise FileExistsError(path)
-                parent = os.path.dirname(path) or "."
+        # Encode up front: an unencodable string then fails before the remote file is truncated.
+        data = content.encode("utf-8")
+        async with self._use_sftp() as sftp:
+            if not overwrite:
                 try:
-                    await sftp.mkdir(parent)
-                except Exception:
+                    await sftp.stat(path)
+                except FileNotFoundError:
                     pass
-                async with sftp.open(path, "w") as f:
-                    await f.write(content)
+                else:
+                    raise FileExistsError(path)
+            parent = os.path.dirname(path) or "."
+            try:
+                await sftp.mkdir(parent)
+            except Exception:
+                pass
+            # One write of the whole buffer: asyncssh splits it into block-sized WRITE
+            # requests and keeps several in flight, hiding the per-chunk round trip.
+            async with sftp.open(path, "wb") as f:
+                await f.write(data)
+
+    async def _sftp_expanduser(self, sftp: Any, path: str) -> Optional[str]:
+        # SFTP has no "~", but its working directory is the login home: realpath(".") is $HOME.
+        if path == "~" or path.startswith("~/"):
+            if self._home is None:
+                self._home = await sftp.realpath(".")
+            return self._home + path[1:]
+        if path.startswith("~"):
+            return None  # ~user: left to the remote-python fallback
+        return path
 
     async def list_glob(self, pattern: str) -> list[str]:
+        # One remote command; remote python's glob keeps results identical for shallow and
+        # recursive patterns (SFTP glob differs on hidden files and ordering).
         code = (
             "import glob, os, sys; "
             "pat=os.path.expanduser(sys.argv[1]); "
@@ -211,8 +399,35 @@ class SSHMachine:
             return []
         return [line for line in res.stdout.splitlines() if line.strip()]
 
+    async def find_files(self, root: str, name_pattern: str) -> list[tuple[str, Optional[int]]]:
+        # Name filtering and mtimes both happen remotely, in one command (needs GNU find).
+        res = await self.exec_capture(
+            ["find", root, "-type", "f", "-name", name_pattern, "-printf", "%T@\\t%p\\n"], cwd=None
+        )
+        if res.exit_code != 0 and not res.stdout:
+            raise RuntimeError(res.stderr.strip() or "find failed")
+        out: list[tuple[str, Optional[int]]] = []
+        for line in res.stdout.splitlines():
+            mtime, sep, path = line.partition("\t")
+            if not sep:
+                continue
+            try:
+                out.append((path, int(float(mtime))))
+            except ValueError:
+                out.append((path, None))
+        out.sort()
+        return out
+
     async def realpath(self, path: str) -> str:
-        # Use remote python for robust tilde expansion + symlink resolution.
+        try:
+            async with self._use_sftp() as sftp:
+                expanded = await self._sftp_expanduser(sftp, path)
+                if expanded is not None:
+                    return await sftp.realpath(expanded)
+        except Exception:
+            pass
+        # Fallback: remote python handles ~user and paths with several missing components
+        # (SFTP REALPATH only tolerates a missing last component).
         code = (
             "import os,sys; "
             "print(os.path.realpath(os.path.expanduser(sys.argv[1])))"
@@ -223,10 +438,14 @@ class SSHMachine:
         return res.stdout.strip()
 
 
+# Words made only of these characters need no quoting (\w covers letters, digits and "_").
+_SHELL_SAFE = re.compile(r"[\w./:=@-]+").fullmatch
+
+
 def _shell_quote(s: str) -> str:
     # Minimal POSIX shell quoting.
     if s == "":
         return "''"
-    if all(c.isalnum() or c in "._-/:=@" for c in s):
+    if _SHELL_SAFE(s):
         return s
     return "'" + s.replace("'", "'\"'\"'") + "'"
@@ -4,8 +4,20 @@ import sqlite3
 
 
 def migrate(conn: sqlite3.Connection) -> None:
+    # All DDL and backfills run in one write transaction: the schema lock is taken once and
+    # the changes hit disk in a single commit (Store.open already enables WAL/NORMAL sync).
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        _apply(conn.cursor())
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def _apply(cur: sqlite3.Cursor) -> None:
     # Minimal schema, versioning can be added later if needed.
-    cur = conn.cursor()
     cur.execute(
         """
         CREATE TABLE IF NOT EXISTS chat_state (
@@ -38,6 +50,8 @@ def migrate(conn: sqlite3.Connection) -> None:
         """
     )
     # Migration: add token columns to existing databases that pre-date this schema.
+    # One PRAGMA lists what's there, instead of probing with failing ALTERs every startup.
+    existing = {row[1] for row in cur.execute("PRAGMA table_info(chat_state)")}
     for col, typ in [
         ("approval_mode", "TEXT"),
         ("sandbox_mode", "TEXT"),
@@ -54,10 +68,8 @@ def migrate(conn: sqlite3.Connection) -> None:
         ("rate_secondary_window_minutes", "INTEGER"),
         ("rate_secondary_resets_at", "INTEGER"),
     ]:
-        try:
+        if col not in existing:
             cur.execute(f"ALTER TABLE chat_state ADD COLUMN {col} {typ}")
-        except Exception:
-            pass  # Column already exists
 
     # Best-effort backfill: older DBs won't have approval_mode populated.
     # Map legacy Codex approval policies to the closest user-facing mode:
@@ -101,6 +113,14 @@ def migrate(conn: sqlite3.Connection) -> None:
         )
         """
     )
+    # /sessions lists a chat's sessions on one machine, most recently used first.
+    # (trusted_prefixes lookups are already served by its UNIQUE index.)
+    cur.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_session_index_chat
+        ON session_index(chat_id, machine_name, last_used_at DESC)
+        """
+    )
     cur.execute(
         """
         CREATE TABLE IF NOT EXISTS trusted_prefixes (
@@ -124,4 +144,3 @@ def migrate(conn: sqlite3.Connection) -> None:
         )
         """
     )
-    conn.commit()
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ChatState:
     chat_id: int
     machine_name: str
@@ -33,7 +33,7 @@ class ChatState:
     updated_at: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ActiveRun:
     chat_id: int
     run_id: str
@@ -42,7 +42,7 @@ class ActiveRun:
     updated_at: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SessionIndexRow:
     id: int
     chat_id: int
@@ -53,7 +53,7 @@ class SessionIndexRow:
     last_used_at: Optional[int]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TrustedPrefixRow:
     id: int
     machine_name: str
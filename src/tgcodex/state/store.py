@@ -3,13 +3,48 @@ from __future__ import annotations
 import json
 import sqlite3
 import time
+from dataclasses import fields as dataclass_fields
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 from tgcodex.state.migrations import migrate
 from tgcodex.state.models import ActiveRun, ChatState, SessionIndexRow
 
 
+_UPSERT_SESSION_INDEX_SQL = """
+INSERT INTO session_index (chat_id, machine_name, session_id, title, created_at, last_used_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(machine_name, session_id) DO UPDATE SET
+  chat_id = excluded.chat_id,
+  title = COALESCE(excluded.title, session_index.title),
+  last_used_at = excluded.last_used_at
+"""
+
+# OR IGNORE: a duplicate prefix is skipped instead of aborting the rest of a batch.
+_ADD_TRUSTED_PREFIX_SQL = """
+INSERT OR IGNORE INTO trusted_prefixes (machine_name, session_id, prefix, created_at)
+VALUES (?, ?, ?, ?)
+"""
+
+# Explicit column lists in dataclass field order: rows are unpacked positionally, which
+# avoids sqlite3.Row's per-column name lookups.
+_CHAT_STATE_COLS = ", ".join(f.name for f in dataclass_fields(ChatState))
+_SESSION_INDEX_COLS = ", ".join(f.name for f in dataclass_fields(SessionIndexRow))
+_ACTIVE_RUN_COLS = ", ".join(f.name for f in dataclass_fields(ActiveRun))
+
+# token_count events can arrive many times per turn. Their UPDATEs share a transaction
+# that is committed at most this often, or earlier by any other write or flush().
+_TELEMETRY_COMMIT_INTERVAL_SECONDS = 2.0
+
+
+@lru_cache(maxsize=64)
+def _update_chat_state_sql(cols: tuple[str, ...]) -> str:
+    # Same column set -> same SQL text, so sqlite3's statement cache can reuse the prepared statement.
+    assignments = ", ".join([*(f"{c} = ?" for c in cols), "updated_at = ?"])
+    return f"UPDATE chat_state SET {assignments} WHERE chat_id = ?"  # noqa: S608
+
+
 def _now_ts() -> int:
     return int(time.time())
 
@@ -25,14 +60,16 @@ class Store:
     def __init__(self, db_path: str) -> None:
         self._db_path = db_path
         self._conn: Optional[sqlite3.Connection] = None
+        self._telemetry_committed_at = 0.0
+        # chat_id -> telemetry fields last written, to skip repeated identical token_count events.
+        self._last_telemetry: dict[int, tuple[tuple[str, Any], ...]] = {}
 
     def open(self) -> None:
         if self._conn is not None:
             return
         db_path = Path(self._db_path).expanduser()
         db_path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(str(db_path))
-        conn.row_factory = sqlite3.Row
+        conn = sqlite3.connect(str(db_path), cached_statements=256)
         conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("PRAGMA synchronous=NORMAL")
         migrate(conn)
@@ -44,8 +81,16 @@ class Store:
             raise RuntimeError("Store not opened")
         return self._conn
 
+    def flush(self) -> None:
+        """
+        Commit writes that are still pending (deferred token telemetry).
+        """
+        if self._conn is not None and self._conn.in_transaction:
+            self._conn.commit()
+
     def close(self) -> None:
         if self._conn is not None:
+            self.flush()
             self._conn.close()
             self._conn = None
 
@@ -118,18 +163,27 @@ class Store:
 
     def get_chat_state(self, chat_id: int) -> Optional[ChatState]:
         row = self.conn.execute(
-            "SELECT * FROM chat_state WHERE chat_id = ?", (chat_id,)
+            f"SELECT {_CHAT_STATE_COLS} FROM chat_state WHERE chat_id = ?", (chat_id,)  # noqa: S608
         ).fetchone()
         if row is None:
             return None
+        (
+            chat_id,
+            machine_name,
+            workdir,
+            active_session_id,
+            session_title,
+            approval_policy,
+            approval_mode,
+            sandbox_mode,
+            model,
+            thinking_level,
+            show_reasoning,
+            plan_mode,
+            *telemetry,
+            updated_at,
+        ) = row
         # Backward compatibility: old DBs may not have approval_mode populated.
-        approval_policy = str(row["approval_policy"])
-        approval_mode = None
-        try:
-            if "approval_mode" in row.keys():  # type: ignore[union-attr]
-                approval_mode = row["approval_mode"]
-        except Exception:
-            approval_mode = None
         if not isinstance(approval_mode, str) or not approval_mode:
             approval_mode = _approval_mode_from_policy(approval_policy)
         # Backward compat: "always" mode was removed; coerce to on-request.
@@ -137,62 +191,49 @@ class Store:
             approval_mode = "on-request"
         if approval_mode not in ("on-request", "yolo"):
             approval_mode = "on-request"
-
-        sandbox_mode = None
-        try:
-            if "sandbox_mode" in row.keys():  # type: ignore[union-attr]
-                sandbox_mode = row["sandbox_mode"]
-        except Exception:
-            sandbox_mode = None
         if not isinstance(sandbox_mode, str) or not sandbox_mode:
             sandbox_mode = None
         return ChatState(
-            chat_id=int(row["chat_id"]),
-            machine_name=str(row["machine_name"]),
-            workdir=str(row["workdir"]),
-            active_session_id=row["active_session_id"],
-            session_title=row["session_title"],
-            approval_policy=approval_policy,
-            approval_mode=approval_mode,
-            sandbox_mode=sandbox_mode,
-            model=row["model"],
-            thinking_level=row["thinking_level"],
-            show_reasoning=bool(row["show_reasoning"]),
-            plan_mode=bool(row["plan_mode"]),
-            last_input_tokens=row["last_input_tokens"] if row["last_input_tokens"] is not None else None,
-            last_output_tokens=row["last_output_tokens"] if row["last_output_tokens"] is not None else None,
-            last_cached_tokens=row["last_cached_tokens"] if row["last_cached_tokens"] is not None else None,
-            last_total_tokens=row["last_total_tokens"] if row["last_total_tokens"] is not None else None,
-            last_context_window=row["last_context_window"] if row["last_context_window"] is not None else None,
-            last_context_remaining=row["last_context_remaining"] if row["last_context_remaining"] is not None else None,
-            rate_primary_used_percent=float(row["rate_primary_used_percent"]) if row["rate_primary_used_percent"] is not None else None,
-            rate_primary_window_minutes=row["rate_primary_window_minutes"] if row["rate_primary_window_minutes"] is not None else None,
-            rate_primary_resets_at=row["rate_primary_resets_at"] if row["rate_primary_resets_at"] is not None else None,
-            rate_secondary_used_percent=float(row["rate_secondary_used_percent"]) if row["rate_secondary_used_percent"] is not None else None,
-            rate_secondary_window_minutes=row["rate_secondary_window_minutes"] if row["rate_secondary_window_minutes"] is not None else None,
-            rate_secondary_resets_at=row["rate_secondary_resets_at"] if row["rate_secondary_resets_at"] is not None else None,
-            updated_at=int(row["updated_at"]),
+            chat_id,
+            machine_name,
+            workdir,
+            active_session_id,
+            session_title,
+            approval_policy,
+            approval_mode,
+            sandbox_mode,
+            model,
+            thinking_level,
+            bool(show_reasoning),
+            bool(plan_mode),
+            *telemetry,
+            updated_at,
         )
 
     def update_chat_state(self, chat_id: int, **fields: Any) -> None:
         if not fields:
             return
-        fields = dict(fields)
-        fields["updated_at"] = _now_ts()
-        cols = ", ".join(f"{k} = ?" for k in fields.keys())
-        vals = list(fields.values())
-        vals.append(chat_id)
-        self.conn.execute(
-            f"UPDATE chat_state SET {cols} WHERE chat_id = ?", vals  # noqa: S608
-        )
+        # Other writes may reset telemetry columns (e.g. clear_session).
+        self._last_telemetry.pop(chat_id, None)
+        self._execute_update(chat_id, fields)
         self.conn.commit()
 
+    def _execute_update(self, chat_id: int, fields: dict[str, Any]) -> None:
+        cols = tuple(sorted(k for k in fields if k != "updated_at"))
+        vals = [fields[k] for k in cols]
+        vals.append(_now_ts())
+        vals.append(chat_id)
+        self.conn.execute(_update_chat_state_sql(cols), vals)
+
     def update_token_telemetry(self, chat_id: int, *, token: Any) -> None:
         """
         Persist best-effort token and rate-limit telemetry emitted by Codex (token_count events).
 
         `token` is expected to be a `tgcodex.codex.events.TokenCount`, but is typed as `Any` here
         to keep state/store decoupled from Codex event parsing.
+
+        The commit is deferred (see `_TELEMETRY_COMMIT_INTERVAL_SECONDS`); reads on this store
+        see the new values immediately.
         """
         fields: dict[str, Any] = {}
 
@@ -237,8 +278,17 @@ class Store:
         if isinstance(s_reset, int):
             fields["rate_secondary_resets_at"] = s_reset
 
-        if fields:
-            self.update_chat_state(chat_id, **fields)
+        if not fields:
+            return
+        key = tuple(fields.items())
+        if self._last_telemetry.get(chat_id) == key:
+            return
+        self._execute_update(chat_id, fields)
+        self._last_telemetry[chat_id] = key
+        now = time.monotonic()
+        if now - self._telemetry_committed_at >= _TELEMETRY_COMMIT_INTERVAL_SECONDS:
+            self.conn.commit()
+            self._telemetry_committed_at = now
 
     def set_machine(self, *, chat_id: int, machine_name: str, workdir: str) -> None:
         self.update_chat_state(chat_id, machine_name=machine_name, workdir=workdir, **self._cleared_session_fields())
@@ -289,19 +339,18 @@ class Store:
         session_id: str,
         title: Optional[str],
     ) -> None:
+        self.upsert_session_index_many([(chat_id, machine_name, session_id, title)])
+
+    def upsert_session_index_many(self, rows: Iterable[tuple[int, str, str, Optional[str]]]) -> None:
+        """
+        Upsert `(chat_id, machine_name, session_id, title)` rows in a single transaction.
+        """
         now = _now_ts()
-        self.conn.execute(
-            """
-            INSERT INTO session_index (chat_id, machine_name, session_id, title, created_at, last_used_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(machine_name, session_id) DO UPDATE SET
-              chat_id = excluded.chat_id,
-              title = COALESCE(excluded.title, session_index.title),
-              last_used_at = excluded.last_used_at
-            """,
-            (chat_id, machine_name, session_id, title, now, now),
-        )
-        self.conn.commit()
+        with self.conn:
+            self.conn.executemany(
+                _UPSERT_SESSION_INDEX_SQL,
+                [(chat_id, machine, session_id, title, now, now) for chat_id, machine, session_id, title in rows],
+            )
 
     def list_session_index(
         self,
@@ -311,43 +360,24 @@ class Store:
         limit: int = 10,
     ) -> list[SessionIndexRow]:
         cur = self.conn.execute(
-            """
-            SELECT * FROM session_index
+            f"""
+            SELECT {_SESSION_INDEX_COLS} FROM session_index
             WHERE chat_id = ? AND machine_name = ?
             ORDER BY (last_used_at IS NULL) ASC, last_used_at DESC, created_at DESC
             LIMIT ?
-            """,
+            """,  # noqa: S608
             (chat_id, machine_name, limit),
         )
-        out: list[SessionIndexRow] = []
-        for row in cur.fetchall():
-            out.append(SessionIndexRow(
-                id=int(row["id"]),
-                chat_id=int(row["chat_id"]),
-                machine_name=str(row["machine_name"]),
-                session_id=str(row["session_id"]),
-                title=row["title"],
-                created_at=row["created_at"] if row["created_at"] is not None else None,
-                last_used_at=row["last_used_at"] if row["last_used_at"] is not None else None,
-            ))
-        return out
+        return [SessionIndexRow(*row) for row in cur.fetchall()]
 
     def get_session_index(self, *, machine_name: str, session_id: str) -> Optional[SessionIndexRow]:
         row = self.conn.execute(
-            "SELECT * FROM session_index WHERE machine_name = ? AND session_id = ?",
+            f"SELECT {_SESSION_INDEX_COLS} FROM session_index WHERE machine_name = ? AND session_id = ?",  # noqa: S608
             (machine_name, session_id),
         ).fetchone()
         if row is None:
             return None
-        return SessionIndexRow(
-            id=int(row["id"]),
-            chat_id=int(row["chat_id"]),
-            machine_name=str(row["machine_name"]),
-            session_id=str(row["session_id"]),
-            title=row["title"],
-            created_at=row["created_at"] if row["created_at"] is not None else None,
-            last_used_at=row["last_used_at"] if row["last_used_at"] is not None else None,
-        )
+        return SessionIndexRow(*row)
 
     def list_trusted_prefixes(self, *, machine_name: str, session_id: str) -> list[str]:
         cur = self.conn.execute(
@@ -358,36 +388,30 @@ class Store:
             """,
             (machine_name, session_id),
         )
-        return [str(r["prefix"]) for r in cur.fetchall()]
+        return [str(r[0]) for r in cur.fetchall()]
 
     def add_trusted_prefix(self, *, machine_name: str, session_id: str, prefix: str) -> bool:
+        return self.add_trusted_prefixes_many(machine_name=machine_name, session_id=session_id, prefixes=[prefix]) == 1
+
+    def add_trusted_prefixes_many(self, *, machine_name: str, session_id: str, prefixes: Iterable[str]) -> int:
+        """
+        Trust several prefixes in a single transaction; returns how many were newly added.
+        """
         now = _now_ts()
-        try:
-            self.conn.execute(
-                """
-                INSERT INTO trusted_prefixes (machine_name, session_id, prefix, created_at)
-                VALUES (?, ?, ?, ?)
-                """,
-                (machine_name, session_id, prefix, now),
+        with self.conn:
+            cur = self.conn.executemany(
+                _ADD_TRUSTED_PREFIX_SQL,
+                [(machine_name, session_id, prefix, now) for prefix in prefixes],
             )
-            self.conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            return False
+        return max(cur.rowcount, 0)
 
     def get_active_run(self, chat_id: int) -> Optional[ActiveRun]:
         row = self.conn.execute(
-            "SELECT * FROM active_run WHERE chat_id = ?", (chat_id,)
+            f"SELECT {_ACTIVE_RUN_COLS} FROM active_run WHERE chat_id = ?", (chat_id,)  # noqa: S608
         ).fetchone()
         if row is None:
             return None
-        return ActiveRun(
-            chat_id=int(row["chat_id"]),
-            run_id=str(row["run_id"]),
-            status=str(row["status"]),
-            pending_action_json=row["pending_action_json"],
-            updated_at=int(row["updated_at"]),
-        )
+        return ActiveRun(*row)
 
     def set_active_run(
         self,
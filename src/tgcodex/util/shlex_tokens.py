@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import re
 import shlex
 from typing import Iterable
 
+# shlex.split only treats these four characters as whitespace.
+_PLAIN_TOKEN_RE = re.compile(r"[^ \t\r\n]+")
+
 
 def split_command(command: str) -> list[str]:
+    if '"' not in command and "'" not in command and "\\" not in command:
+        # No quoting or escapes (the common `git status` case): shlex would only split on
+        # whitespace, so skip its per-character Python loop.
+        return _PLAIN_TOKEN_RE.findall(command)
     try:
         return shlex.split(command, posix=True)
     except Exception:
@@ -19,4 +27,3 @@ def prefix_string(tokens: Iterable[str], n: int) -> str:
             break
         out.append(t)
     return " ".join(out)
-
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import unittest
+from typing import Any
+from unittest import mock
+
+from tgcodex.codex.app_server_backend import AppServerSession
+from tgcodex.codex.events import (
+    AgentMessageDelta,
+    AgentReasoningDelta,
+    ExecCommandOutputDelta,
+    TokenCount,
+    ToolStarted,
+    TurnCompleted,
+)
+
+
+class _FakeHandle:
+    def __init__(self) -> None:
+        self.writes: list[bytes] = []
+
+    async def write_stdin(self, data: bytes) -> None:
+        self.writes.append(data)
+
+
+def _line(method: str, params: dict[str, Any]) -> bytes:
+    return json.dumps({"method": method, "params": params}).encode("utf-8") + b"\n"
+
+
+class TestAppServerSession(unittest.IsolatedAsyncioTestCase):
+    async def _collect(self, session: AppServerSession) -> list[Any]:
+        out: list[Any] = []
+        async for ev in session.events():
+            out.append(ev)
+        return out
+
+    async def test_deltas_are_coalesced_in_order(self) -> None:
+        session = AppServerSession(machine=None, handle=_FakeHandle())  # type: ignore[arg-type]
+        chunk = b"".join(
+            [
+                _line("item/agentMessage/delta", {"delta": "Hel"}),
+                _line("item/agentMessage/delta", {"delta": "lo"}),
+                _line("item/reasoning/textDelta", {"delta": "hmm"}),
+                _line("item/agentMessage/delta", {"delta": "!"}),
+                _line("item/started", {"item": {"type": "commandExecution", "command": "ls"}}),
+                _line("item/agentMessage/delta", {"delta": "done"}),
+                _line("turn/completed", {"turn": {"status": "completed"}}),
+            ]
+        )
+        await session.rpc.feed_stdout(chunk)
+        evs = await self._collect(session)
+        self.assertEqual(
+            evs,
+            [
+                AgentMessageDelta(text="Hello"),
+                AgentReasoningDelta(text="hmm"),
+                AgentMessageDelta(text="!"),
+                ToolStarted(command="ls"),
+                AgentMessageDelta(text="done"),
+                TurnCompleted(),
+            ],
+        )
+
+    async def test_token_usage_and_rate_limits_map_to_token_count(self) -> None:
+        session = AppServerSession(machine=None, handle=_FakeHandle())  # type: ignore[arg-type]
+        await session.rpc.feed_stdout(
+            _line(
+                "thread/tokenUsage/updated",
+                {
+                    "tokenUsage": {
+                        "modelContextWindow": 1000,
+                        "total": {"totalTokens": 30, "inputTokens": 20, "outputTokens": "x"},
+                    }
+                },
+            )
+            + _line(
+                "account/rateLimits/updated",
+                {"rateLimits": {"primary": {"usedPercent": 12, "windowDurationMins": 300, "resetsAt": None}}},
+            )
+        )
+        await session.close()
+        usage, limits = await self._collect(session)
+        self.assertIsInstance(usage, TokenCount)
+        self.assertEqual(usage.model_context_window, 1000)
+        self.assertEqual((usage.total_tokens, usage.input_tokens, usage.output_tokens), (30, 20, None))
+        self.assertEqual(
+            (limits.primary_used_percent, limits.primary_window_minutes, limits.primary_resets_at),
+            (12.0, 300, None),
+        )
+        self.assertIsNone(limits.secondary_used_percent)
+
+    async def test_full_queue_drops_exec_output_but_keeps_message_text(self) -> None:
+        with mock.patch("tgcodex.codex.app_server_backend._EVENT_QUEUE_MAXSIZE", 1):
+            session = AppServerSession(machine=None, handle=_FakeHandle())  # type: ignore[arg-type]
+        await session.push_event(ToolStarted(command="cat big"))  # fills the queue
+
+        await session.push_event(ExecCommandOutputDelta(text="x" * 10, raw={}))
+        await asyncio.sleep(0.1)
+        await session.push_event(AgentMessageDelta(text="keep "))
+        await asyncio.sleep(0.1)
+        await session.push_event(AgentMessageDelta(text="me"))
+
+        evs: list[Any] = [await session._queue.get()]
+        close_task = asyncio.create_task(session.close())
+        async for ev in session.events():
+            evs.append(ev)
+        await close_task
+        self.assertEqual(evs, [ToolStarted(command="cat big"), AgentMessageDelta(text="keep me")])
+
+    async def test_close_does_not_block_when_nobody_reads(self) -> None:
+        with mock.patch("tgcodex.codex.app_server_backend._EVENT_QUEUE_MAXSIZE", 1):
+            session = AppServerSession(machine=None, handle=_FakeHandle())  # type: ignore[arg-type]
+        await session.push_event(ToolStarted(command="a"))  # fills the queue
+        blocked = asyncio.create_task(session.push_event(ToolStarted(command="b")))
+        await asyncio.sleep(0.01)
+        self.assertFalse(blocked.done())  # back-pressure while open
+
+        await asyncio.wait_for(session.close(), timeout=1.0)
+        await asyncio.wait_for(blocked, timeout=1.0)
+        await asyncio.wait_for(session.push_event(ToolStarted(command="c")), timeout=1.0)
+        self.assertEqual(await asyncio.wait_for(self._collect(session), timeout=1.0), [ToolStarted(command="a")])
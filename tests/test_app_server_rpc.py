@@ -0,0 +1,128 @@
+import asyncio
+import json
+import unittest
+from typing import Any
+
+from tgcodex.codex.app_server_rpc import JsonLineBuffer, JsonRpcConnection, JsonRpcIncoming
+
+
+class _FakeHandle:
+    def __init__(self) -> None:
+        self.writes: list[bytes] = []
+
+    async def write_stdin(self, data: bytes) -> None:
+        self.writes.append(data)
+
+
+class _SlowHandle(_FakeHandle):
+    def __init__(self) -> None:
+        super().__init__()
+        self.active = 0
+        self.max_active = 0
+
+    async def write_stdin(self, data: bytes) -> None:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.writes.append(data)
+        self.active -= 1
+
+
+class TestJsonLineBuffer(unittest.TestCase):
+    def test_splits_lines_across_chunks(self) -> None:
+        buf = JsonLineBuffer()
+        self.assertEqual(buf.feed(b'{"a":'), [])
+        lines = buf.feed(b'1}\n\n{"b":2}\n{"c"')
+        self.assertEqual([json.loads(x) for x in lines], [{"a": 1}, {"b": 2}])
+        lines = buf.feed(b":3}\n")
+        self.assertEqual([json.loads(x) for x in lines], [{"c": 3}])
+        lines = buf.feed(b'{"d":4}\r\n \n{"e":5}\n')
+        self.assertEqual([json.loads(x) for x in lines], [{"d": 4}, {"e": 5}])
+
+
+class TestJsonRpcConnection(unittest.IsolatedAsyncioTestCase):
+    async def test_request_response_roundtrip(self) -> None:
+        handle = _FakeHandle()
+        notifs: list[JsonRpcIncoming] = []
+        logs: list[str] = []
+
+        async def on_req(req: JsonRpcIncoming) -> None:
+            return
+
+        async def on_notif(notif: JsonRpcIncoming) -> None:
+            notifs.append(notif)
+
+        async def on_log(line: str) -> None:
+            logs.append(line)
+
+        rpc = JsonRpcConnection(
+            handle=handle,  # type: ignore[arg-type]
+            on_server_request=on_req,
+            on_notification=on_notif,
+            on_log=on_log,
+        )
+
+        task = asyncio.create_task(rpc.request(method="initialize", params={"x": "é"}))
+        while not handle.writes:
+            await asyncio.sleep(0)
+        self.assertEqual(len(handle.writes), 1)
+        self.assertTrue(handle.writes[0].endswith(b"\n"))
+        sent: dict[str, Any] = json.loads(handle.writes[0])
+        self.assertEqual(sent["method"], "initialize")
+        self.assertEqual(sent["params"], {"x": "é"})
+
+        await rpc.feed_stdout(b"not json\n")
+        await rpc.feed_stdout(b'{"method":"turn/started","params":{}}\n')
+        await rpc.feed_stdout(json.dumps({"id": sent["id"], "result": {"ok": True}}).encode() + b"\n")
+
+        self.assertEqual(await asyncio.wait_for(task, timeout=1.0), {"ok": True})
+        self.assertEqual(logs, ["not json"])
+        self.assertEqual([n.method for n in notifs], ["turn/started"])
+
+    async def test_concurrent_writes_are_coalesced(self) -> None:
+        handle = _FakeHandle()
+
+        async def _noop(_: JsonRpcIncoming) -> None:
+            return
+
+        rpc = JsonRpcConnection(handle=handle, on_server_request=_noop, on_notification=_noop)  # type: ignore[arg-type]
+        await asyncio.gather(
+            rpc.respond(request_id=1, result={"decision": "accept"}),
+            rpc.respond(request_id="2", result={"decision": "decline"}),
+        )
+        self.assertEqual(len(handle.writes), 1)
+        lines = handle.writes[0].splitlines()
+        self.assertEqual([json.loads(x)["id"] for x in lines], [1, "2"])
+
+    async def test_writes_do_not_overlap(self) -> None:
+        handle = _SlowHandle()
+
+        async def _noop(_: JsonRpcIncoming) -> None:
+            return
+
+        rpc = JsonRpcConnection(handle=handle, on_server_request=_noop, on_notification=_noop)  # type: ignore[arg-type]
+        first = asyncio.create_task(rpc.respond(request_id=1, result={}))
+        while handle.active == 0:
+            await asyncio.sleep(0)
+        await asyncio.gather(
+            first,
+            rpc.respond(request_id=2, result={}),
+            rpc.respond(request_id=3, result={}),
+        )
+        self.assertEqual(handle.max_active, 1)
+        self.assertEqual([[json.loads(x)["id"] for x in w.splitlines()] for w in handle.writes], [[1], [2, 3]])
+
+    async def test_large_lines_are_parsed(self) -> None:
+        notifs: list[JsonRpcIncoming] = []
+
+        async def on_notif(notif: JsonRpcIncoming) -> None:
+            notifs.append(notif)
+
+        async def _noop(_: JsonRpcIncoming) -> None:
+            return
+
+        rpc = JsonRpcConnection(handle=_FakeHandle(), on_server_request=_noop, on_notification=on_notif)  # type: ignore[arg-type]
+        big = "x" * 100_000
+        await rpc.feed_stdout(json.dumps({"method": "item/commandExecution/outputDelta", "params": {"delta": big}}).encode() + b"\n")
+        self.assertEqual(len(notifs), 1)
+        self.assertEqual(notifs[0].params, {"delta": big})
@@ -0,0 +1,36 @@
+import asyncio
+import unittest
+
+from tgcodex.codex.cli_runner import CodexRun, _take_lines
+from tgcodex.codex.events import ThreadStarted, TurnCompleted, TurnStarted
+
+
+class TestTakeLines(unittest.TestCase):
+    def test_joins_fragments_across_chunks(self) -> None:
+        pending: list[bytes] = []
+        self.assertEqual(_take_lines(pending, b'{"a"'), [])
+        self.assertEqual(_take_lines(pending, b":1"), [])
+        self.assertEqual(_take_lines(pending, b'}\n{"b":2}\n{"c'), [b'{"a":1}', b'{"b":2}'])
+        self.assertEqual(pending, [b'{"c'])
+        self.assertEqual(_take_lines(pending, b'"}\n'), [b'{"c"}'])
+        self.assertEqual(pending, [])
+
+
+class TestCodexRunEvents(unittest.IsolatedAsyncioTestCase):
+    async def test_events_drain_in_order_then_stop_on_close(self) -> None:
+        run = CodexRun(machine=None, handle=None)  # type: ignore[arg-type]
+        got: list[object] = []
+
+        async def consume() -> None:
+            async for ev in run.events():
+                got.append(ev)
+
+        task = asyncio.create_task(consume())
+        await run.push_event(ThreadStarted(thread_id="t1"))
+        await asyncio.sleep(0)
+        run.push_events_nowait([TurnStarted(), TurnCompleted()])
+        await run.close()
+        await run.push_event(TurnStarted())  # ignored after close
+        await asyncio.wait_for(task, timeout=1.0)
+        self.assertEqual(got, [ThreadStarted(thread_id="t1"), TurnStarted(), TurnCompleted()])
+        self.assertEqual(run.thread_id, "t1")
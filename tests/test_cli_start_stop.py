@@ -126,3 +126,61 @@ class TestStartStopStatus(unittest.TestCase):
 
             self.assertNotEqual(res.exit_code, 0, res.output)
             self.assertIn("failed", res.output.lower())
+
+    def test_start_skips_revalidation_of_unchanged_config(self) -> None:
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as td:
+            td_path = Path(td)
+            cfg_path = td_path / "config.yaml"
+            _write_min_config(cfg_path)
+
+            os.environ["TELEGRAM_BOT_TOKEN"] = "dummy"
+
+            res = runner.invoke(app, ["validate-config", "--config", str(cfg_path), "--no-check-binaries"])
+            self.assertEqual(res.exit_code, 0, res.output)
+
+            with patch("tgcodex.cli.load_config", side_effect=AssertionError("re-parsed")):
+                with patch("tgcodex.daemon.start_detached", return_value=4242):
+                    with patch("tgcodex.daemon.pid_file_matches_running_process", return_value=True):
+                        res = runner.invoke(app, ["start", "--config", str(cfg_path)])
+            self.assertEqual(res.exit_code, 0, res.output)
+
+    def test_start_reuses_a_stamp_recorded_with_binary_checks(self) -> None:
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as td:
+            td_path = Path(td)
+            cfg_path = td_path / "config.yaml"
+            _write_min_config(cfg_path)
+
+            os.environ["TELEGRAM_BOT_TOKEN"] = "dummy"
+
+            # validate-config checks binaries by default; start does not.
+            with patch("tgcodex.cli.validate_config", return_value=[]) as validate:
+                res = runner.invoke(app, ["validate-config", "--config", str(cfg_path)])
+            self.assertEqual(res.exit_code, 0, res.output)
+            self.assertTrue(validate.call_args.kwargs["validate_binaries"])
+
+            with patch("tgcodex.cli.load_config", side_effect=AssertionError("re-parsed")):
+                with patch("tgcodex.daemon.start_detached", return_value=4242):
+                    with patch("tgcodex.daemon.pid_file_matches_running_process", return_value=True):
+                        res = runner.invoke(app, ["start", "--config", str(cfg_path)])
+            self.assertEqual(res.exit_code, 0, res.output)
+
+    def test_stamp_without_binary_checks_does_not_satisfy_them(self) -> None:
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as td:
+            td_path = Path(td)
+            cfg_path = td_path / "config.yaml"
+            _write_min_config(cfg_path)
+
+            os.environ["TELEGRAM_BOT_TOKEN"] = "dummy"
+
+            res = runner.invoke(app, ["validate-config", "--config", str(cfg_path), "--no-check-binaries"])
+            self.assertEqual(res.exit_code, 0, res.output)
+
+            with patch("tgcodex.cli.validate_config", return_value=[]) as validate:
+                with patch("tgcodex.daemon.start_detached", return_value=4242):
+                    with patch("tgcodex.daemon.pid_file_matches_running_process", return_value=True):
+                        res = runner.invoke(app, ["start", "--config", str(cfg_path), "--check-binaries"])
+            self.assertEqual(res.exit_code, 0, res.output)
+            self.assertEqual(validate.call_count, 1)
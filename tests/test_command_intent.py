@@ -54,3 +54,8 @@ class TestCommandIntent(unittest.TestCase):
         self.assertFalse(needs_write_approval("find . -name '*.py'"))
         self.assertFalse(needs_write_approval("head -n 10 file.txt"))
 
+    def test_bash_lc_fast_unwrap_matches_tokenized_path(self) -> None:
+        self.assertTrue(needs_write_approval('bash -lc "ls > out.txt"'))
+        self.assertFalse(needs_write_approval('sh -lc "cat a.txt"'))
+        # Escapes inside double quotes fall back to full tokenizing.
+        self.assertTrue(needs_write_approval('bash -lc "echo \\"x\\" > f"'))
@@ -1,6 +1,8 @@
 import os
+import shutil
 import tempfile
 import unittest
+from pathlib import Path
 
 from tgcodex.config import (
     ApprovalsConfig,
@@ -11,9 +13,12 @@ from tgcodex.config import (
     OutputConfig,
     StateConfig,
     TelegramConfig,
+    load_config,
     validate_config,
 )
 
+_EXAMPLE = Path(__file__).resolve().parent.parent / "config.example.yaml"
+
 
 class TestConfigValidation(unittest.TestCase):
     def test_validate_config_accepts_tilde_allowed_roots(self) -> None:
@@ -67,3 +72,16 @@ class TestConfigValidation(unittest.TestCase):
                     os.environ.pop("TGCODEX_TEST_TOKEN", None)
                 else:
                     os.environ["TGCODEX_TEST_TOKEN"] = old
+
+    def test_load_config_is_cached_until_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "config.yaml"
+            shutil.copyfile(_EXAMPLE, path)
+            first = load_config(path)
+            self.assertIs(load_config(path), first)
+
+            path.write_text(path.read_text(encoding="utf-8").replace("bin: codex", "bin: codex2", 1), encoding="utf-8")
+            os.utime(path, ns=(0, 0))
+            second = load_config(path)
+            self.assertIsNot(second, first)
+            self.assertEqual(second.codex.bin, "codex2")
@@ -28,3 +28,18 @@ class TestDaemonPaths(unittest.TestCase):
         with tempfile.TemporaryDirectory() as td:
             missing = Path(td) / "missing.pid"
             self.assertIsNone(daemon.read_pid(missing))
+
+    def test_read_pid_record_parses_legacy_and_json_formats(self) -> None:
+        from tgcodex import daemon
+
+        with tempfile.TemporaryDirectory() as td:
+            pid_file = Path(td) / "bot.pid"
+            pid_file.write_text("123\n", encoding="utf-8")
+            self.assertEqual(daemon.read_pid_record(pid_file), daemon.PidRecord(pid=123))
+
+            record = daemon.PidRecord(pid=456, argv=("tgcodex-bot", "run"), start_time="789")
+            daemon._write_pid_record(pid_file, record)
+            self.assertEqual(daemon.read_pid_record(pid_file), record)
+
+            pid_file.write_text("garbage", encoding="utf-8")
+            self.assertIsNone(daemon.read_pid_record(pid_file))
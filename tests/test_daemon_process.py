@@ -1,5 +1,7 @@
 import os
+import sys
 import unittest
+from unittest.mock import patch
 
 
 class TestDaemonProcess(unittest.TestCase):
@@ -7,3 +9,18 @@ class TestDaemonProcess(unittest.TestCase):
         from tgcodex import daemon
 
         self.assertTrue(daemon.is_pid_running(os.getpid()))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "requires /proc")
+    def test_matching_start_time_skips_cmdline(self) -> None:
+        from tgcodex import daemon
+
+        pid = os.getpid()
+        start = daemon._read_proc_start_time(pid)
+        self.assertIsNotNone(start)
+        record = daemon.PidRecord(pid=pid, argv=("not", "our", "argv"), start_time=start)
+        with patch("tgcodex.daemon._read_proc_cmdline") as cmdline:
+            self.assertTrue(daemon._is_expected_process(record))
+        cmdline.assert_not_called()
+
+        stale = daemon.PidRecord(pid=pid, argv=record.argv, start_time="0")
+        self.assertFalse(daemon._is_expected_process(stale))
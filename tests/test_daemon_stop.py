@@ -104,3 +104,14 @@ class TestDaemonStop(unittest.TestCase):
 
             self.assertFalse(stopped)
             kill.assert_not_called()
+
+    def test_wait_for_exit_backs_off_exponentially(self) -> None:
+        from tgcodex import daemon
+
+        sleeps: list[float] = []
+        with patch("tgcodex.daemon.time.sleep", side_effect=sleeps.append):
+            with patch("tgcodex.daemon.is_pid_running", side_effect=[True, True, True, False]):
+                exited = daemon._wait_for_exit(123, deadline=float("inf"), max_delay=0.003)
+
+        self.assertTrue(exited)
+        self.assertEqual(sleeps, [0.001, 0.002, 0.003, 0.003])
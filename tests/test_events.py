@@ -7,6 +7,7 @@ from tgcodex.codex.events import (
     TokenCount,
     ToolStarted,
     parse_event_obj,
+    parse_json_line,
 )
 
 
@@ -190,3 +191,8 @@ class TestEventParsing(unittest.TestCase):
         self.assertIsInstance(evs[0], ExecCommandEnd)
         self.assertIsNone(evs[0].exit_code)
         self.assertEqual(evs[0].aggregated_output, "ok")
+
+    def test_parse_json_line_accepts_bytes(self) -> None:
+        self.assertEqual(parse_json_line(b'{"type":"turn.started"}'), ({"type": "turn.started"}, None))
+        self.assertEqual(parse_json_line("not json \u00e9".encode("utf-8")), (None, "not json \u00e9"))
+        self.assertEqual(parse_json_line(b"[1]"), (None, "[1]"))
@@ -52,3 +52,44 @@ class TestLocalMachineProcessGroup(unittest.IsolatedAsyncioTestCase):
             await asyncio.sleep(1.1)
             self.assertFalse(os.path.exists(marker))
 
+    async def test_env_is_an_overlay_on_the_inherited_environment(self) -> None:
+        lm = LocalMachine(name="local")
+        out = bytearray()
+
+        async def _collect(data: bytes) -> None:
+            out.extend(data)
+
+        handle = await lm.run(
+            argv=["sh", "-c", 'echo "$TGCODEX_TEST_OVERLAY:${PATH:+has-path}"'],
+            cwd=None,
+            env={"TGCODEX_TEST_OVERLAY": "1"},
+            pty=False,
+            stdout_cb=_collect,
+            stderr_cb=_collect,
+            stdin_provider=None,
+        )
+        self.assertEqual(await asyncio.wait_for(handle.wait(), timeout=2.0), 0)
+        self.assertEqual(bytes(out), b"1:has-path\n")
+
+    async def test_cancelled_wait_leaves_no_task_behind(self) -> None:
+        lm = LocalMachine(name="local")
+
+        async def _sink(_: bytes) -> None:
+            return None
+
+        handle = await lm.run(
+            argv=["cat"],
+            cwd=None,
+            env=None,
+            pty=False,
+            stdout_cb=_sink,
+            stderr_cb=_sink,
+            stdin_provider=None,
+        )
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(handle.wait(), timeout=0.05)
+        await asyncio.sleep(0)
+        orphans = [t for t in asyncio.all_tasks() if t.get_coro().__qualname__ == "Process.wait"]
+        self.assertEqual(orphans, [])
+        await handle.close_stdin()
+        self.assertEqual(await asyncio.wait_for(handle.wait(), timeout=2.0), 0)
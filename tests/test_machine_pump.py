@@ -0,0 +1,48 @@
+import asyncio
+import unittest
+
+from tgcodex.machines.base import pump_stream
+
+
+class _Reader:
+    def __init__(self, chunks: list[bytes], *, buffered: bool = False) -> None:
+        self._chunks = list(chunks)
+        self._buffered = buffered
+        self.reads = 0
+
+    async def read(self, n: int) -> bytes:
+        self.reads += 1
+        if not self._buffered:
+            await asyncio.sleep(0)
+        return self._chunks.pop(0) if self._chunks else b""
+
+
+class TestPumpStream(unittest.IsolatedAsyncioTestCase):
+    async def test_slow_callback_receives_coalesced_chunks(self) -> None:
+        got: list[bytes] = []
+
+        async def cb(data: bytes) -> None:
+            got.append(data)
+            await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(pump_stream(_Reader([b"a", b"b", b"c", b"d"]).read, cb), timeout=1.0)
+        self.assertEqual(b"".join(got), b"abcd")
+        self.assertLess(len(got), 4)
+
+    async def test_already_buffered_output_is_drained_in_one_callback(self) -> None:
+        got: list[bytes] = []
+
+        async def cb(data: bytes) -> None:
+            got.append(data)
+
+        await pump_stream(_Reader([b"a", b"b", b"c"], buffered=True).read, cb)
+        self.assertEqual(got, [b"abc"])
+
+    async def test_callback_error_propagates_without_hanging(self) -> None:
+        async def cb(data: bytes) -> None:
+            raise ValueError("boom")
+
+        reader = _Reader([b"x"] * 1000)
+        with self.assertRaises(ValueError):
+            await asyncio.wait_for(pump_stream(reader.read, cb), timeout=1.0)
+        self.assertLess(reader.reads, 1000)
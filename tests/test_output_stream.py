@@ -1,4 +1,10 @@
 import unittest
+from unittest import mock
+
+try:
+    import telegram  # type: ignore  # noqa: F401
+except Exception:  # pragma: no cover
+    telegram = None
 
 from tgcodex.bot.output_stream import BufferedTelegramWriter, OutputTuning
 
@@ -14,6 +20,7 @@ class _FakeBot:
         self.edited: list[str] = []
         self._next_id = 1
         self.edit_should_fail = False
+        self.edit_errors: list[Exception] = []
 
     async def send_message(self, **kwargs):  # type: ignore[no-untyped-def]
         self.sent.append(kwargs["text"])
@@ -22,6 +29,8 @@ class _FakeBot:
         return _Msg(mid)
 
     async def edit_message_text(self, **kwargs):  # type: ignore[no-untyped-def]
+        if self.edit_errors:
+            raise self.edit_errors.pop(0)
         if self.edit_should_fail:
             raise Exception("Message edit failed (simulated Telegram API error)")
         self.edited.append(kwargs["text"])
@@ -97,3 +106,76 @@ class TestBufferedTelegramWriter(unittest.IsolatedAsyncioTestCase):
         # Should have sent a new message instead of editing
         self.assertEqual(len(bot.sent), 2, "Should have sent a second message when edit failed")
         self.assertIn("first message - updated content", bot.sent[1])
+
+    @unittest.skipIf(telegram is None, "python-telegram-bot not installed")
+    async def test_edit_errors_do_not_spawn_duplicate_messages(self) -> None:
+        from telegram.error import BadRequest, RetryAfter, TimedOut
+
+        bot = _FakeBot()
+        w = BufferedTelegramWriter(
+            bot=bot,
+            chat_id=1,
+            tuning=OutputTuning(
+                flush_interval_ms=0,
+                min_flush_chars=1,
+                max_flush_delay_seconds=0,
+                max_chars=100,
+                typing_interval_seconds=1.0,
+            ),
+        )
+        w.append("first")
+        await w.flush()
+
+        with mock.patch("tgcodex.bot.output_stream.asyncio.sleep") as sleep:
+            bot.edit_errors = [RetryAfter(1), TimedOut()]
+            w.append(" second")
+            await w.flush(force=True)
+            self.assertEqual(sleep.await_count, 2)
+
+        bot.edit_errors = [BadRequest("Message is not modified")]
+        w.append(" third")
+        await w.flush()
+        self.assertEqual(len(bot.sent), 1)
+        self.assertEqual(bot.edited, ["first second"])
+
+        with mock.patch("tgcodex.bot.output_stream.asyncio.sleep") as sleep:
+            # Too long a flood-wait for an intermediate edit: dropped, not slept on.
+            bot.edit_errors = [RetryAfter(30)]
+            w.append(" dropped")
+            await w.flush()
+            self.assertEqual(sleep.await_count, 0)
+        self.assertEqual(bot.edited, ["first second"])
+
+        bot.edit_errors = [BadRequest("Message to edit not found")]
+        w.append(" fourth")
+        await w.flush()
+        self.assertEqual(len(bot.sent), 2)
+        self.assertIn("fourth", bot.sent[1])
+
+    @unittest.skipIf(telegram is None, "python-telegram-bot not installed")
+    async def test_final_edit_giving_up_is_logged(self) -> None:
+        from telegram.error import TimedOut
+
+        bot = _FakeBot()
+        w = BufferedTelegramWriter(
+            bot=bot,
+            chat_id=1,
+            tuning=OutputTuning(
+                flush_interval_ms=0,
+                min_flush_chars=1,
+                max_flush_delay_seconds=0,
+                max_chars=100,
+                typing_interval_seconds=1.0,
+            ),
+        )
+        w.append("first")
+        await w.flush()
+
+        bot.edit_errors = [TimedOut()] * 4
+        w.append(" last")
+        with mock.patch("tgcodex.bot.output_stream.asyncio.sleep"):
+            with mock.patch("tgcodex.bot.output_stream._log") as log:
+                await w.close()
+        log.assert_called_once()
+        self.assertIn("TimedOut", log.call_args.args[0])
+        self.assertEqual(bot.edited, [])
@@ -3,8 +3,26 @@ import tempfile
 import unittest
 import asyncio
 from pathlib import Path
+from unittest import mock
 
-from tgcodex.machines.paths import CdNotAllowed, resolve_cd, resolve_cd_local
+from tgcodex.machines import paths
+from tgcodex.machines.paths import (
+    CdNotAllowed,
+    _is_within,
+    cached_realpath,
+    invalidate_realpath_cache,
+    resolve_cd,
+    resolve_cd_local,
+    resolve_workdir,
+)
+
+
+class TestIsWithin(unittest.TestCase):
+    def test_prefix_check_respects_path_boundaries(self) -> None:
+        self.assertTrue(_is_within("/srv/app", "/srv/app"))
+        self.assertTrue(_is_within("/srv/app/x", "/srv/app"))
+        self.assertFalse(_is_within("/srv/application", "/srv/app"))
+        self.assertTrue(_is_within("/srv", "/"))
 
 
 class TestResolveCdLocal(unittest.TestCase):
@@ -104,3 +122,127 @@ class TestResolveCdRemote(unittest.TestCase):
         )
         self.assertEqual(out, "/home/cys/repo")
         self.assertIn("~/repo", seen)
+
+
+    def test_target_and_roots_are_resolved_concurrently(self) -> None:
+        active = 0
+        peak = 0
+
+        async def slow_realpath(p: str) -> str:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return p
+
+        out = asyncio.run(
+            resolve_cd(
+                current_workdir="/srv",
+                new_path="app",
+                allowed_roots=["/srv", "/opt", "/tmp"],
+                realpath=slow_realpath,
+            )
+        )
+        self.assertEqual(out, "/srv/app")
+        self.assertEqual(peak, 4)
+
+
+class TestResolveWorkdir(unittest.TestCase):
+    def test_caches_successful_resolution_per_machine(self) -> None:
+        class _Machine:
+            def __init__(self, name: str) -> None:
+                self.name = name
+                self.calls = 0
+                self.fail = False
+
+            async def realpath(self, path: str) -> str:
+                self.calls += 1
+                if self.fail:
+                    raise RuntimeError("unreachable")
+                return f"/real/{self.name}"
+
+        a = _Machine("test-resolve-workdir-a")
+        b = _Machine("test-resolve-workdir-b")
+        b.fail = True
+
+        self.assertEqual(asyncio.run(resolve_workdir(a, "/w/")), "/real/test-resolve-workdir-a")
+        self.assertEqual(asyncio.run(resolve_workdir(a, "/w/")), "/real/test-resolve-workdir-a")
+        self.assertEqual(a.calls, 1)
+
+        # Failures fall back to normpath and are retried next time.
+        self.assertEqual(asyncio.run(resolve_workdir(b, "/w/")), "/w")
+        b.fail = False
+        self.assertEqual(asyncio.run(resolve_workdir(b, "/w/")), "/real/test-resolve-workdir-b")
+        self.assertEqual(b.calls, 2)
+
+    def test_local_canonical_path_skips_realpath(self) -> None:
+        class _LocalMachine:
+            type = "local"
+
+            def __init__(self) -> None:
+                self.name = "test-resolve-workdir-local"
+                self.calls: list[str] = []
+
+            async def realpath(self, path: str) -> str:
+                self.calls.append(path)
+                return str(Path(path).resolve())
+
+        with tempfile.TemporaryDirectory() as td:
+            real = Path(td).resolve() / "real"
+            real.mkdir()
+            link = Path(td).resolve() / "link"
+            link.symlink_to(real)
+
+            m = _LocalMachine()
+            self.assertEqual(asyncio.run(resolve_workdir(m, str(real))), str(real))
+            self.assertEqual(m.calls, [])
+
+            self.assertEqual(asyncio.run(resolve_workdir(m, str(link))), str(real))
+            self.assertEqual(m.calls, [str(link)])
+
+    def test_cache_is_bounded_expiring_and_invalidatable(self) -> None:
+        class _Machine:
+            def __init__(self, name: str) -> None:
+                self.name = name
+                self.calls = 0
+
+            async def realpath(self, path: str) -> str:
+                self.calls += 1
+                return "/real" + path
+
+        m = _Machine("test-realpath-cache")
+        other = _Machine("test-realpath-cache-other")
+        with mock.patch.object(paths, "_REALPATH_CACHE_MAXSIZE", 2):
+            for p in ("/a", "/b", "/c"):
+                asyncio.run(cached_realpath(m, p))
+            self.assertNotIn((m.name, "/a"), paths._REALPATH_CACHE)
+            self.assertEqual(len(paths._REALPATH_CACHE), 2)
+
+        asyncio.run(cached_realpath(other, "/a"))
+        invalidate_realpath_cache(m.name)
+        self.assertEqual(asyncio.run(cached_realpath(m, "/c")), "/real/c")
+        self.assertEqual(m.calls, 4)
+        self.assertIn((other.name, "/a"), paths._REALPATH_CACHE)
+
+        with mock.patch.object(paths, "_REALPATH_CACHE_TTL_SECONDS", 0.0):
+            asyncio.run(cached_realpath(m, "/d"))
+        asyncio.run(cached_realpath(m, "/d"))
+        self.assertEqual(m.calls, 6)
+
+    def test_missing_local_paths_are_not_cached(self) -> None:
+        class _LocalMachine:
+            type = "local"
+            name = "test-realpath-cache-missing"
+
+            async def realpath(self, path: str) -> str:
+                return os.path.realpath(path)
+
+        with tempfile.TemporaryDirectory() as td:
+            target = os.path.join(os.path.realpath(td), "later")
+            m = _LocalMachine()
+            asyncio.run(cached_realpath(m, target))
+            self.assertNotIn((m.name, target), paths._REALPATH_CACHE)
+            os.mkdir(target)
+            asyncio.run(cached_realpath(m, target))
+            self.assertIn((m.name, target), paths._REALPATH_CACHE)
@@ -1,7 +1,16 @@
+import glob
+import os
+import tempfile
 import unittest
 
-from tgcodex.codex.sessions import extract_latest_token_count, read_latest_token_count
+from tgcodex.codex.sessions import (
+    _session_id_from_filename,
+    extract_latest_token_count,
+    list_sessions,
+    read_latest_token_count,
+)
 from tgcodex.machines.base import ExecResult
+from tgcodex.machines.local import LocalMachine
 
 
 class TestSessionTokenCountExtraction(unittest.TestCase):
@@ -19,8 +28,21 @@ class TestSessionTokenCountExtraction(unittest.TestCase):
         self.assertEqual(ev.model_context_window, 10)
         self.assertEqual(ev.primary_used_percent, 2.0)
 
+    def test_extract_latest_token_count_skips_trailing_events(self) -> None:
+        text = (
+            '{"type":"event_msg","payload":{"type":"token_count","info":{"total_token_usage":{"total_tokens":7}}}}\r\n'
+            'not json\n'
+            '{"type":"event_msg","payload":{"type":"agent_message","message":"token_count"}}\n'
+            "\n"
+        )
+        ev = extract_latest_token_count(text)
+        assert ev is not None
+        self.assertEqual(ev.total_tokens, 7)
+        self.assertIsNone(extract_latest_token_count(""))
+
 
 class _FakeMachine:
+    name = "fake"
     type = "local"
 
     def __init__(self, *, stdout: str) -> None:
@@ -58,3 +80,84 @@ class TestSessionTokenCountReading(unittest.IsolatedAsyncioTestCase):
         self.assertIsNotNone(ev)
         assert ev is not None
         self.assertEqual(ev.total_tokens, 2)
+
+    async def test_local_read_tail_starts_at_a_line_boundary(self) -> None:
+        lm = LocalMachine(name="local")
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "s.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("first line\nsecond\nthird\n")
+            self.assertEqual(await lm.read_tail(path, 10), "third\n")
+            self.assertEqual(await lm.read_tail(path, 1000), "first line\nsecond\nthird\n")
+
+
+class _FakeSSHMachine:
+    name = "fake-ssh"
+    type = "ssh"
+
+    def __init__(self, paths: list[str]) -> None:
+        self._paths = paths
+        self.exec_calls: list[list[str]] = []
+
+    async def realpath(self, path: str) -> str:  # type: ignore[no-untyped-def]
+        return "/home/u/.codex/sessions"
+
+    async def list_glob(self, pattern: str) -> list[str]:  # type: ignore[no-untyped-def]
+        return list(self._paths)
+
+    async def exec_capture(self, argv: list[str], cwd: str | None) -> ExecResult:  # type: ignore[no-untyped-def]
+        self.exec_calls.append(argv)
+        lines = [f"{100 + i}\t{p}" for i, p in enumerate(argv[3:]) if "gone" not in p]
+        return ExecResult(exit_code=1, stdout="\n".join(lines) + "\n", stderr="")
+
+
+class TestListSessions(unittest.IsolatedAsyncioTestCase):
+    async def test_remote_mtimes_use_one_stat_call(self) -> None:
+        base = "/home/u/.codex/sessions/2026/02/10"
+        paths = [
+            f"{base}/rollout-2026-02-10T00-00-00-019c0000-0000-0000-0000-00000000000{i}.jsonl"
+            for i in range(3)
+        ]
+        paths[1] = paths[1].replace("rollout", "gone")
+        m = _FakeSSHMachine(paths + [f"{base}/notes.jsonl"])
+        out = await list_sessions(m, limit=10)  # type: ignore[arg-type]
+        self.assertEqual(len(m.exec_calls), 1)
+        self.assertEqual(
+            [(s.session_id[-1], s.updated_at) for s in out],
+            [("2", 102), ("0", 100), ("1", None)],
+        )
+
+    async def test_local_find_files_returns_paths_and_mtimes(self) -> None:
+        lm = LocalMachine(name="local")
+        with tempfile.TemporaryDirectory() as td:
+            sub = os.path.join(td, "2026", "02")
+            os.makedirs(sub)
+            for name in ("a.jsonl", "b.txt", "c.jsonl"):
+                with open(os.path.join(sub, name), "w", encoding="utf-8") as f:
+                    f.write("{}\n")
+            os.utime(os.path.join(sub, "a.jsonl"), (1700000000, 1700000000))
+            found = await lm.find_files(td, "*.jsonl")
+        self.assertEqual([os.path.basename(p) for p, _ in found], ["a.jsonl", "c.jsonl"])
+        self.assertEqual(found[0][1], 1700000000)
+
+    async def test_local_recursive_glob_matches_glob_module(self) -> None:
+        lm = LocalMachine(name="local")
+        with tempfile.TemporaryDirectory() as td:
+            for rel in ("a.jsonl", "x/b.jsonl", "x/y/c.jsonl", ".hidden/d.jsonl", "x/.e.jsonl", "x/f.txt"):
+                path = os.path.join(td, rel)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write("{}\n")
+            pattern = os.path.join(td, "**", "*.jsonl")
+            found = await lm.list_glob(pattern)
+            self.assertEqual(found, sorted(glob.glob(pattern, recursive=True)))
+        self.assertEqual([os.path.relpath(p, td) for p in found], ["a.jsonl", "x/b.jsonl", "x/y/c.jsonl"])
+
+
+class TestSessionIdFromFilename(unittest.TestCase):
+    def test_uuid_tail_is_required(self) -> None:
+        sid = "019c0000-0000-0000-0000-00000000abcd"
+        self.assertEqual(_session_id_from_filename(f"/s/2026/rollout-2026-02-10T00-00-00-{sid}.jsonl"), sid)
+        self.assertIsNone(_session_id_from_filename("/s/rollout-a-b-c-d-e.jsonl"))
+        self.assertIsNone(_session_id_from_filename(f"/s/{sid}.json"))
+        self.assertIsNone(_session_id_from_filename(f"/s/{sid}.jsonl/other.txt"))
@@ -0,0 +1,22 @@
+import shlex
+import unittest
+
+from tgcodex.util.shlex_tokens import split_command
+
+
+class TestSplitCommand(unittest.TestCase):
+    def test_matches_shlex(self) -> None:
+        for command in [
+            "git status",
+            "  ls   -la\t/tmp\n",
+            "",
+            "echo a#b $HOME; rm -rf x|y&&z",
+            "echo nbsp\x0bvt",
+            'grep "a b" file',
+            "echo 'it''s' a\\ b",
+            'a"b c"d',
+        ]:
+            self.assertEqual(split_command(command), shlex.split(command), command)
+
+    def test_unbalanced_quotes_fall_back_to_whitespace_split(self) -> None:
+        self.assertEqual(split_command('echo "unterminated'), ["echo", '"unterminated'])
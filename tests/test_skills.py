@@ -1,6 +1,10 @@
+import asyncio
+import os
+import tempfile
 import unittest
 
-from tgcodex.codex.skills import list_skills
+from tgcodex.codex.skills import _read_skill_description, list_skills
+from tgcodex.machines.local import LocalMachine
 
 
 class _FakeMachine:
@@ -47,6 +51,38 @@ Longer body...
         return self._texts[path]
 
 
+class _FindingMachine(_FakeMachine):
+    name = "finding"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.mtime = 1
+        self.reads: list[str] = []
+
+    async def find_files(self, root: str, name_pattern: str) -> list[tuple[str, int]]:
+        return [(p, self.mtime) for p in await self.list_glob(root)]
+
+    async def read_text(self, path: str) -> str:  # type: ignore[override]
+        self.reads.append(path)
+        return await super().read_text(path)
+
+
+class _SlowMachine(_FindingMachine):
+    name = "slow"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.active = 0
+        self.max_active = 0
+
+    async def read_text(self, path: str) -> str:  # type: ignore[override]
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return await super().read_text(path)
+
+
 class TestSkills(unittest.IsolatedAsyncioTestCase):
     async def test_list_skills_includes_superpowers(self) -> None:
         machine = _FakeMachine()
@@ -65,3 +101,69 @@ class TestSkills(unittest.IsolatedAsyncioTestCase):
             "Use when starting any conversation.",
         )
 
+
+    async def test_unchanged_skill_files_are_not_reread(self) -> None:
+        machine = _FindingMachine()
+        first = await list_skills(machine, limit=200)
+        second = await list_skills(machine, limit=200)
+        self.assertEqual(first, second)
+        self.assertEqual(machine.reads, ["/skills/.system/skill-creator/SKILL.md", "/super/using-superpowers/SKILL.md"])
+
+        machine.mtime = 2
+        await list_skills(machine, limit=200)
+        self.assertEqual(len(machine.reads), 4)
+
+    async def test_description_comes_from_file_head(self) -> None:
+        lm = LocalMachine(name="local")
+        with tempfile.TemporaryDirectory() as td:
+            short = os.path.join(td, "short.md")
+            with open(short, "w", encoding="utf-8") as f:
+                f.write("---\ndescription: Short one.\n---\n" + "body\n" * 5000)
+            long_fm = os.path.join(td, "long.md")
+            with open(long_fm, "w", encoding="utf-8") as f:
+                f.write("---\n" + "x: y\n" * 2000 + "description: Found late.\n---\nbody\n")
+            self.assertEqual(await _read_skill_description(lm, short), "Short one.")
+            self.assertEqual(await _read_skill_description(lm, long_fm), "Found late.")
+
+    async def test_skill_files_are_read_concurrently(self) -> None:
+        machine = _SlowMachine()
+        skills = await list_skills(machine, limit=200)
+        self.assertEqual(len(skills), 2)
+        self.assertEqual(machine.max_active, 2)
+
+    async def test_duplicate_skill_names_are_read_once(self) -> None:
+        class _DupMachine(_FindingMachine):
+            name = "dup"
+
+            def __init__(self) -> None:
+                super().__init__()
+                self.broken: set[str] = set()
+                self._texts["/super/skill-creator/SKILL.md"] = "---\ndescription: Shadowed copy.\n---\n"
+
+            async def list_glob(self, pattern: str) -> list[str]:  # type: ignore[override]
+                if pattern.startswith("/super"):
+                    return ["/super/using-superpowers/SKILL.md", "/super/skill-creator/SKILL.md"]
+                return await super().list_glob(pattern)
+
+            async def read_text(self, path: str) -> str:  # type: ignore[override]
+                if path in self.broken:
+                    self.reads.append(path)
+                    raise OSError("unreadable")
+                return await super().read_text(path)
+
+        machine = _DupMachine()
+        skills = await list_skills(machine, limit=200)
+        self.assertEqual(
+            {s.name: s.description for s in skills},
+            {"skill-creator": "Guide for creating effective skills.", "using-superpowers": "Use when starting any conversation."},
+        )
+        self.assertNotIn("/super/skill-creator/SKILL.md", machine.reads)
+
+        # Only when the preferred copy fails to read is the shadowed one used.
+        machine = _DupMachine()
+        machine.name = "dup-broken"  # separate description cache entries
+        machine.broken.add("/skills/.system/skill-creator/SKILL.md")
+        skills = await list_skills(machine, limit=200)
+        by_name = {s.name: s for s in skills}
+        self.assertEqual(by_name["skill-creator"].description, "Shadowed copy.")
+        self.assertIn("/super/skill-creator/SKILL.md", machine.reads)
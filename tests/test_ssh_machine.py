@@ -0,0 +1,215 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from typing import Any
+
+from tgcodex.machines.ssh import SSHMachine, _shell_quote
+
+
+class _FakeSFTP:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str]] = []
+
+    async def realpath(self, path: str) -> str:
+        self.calls.append(("realpath", path))
+        return "/home/u" if path == "." else path.replace("/link", "/real")
+
+
+
+class _FakeConn:
+    def __init__(self) -> None:
+        self.closed = False
+        self.commands: list[str] = []
+        self.fail = False
+        self.hang = False
+        self.sftp = _FakeSFTP()
+        self.sftp_starts = 0
+
+    async def start_sftp_client(self) -> _FakeSFTP:
+        self.sftp_starts += 1
+        self.sftp = _FakeSFTP()
+        return self.sftp
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def close(self) -> None:
+        self.closed = True
+
+    async def create_process(self, cmd: str, **kwargs: Any) -> "_FakeProcess":
+        self.commands.append(cmd)
+        return _FakeProcess()
+
+    async def run(self, cmd: str, check: bool = False) -> Any:
+        if self.fail:
+            raise ConnectionResetError("lost")
+        if self.hang:
+            await asyncio.Event().wait()
+        self.commands.append(cmd)
+        return SimpleNamespace(exit_status=0, stdout="ok\n", stderr="")
+
+
+class _FakeStream:
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+
+    async def read(self, n: int) -> bytes:
+        data, self._data = self._data[:n], self._data[n:]
+        return data
+
+
+class _FakeProcess:
+    def __init__(self) -> None:
+        self.stdout = _FakeStream(b"out")
+        self.stderr = _FakeStream(b"")
+        self.exit_status = 0
+        self.closed = False
+
+    async def wait(self) -> None:
+        return None
+
+    def close(self) -> None:
+        self.closed = True
+
+    async def wait_closed(self) -> None:
+        return None
+
+
+class TestSSHMachineConnection(unittest.IsolatedAsyncioTestCase):
+    def _machine(self) -> tuple[SSHMachine, list[_FakeConn]]:
+        m = SSHMachine(
+            name="remote",
+            host="h",
+            user="u",
+            port=22,
+            known_hosts="~/.ssh/known_hosts",
+            use_agent=True,
+            key_path=None,
+        )
+        conns: list[_FakeConn] = []
+
+        async def _connect() -> _FakeConn:
+            conns.append(_FakeConn())
+            return conns[-1]
+
+        m._connect = _connect  # type: ignore[method-assign]
+        return m, conns
+
+    async def test_exec_capture_reuses_one_connection(self) -> None:
+        m, conns = self._machine()
+        results = await asyncio.gather(*(m.exec_capture(["true"], cwd=None) for _ in range(3)))
+        await m.exec_capture(["ls", "a b"], cwd="/w")
+        self.assertEqual([r.stdout for r in results], ["ok\n"] * 3)
+        self.assertEqual(len(conns), 1)
+        self.assertEqual(conns[0].commands[-1], "cd /w && ls 'a b'")
+
+    async def test_failed_or_closed_connection_is_replaced(self) -> None:
+        m, conns = self._machine()
+        await m.exec_capture(["true"], cwd=None)
+        conns[0].fail = True
+        with self.assertRaises(ConnectionResetError):
+            await m.exec_capture(["true"], cwd=None)
+        self.assertTrue(conns[0].closed)
+        await m.exec_capture(["true"], cwd=None)
+        self.assertEqual(len(conns), 2)
+
+        conns[1].closed = True
+        await m.exec_capture(["true"], cwd=None)
+        self.assertEqual(len(conns), 3)
+
+    async def test_runs_share_the_connection_and_only_close_their_channel(self) -> None:
+        m, conns = self._machine()
+        out: list[bytes] = []
+
+        async def _collect(data: bytes) -> None:
+            out.append(data)
+
+        handle = await m.run(["codex", "exec"], None, None, False, _collect, _collect, None)
+        self.assertEqual(await handle.wait(), 0)
+        self.assertEqual(out, [b"out"])
+        self.assertTrue(handle.process.closed)  # type: ignore[attr-defined]
+        await m.exec_capture(["true"], cwd=None)
+        self.assertEqual(len(conns), 1)
+        self.assertFalse(conns[0].closed)
+
+    async def test_realpath_uses_sftp(self) -> None:
+        m, conns = self._machine()
+        self.assertEqual(await m.realpath("~/link/x"), "/home/u/real/x")
+        self.assertEqual(await m.realpath("~"), "/home/u")
+        sftp = conns[0].sftp
+        self.assertEqual(sftp.calls.count(("realpath", ".")), 1)  # home is looked up once
+        self.assertEqual(conns[0].commands, [])
+
+    async def test_sftp_client_is_reused_until_the_connection_drops(self) -> None:
+        m, conns = self._machine()
+        await m.realpath("/srv/link")
+        await m.realpath("~/x")
+        self.assertEqual(conns[0].sftp_starts, 1)
+
+        conns[0].fail = True
+        with self.assertRaises(ConnectionResetError):
+            await m.exec_capture(["true"], cwd=None)
+        await m.realpath("/srv/link")
+        self.assertEqual(len(conns), 2)
+        self.assertEqual(conns[1].sftp_starts, 1)
+
+
+    async def test_cancelled_call_retires_the_connection_until_its_runs_finish(self) -> None:
+        m, conns = self._machine()
+
+        async def _sink(_: bytes) -> None:
+            return None
+
+        handle = await m.run(["codex"], None, None, False, _sink, _sink, None)
+        conns[0].hang = True
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(m.exec_capture(["true"], cwd=None), timeout=0.01)
+        self.assertFalse(conns[0].closed)  # the run is still using it
+        await m.exec_capture(["true"], cwd=None)
+        self.assertEqual(len(conns), 2)
+
+        await handle.wait()
+        self.assertTrue(conns[0].closed)
+        self.assertFalse(conns[1].closed)
+
+    async def test_cancelled_call_without_other_users_closes_the_connection(self) -> None:
+        m, conns = self._machine()
+        await m.exec_capture(["true"], cwd=None)
+        conns[0].hang = True
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(m.exec_capture(["true"], cwd=None), timeout=0.01)
+        self.assertTrue(conns[0].closed)
+
+    async def test_close_closes_shared_and_retired_connections(self) -> None:
+        m, conns = self._machine()
+
+        async def _sink(_: bytes) -> None:
+            return None
+
+        await m.run(["codex"], None, None, False, _sink, _sink, None)
+        conns[0].hang = True
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(m.exec_capture(["true"], cwd=None), timeout=0.01)
+        await m.exec_capture(["true"], cwd=None)
+        await m.close()
+        self.assertTrue(all(c.closed for c in conns))
+
+    async def test_probe_uses_a_dedicated_connection(self) -> None:
+        m, conns = self._machine()
+        await m.exec_capture(["true"], cwd=None)
+        await m.probe()
+        self.assertEqual(len(conns), 2)
+        self.assertTrue(conns[1].closed)
+        self.assertFalse(conns[0].closed)
+        await m.exec_capture(["true"], cwd=None)
+        self.assertEqual(len(conns), 2)
+
+
+class TestShellQuote(unittest.TestCase):
+    def test_quotes_only_when_needed(self) -> None:
+        self.assertEqual(_shell_quote("/srv/app-1/a_b.txt"), "/srv/app-1/a_b.txt")
+        self.assertEqual(_shell_quote("KEY=v@host:22"), "KEY=v@host:22")
+        self.assertEqual(_shell_quote(""), "''")
+        self.assertEqual(_shell_quote("a b"), "'a b'")
+        self.assertEqual(_shell_quote("it's"), "'it'\"'\"'s'")
+        self.assertEqual(_shell_quote("x\n"), "'x\n'")
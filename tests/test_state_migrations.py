@@ -0,0 +1,52 @@
+import sqlite3
+import unittest
+
+from tgcodex.state.migrations import migrate
+
+
+class TestMigrations(unittest.TestCase):
+    def test_legacy_chat_state_gains_missing_columns(self) -> None:
+        conn = sqlite3.connect(":memory:")
+        conn.execute(
+            """
+            CREATE TABLE chat_state (
+              chat_id INTEGER PRIMARY KEY,
+              machine_name TEXT NOT NULL,
+              workdir TEXT NOT NULL,
+              active_session_id TEXT,
+              session_title TEXT,
+              approval_policy TEXT NOT NULL,
+              model TEXT,
+              thinking_level TEXT,
+              show_reasoning INTEGER NOT NULL DEFAULT 0,
+              plan_mode INTEGER NOT NULL DEFAULT 0,
+              updated_at INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO chat_state (chat_id, machine_name, workdir, approval_policy, updated_at)"
+            " VALUES (1, 'local', '/tmp', 'never', 0)"
+        )
+        conn.commit()
+
+        migrate(conn)
+        self.assertFalse(conn.in_transaction)
+        migrate(conn)  # idempotent
+
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(chat_state)")}
+        self.assertIn("approval_mode", cols)
+        self.assertIn("rate_secondary_resets_at", cols)
+        mode = conn.execute("SELECT approval_mode FROM chat_state WHERE chat_id = 1").fetchone()[0]
+        self.assertEqual(mode, "yolo")
+        conn.close()
+
+    def test_session_listing_uses_chat_index(self) -> None:
+        conn = sqlite3.connect(":memory:")
+        migrate(conn)
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM session_index WHERE chat_id = ? AND machine_name = ?",
+            (1, "local"),
+        ).fetchall()
+        self.assertIn("idx_session_index_chat", " ".join(str(row[-1]) for row in plan))
+        conn.close()
@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+
+from tgcodex.state.store import Store
+
+
+class TestStoreBatchWrites(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.store = Store(os.path.join(self._td.name, "state.sqlite3"))
+        self.store.open()
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self._td.cleanup()
+
+    def test_upsert_session_index_many(self) -> None:
+        self.store.upsert_session_index(chat_id=1, machine_name="local", session_id="a", title="old")
+        self.store.upsert_session_index_many(
+            [
+                (1, "local", "a", None),
+                (1, "local", "b", "second"),
+                (2, "local", "c", "third"),
+            ]
+        )
+        rows = self.store.list_session_index(chat_id=1, machine_name="local")
+        self.assertEqual(sorted((r.session_id, r.title) for r in rows), [("a", "old"), ("b", "second")])
+        row = self.store.get_session_index(machine_name="local", session_id="c")
+        assert row is not None
+        self.assertEqual(row.chat_id, 2)
+
+    def test_add_trusted_prefixes_many_skips_duplicates(self) -> None:
+        self.assertTrue(self.store.add_trusted_prefix(machine_name="local", session_id="s", prefix="git status"))
+        self.assertFalse(self.store.add_trusted_prefix(machine_name="local", session_id="s", prefix="git status"))
+        added = self.store.add_trusted_prefixes_many(
+            machine_name="local", session_id="s", prefixes=["git status", "ls", "npm test"]
+        )
+        self.assertEqual(added, 2)
+        self.assertEqual(
+            self.store.list_trusted_prefixes(machine_name="local", session_id="s"),
+            ["git status", "ls", "npm test"],
+        )
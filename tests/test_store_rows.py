@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+
+from tgcodex.state.models import ActiveRun
+from tgcodex.state.store import Store
+
+
+class TestStoreRowDecoding(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.store = Store(os.path.join(self._td.name, "state.sqlite3"))
+        self.store.open()
+        self.store.ensure_chat_state(
+            chat_id=1,
+            default_machine="local",
+            default_workdir="/tmp",
+            default_approval_policy="untrusted",
+            default_model="gpt",
+        )
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self._td.cleanup()
+
+    def test_chat_state_round_trip_and_legacy_values(self) -> None:
+        self.store.update_chat_state(1, show_reasoning=1, approval_mode="always", sandbox_mode="")
+        state = self.store.get_chat_state(1)
+        assert state is not None
+        self.assertEqual((state.chat_id, state.machine_name, state.workdir, state.model), (1, "local", "/tmp", "gpt"))
+        self.assertIs(state.show_reasoning, True)
+        self.assertIs(state.plan_mode, False)
+        self.assertEqual(state.approval_mode, "on-request")
+        self.assertIsNone(state.sandbox_mode)
+        self.assertIsNone(state.rate_primary_used_percent)
+
+        self.store.update_chat_state(1, approval_mode=None, approval_policy="never")
+        state = self.store.get_chat_state(1)
+        assert state is not None
+        self.assertEqual(state.approval_mode, "yolo")
+
+    def test_active_run_round_trip(self) -> None:
+        self.assertIsNone(self.store.get_active_run(1))
+        self.store.set_active_run(chat_id=1, run_id="r1", status="running", pending_action={"k": 1})
+        run = self.store.get_active_run(1)
+        assert run is not None
+        self.assertEqual(run, ActiveRun(chat_id=1, run_id="r1", status="running", pending_action_json='{"k": 1}', updated_at=run.updated_at))
+        self.store.clear_active_run(chat_id=1)
+        self.assertIsNone(self.store.get_active_run(1))
@@ -1,6 +1,8 @@
 import os
+import sqlite3
 import tempfile
 import unittest
+from types import SimpleNamespace
 
 from tgcodex.codex.events import TokenCount
 from tgcodex.state.store import Store
@@ -67,3 +69,67 @@ class TestStoreTokenTelemetry(unittest.TestCase):
                 self.assertEqual(state.rate_secondary_resets_at, 1700001000)
             finally:
                 store.close()
+
+    def test_telemetry_commits_are_deferred_until_flush(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db_path = os.path.join(td, "state.sqlite3")
+            store = Store(db_path)
+            store.open()
+            other = sqlite3.connect(db_path)
+            try:
+                store.ensure_chat_state(
+                    chat_id=1,
+                    default_machine="local",
+                    default_workdir="/tmp",
+                    default_approval_policy="untrusted",
+                    default_model=None,
+                )
+
+                def _committed_total() -> object:
+                    return other.execute("SELECT last_total_tokens FROM chat_state WHERE chat_id = 1").fetchone()[0]
+
+                store.update_token_telemetry(1, token=SimpleNamespace(total_tokens=10))
+                self.assertEqual(_committed_total(), 10)  # first write in the interval commits
+                store.update_token_telemetry(1, token=SimpleNamespace(total_tokens=20))
+                state = store.get_chat_state(1)
+                assert state is not None
+                self.assertEqual(state.last_total_tokens, 20)
+                self.assertEqual(_committed_total(), 10)
+                store.flush()
+                self.assertEqual(_committed_total(), 20)
+
+                store.update_token_telemetry(1, token=SimpleNamespace(total_tokens=30))
+                store.set_session_title(chat_id=1, title="t")  # other writes commit immediately
+                self.assertEqual(_committed_total(), 30)
+                store.update_token_telemetry(1, token=SimpleNamespace(total_tokens=40))
+            finally:
+                store.close()
+            self.assertEqual(_committed_total(), 40)
+            other.close()
+
+    def test_unchanged_telemetry_skips_the_update(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = Store(os.path.join(td, "state.sqlite3"))
+            store.open()
+            try:
+                store.ensure_chat_state(
+                    chat_id=1,
+                    default_machine="local",
+                    default_workdir="/tmp",
+                    default_approval_policy="untrusted",
+                    default_model=None,
+                )
+                statements: list[str] = []
+                store.conn.set_trace_callback(statements.append)
+                token = SimpleNamespace(total_tokens=10, model_context_window=100)
+                store.update_token_telemetry(1, token=token)
+                store.update_token_telemetry(1, token=token)
+                self.assertEqual(sum(s.startswith("UPDATE") for s in statements), 1)
+
+                store.clear_session(chat_id=1)
+                store.update_token_telemetry(1, token=token)
+                state = store.get_chat_state(1)
+                assert state is not None
+                self.assertEqual(state.last_context_remaining, 90)
+            finally:
+                store.close()